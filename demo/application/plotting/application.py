@@ -8,7 +8,6 @@ from ehs.ehsx import EHSClient
 import os.path
 import matplotlib
 import matplotlib.pyplot as plt
-import numpy
 import time
 
 
@@ -43,20 +42,19 @@ def run():
 
     now = time.time_ns()
     ten_minutes_before = now - 10*60*1_000_000_000  # ... nanoseconds based
-    histories = EHS.get_histories([channels[0], channels[1]], ten_minutes_before, now)
+    histories = EHS.get_history_columns([channels[0], channels[1]], ten_minutes_before, now, max_points=1000)
 
     
 
     # prepare a plotting diagram
-    time_series = histories[1]
-    t_time_series = numpy.transpose(time_series)
+    times, values = histories[1]
     prep_dates = []
-    for t in t_time_series[0]:
+    for t in times:
         prepdate = datetime.datetime.fromtimestamp(t / 1_000_000_000)
         prep_dates.append(prepdate)
     dates = matplotlib.dates.date2num(prep_dates)
 
-    plt.plot_date(dates, t_time_series[1])
+    plt.plot_date(dates, values)
     plt.title("Machine HNA13-ZX23")
     plt.xlabel("Time")
     plt.ylabel("Workload")
@@ -25,12 +25,13 @@ setup(
     package_dir={"": "src"},
     packages=find_packages(where="src"),
     include_package_data=True,
-    install_requires=["PyYAML", "jsonschema", "grpcio-tools", "cmd2"],
+    install_requires=["PyYAML", "jsonschema", "grpcio-tools", "cmd2", "numpy"],
     extras_require={
         "server": ["pykka", "apscheduler", "SQLAlchemy"],
         "configurator": ["PySide6", "deepdiff"],
         "arrowhead": ["arrowhead-client"],
         "application": ["matplotlib"],
+        "export": ["pyarrow"],
     },
     python_requires=">=3.10",
 )
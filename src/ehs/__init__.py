@@ -15,7 +15,9 @@ import jsonschema
 import logging
 import os
 import os.path
+import queue
 import sys
+import threading
 import time
 import yaml
 
@@ -28,6 +30,7 @@ __copyright__ = "Copyright 2022 ifak e.V."
 
 
 RETRY_TIME = 5  # seconds
+STREAM_CONCURRENCY = 4  # requests of a stream_read, which an adapter answers at a time
 HEADER_CONF = """
 type: object
 properties:
@@ -173,8 +176,12 @@ class GRPCServer(Server):
         self.server.start()
         self.server.wait_for_termination()
 
+    def stop_serving(self) -> None:
+        """Stops the server and waits until the running RPCs are cancelled."""
+        if self.server is not None:
+            self.server.stop(grace=None).wait()
     def shut_down(self) -> None:
-        self.server.stop(grace=None)
+        self.stop_serving()
         time.sleep(5)  # still show the message for 5 seconds on a closing terminal
         sys.exit(0)
 class GRPCClient(Client):
@@ -398,11 +405,19 @@ class AdapterGRPCInterface(Client):
         response = Commons_pb2.PingResponse(value=value)
         return response
     def read(self, request, context):
+        return self.read_address(request.address)
+    def read_many(self, request, context):
+        """Reads all addresses in one round trip, where each value has its own status."""
+        response = DataSourceAdapter_pb2.ReadManyResponse()
+        for address in request.addresses:
+            response.values.append(self.read_address(address))
+        return response
+    def read_address(self, address) -> DataSourceAdapter_pb2.ReadResponse:
         retval = Commons_pb2.Value()
         status = Commons_pb2.UNKNOWN
 
         try:
-            value = self.client.read(request.address)
+            value = self.client.read(address)
             status = Commons_pb2.SUCCESS
 
             value_type = type(value)
@@ -428,6 +443,38 @@ class AdapterGRPCInterface(Client):
         value = self.client.write(request.address, request.value)
         response = DataSourceAdapter_pb2.WriteResponse()
         return response
+    def stream_read(self, request_iterator, context):
+        """Answers the ReadManyRequests of the stream like read_many, STREAM_CONCURRENCY at a time, each in the order of completion with the id of its request."""
+        # tells the EHS, that the stream is established, before the first response
+        context.send_initial_metadata(())
+        completed = queue.Queue()
+
+        def answer(request):
+            response = self.read_many(request, context)
+            response.id = request.id
+            return response
+
+        def receive():
+            try:
+                with concurrent.futures.ThreadPoolExecutor(STREAM_CONCURRENCY) as pool:
+                    for request in request_iterator:
+                        pool.submit(answer, request).add_done_callback(completed.put)
+            except grpc.RpcError:
+                # the EHS cancelled the stream
+                pass
+            finally:
+                # after the answers of all received requests
+                completed.put(None)
+
+        threading.Thread(target=receive, name="stream-read", daemon=True).start()
+        while True:
+            future = completed.get()
+            if future is None:
+                return
+            yield future.result()
+    def stream_write(self, request_iterator, context):
+        for request in request_iterator:
+            yield self.write(request, context)
     def get_configuration(self, request, context):
         # we return the configuration of the Adapter, not that of the device!
         value = yaml.dump(self.configuration, default_flow_style=False)
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=b'P\001',
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x17\x44\x61taSourceAdapter.proto\x12\x0b\x65u.ifak.ehs\x1a\rCommons.proto\"\x1e\n\x0bReadRequest\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\"V\n\x0cReadResponse\x12!\n\x05value\x18\x01 \x01(\x0b\x32\x12.eu.ifak.ehs.Value\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"B\n\x0cWriteRequest\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.eu.ifak.ehs.Value\"4\n\rWriteResponse\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status2\xb7\x02\n\x11\x44\x61taSourceAdapter\x12=\n\x04ping\x12\x18.eu.ifak.ehs.PingRequest\x1a\x19.eu.ifak.ehs.PingResponse\"\x00\x12=\n\x04read\x12\x18.eu.ifak.ehs.ReadRequest\x1a\x19.eu.ifak.ehs.ReadResponse\"\x00\x12@\n\x05write\x12\x19.eu.ifak.ehs.WriteRequest\x1a\x1a.eu.ifak.ehs.WriteResponse\"\x00\x12\x62\n\x11get_configuration\x12$.eu.ifak.ehs.GetConfigurationRequest\x1a%.eu.ifak.ehs.GetConfigurationResponse\"\x00\x42\x02P\x01\x62\x06proto3'
+  serialized_pb=b'\n\x17\x44\x61taSourceAdapter.proto\x12\x0b\x65u.ifak.ehs\x1a\rCommons.proto\"\x1e\n\x0bReadRequest\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\"V\n\x0cReadResponse\x12!\n\x05value\x18\x01 \x01(\x0b\x32\x12.eu.ifak.ehs.Value\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"0\n\x0fReadManyRequest\x12\x11\n\taddresses\x18\x01 \x03(\t\x12\n\n\x02id\x18\x02 \x01(\x03\"I\n\x10ReadManyResponse\x12)\n\x06values\x18\x01 \x03(\x0b\x32\x19.eu.ifak.ehs.ReadResponse\x12\n\n\x02id\x18\x02 \x01(\x03\"B\n\x0cWriteRequest\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.eu.ifak.ehs.Value\"4\n\rWriteResponse\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status2\xa2\x04\n\x11\x44\x61taSourceAdapter\x12=\n\x04ping\x12\x18.eu.ifak.ehs.PingRequest\x1a\x19.eu.ifak.ehs.PingResponse\"\x00\x12=\n\x04read\x12\x18.eu.ifak.ehs.ReadRequest\x1a\x19.eu.ifak.ehs.ReadResponse\"\x00\x12J\n\tread_many\x12\x1c.eu.ifak.ehs.ReadManyRequest\x1a\x1d.eu.ifak.ehs.ReadManyResponse\"\x00\x12@\n\x05write\x12\x19.eu.ifak.ehs.WriteRequest\x1a\x1a.eu.ifak.ehs.WriteResponse\"\x00\x12\x62\n\x11get_configuration\x12$.eu.ifak.ehs.GetConfigurationRequest\x1a%.eu.ifak.ehs.GetConfigurationResponse\"\x00\x12P\n\x0bstream_read\x12\x1c.eu.ifak.ehs.ReadManyRequest\x1a\x1d.eu.ifak.ehs.ReadManyResponse\"\x00(\x01\x30\x01\x12K\n\x0cstream_write\x12\x19.eu.ifak.ehs.WriteRequest\x1a\x1a.eu.ifak.ehs.WriteResponse\"\x00(\x01\x30\x01\x42\x02P\x01\x62\x06proto3'
   ,
   dependencies=[Commons__pb2.DESCRIPTOR,])
 
@@ -98,6 +98,84 @@ _READRESPONSE = _descriptor.Descriptor(
 )
 
 
+_READMANYREQUEST = _descriptor.Descriptor(
+  name='ReadManyRequest',
+  full_name='eu.ifak.ehs.ReadManyRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='addresses', full_name='eu.ifak.ehs.ReadManyRequest.addresses', index=0,
+      number=1, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='id', full_name='eu.ifak.ehs.ReadManyRequest.id', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=175,
+  serialized_end=223,
+)
+
+
+_READMANYRESPONSE = _descriptor.Descriptor(
+  name='ReadManyResponse',
+  full_name='eu.ifak.ehs.ReadManyResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='values', full_name='eu.ifak.ehs.ReadManyResponse.values', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='id', full_name='eu.ifak.ehs.ReadManyResponse.id', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=225,
+  serialized_end=298,
+)
+
+
 _WRITEREQUEST = _descriptor.Descriptor(
   name='WriteRequest',
   full_name='eu.ifak.ehs.WriteRequest',
@@ -132,8 +210,8 @@ _WRITEREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=175,
-  serialized_end=241,
+  serialized_start=300,
+  serialized_end=366,
 )
 
 
@@ -164,16 +242,19 @@ _WRITERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=243,
-  serialized_end=295,
+  serialized_start=368,
+  serialized_end=420,
 )
 
 _READRESPONSE.fields_by_name['value'].message_type = Commons__pb2._VALUE
 _READRESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
+_READMANYRESPONSE.fields_by_name['values'].message_type = _READRESPONSE
 _WRITEREQUEST.fields_by_name['value'].message_type = Commons__pb2._VALUE
 _WRITERESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
 DESCRIPTOR.message_types_by_name['ReadRequest'] = _READREQUEST
 DESCRIPTOR.message_types_by_name['ReadResponse'] = _READRESPONSE
+DESCRIPTOR.message_types_by_name['ReadManyRequest'] = _READMANYREQUEST
+DESCRIPTOR.message_types_by_name['ReadManyResponse'] = _READMANYRESPONSE
 DESCRIPTOR.message_types_by_name['WriteRequest'] = _WRITEREQUEST
 DESCRIPTOR.message_types_by_name['WriteResponse'] = _WRITERESPONSE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
@@ -192,6 +273,20 @@ ReadResponse = _reflection.GeneratedProtocolMessageType('ReadResponse', (_messag
   })
 _sym_db.RegisterMessage(ReadResponse)
 
+ReadManyRequest = _reflection.GeneratedProtocolMessageType('ReadManyRequest', (_message.Message,), {
+  'DESCRIPTOR' : _READMANYREQUEST,
+  '__module__' : 'DataSourceAdapter_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.ReadManyRequest)
+  })
+_sym_db.RegisterMessage(ReadManyRequest)
+
+ReadManyResponse = _reflection.GeneratedProtocolMessageType('ReadManyResponse', (_message.Message,), {
+  'DESCRIPTOR' : _READMANYRESPONSE,
+  '__module__' : 'DataSourceAdapter_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.ReadManyResponse)
+  })
+_sym_db.RegisterMessage(ReadManyResponse)
+
 WriteRequest = _reflection.GeneratedProtocolMessageType('WriteRequest', (_message.Message,), {
   'DESCRIPTOR' : _WRITEREQUEST,
   '__module__' : 'DataSourceAdapter_pb2'
@@ -216,8 +311,8 @@ _DATASOURCEADAPTER = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=298,
-  serialized_end=609,
+  serialized_start=423,
+  serialized_end=969,
   methods=[
   _descriptor.MethodDescriptor(
     name='ping',
@@ -239,10 +334,20 @@ _DATASOURCEADAPTER = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='read_many',
+    full_name='eu.ifak.ehs.DataSourceAdapter.read_many',
+    index=2,
+    containing_service=None,
+    input_type=_READMANYREQUEST,
+    output_type=_READMANYRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
   _descriptor.MethodDescriptor(
     name='write',
     full_name='eu.ifak.ehs.DataSourceAdapter.write',
-    index=2,
+    index=3,
     containing_service=None,
     input_type=_WRITEREQUEST,
     output_type=_WRITERESPONSE,
@@ -252,13 +357,33 @@ _DATASOURCEADAPTER = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='get_configuration',
     full_name='eu.ifak.ehs.DataSourceAdapter.get_configuration',
-    index=3,
+    index=4,
     containing_service=None,
     input_type=Commons__pb2._GETCONFIGURATIONREQUEST,
     output_type=Commons__pb2._GETCONFIGURATIONRESPONSE,
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='stream_read',
+    full_name='eu.ifak.ehs.DataSourceAdapter.stream_read',
+    index=5,
+    containing_service=None,
+    input_type=_READMANYREQUEST,
+    output_type=_READMANYRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='stream_write',
+    full_name='eu.ifak.ehs.DataSourceAdapter.stream_write',
+    index=6,
+    containing_service=None,
+    input_type=_WRITEREQUEST,
+    output_type=_WRITERESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_DATASOURCEADAPTER)
 
@@ -25,6 +25,11 @@ class DataSourceAdapterStub(object):
                 request_serializer=DataSourceAdapter__pb2.ReadRequest.SerializeToString,
                 response_deserializer=DataSourceAdapter__pb2.ReadResponse.FromString,
                 )
+        self.read_many = channel.unary_unary(
+                '/eu.ifak.ehs.DataSourceAdapter/read_many',
+                request_serializer=DataSourceAdapter__pb2.ReadManyRequest.SerializeToString,
+                response_deserializer=DataSourceAdapter__pb2.ReadManyResponse.FromString,
+                )
         self.write = channel.unary_unary(
                 '/eu.ifak.ehs.DataSourceAdapter/write',
                 request_serializer=DataSourceAdapter__pb2.WriteRequest.SerializeToString,
@@ -35,6 +40,16 @@ class DataSourceAdapterStub(object):
                 request_serializer=Commons__pb2.GetConfigurationRequest.SerializeToString,
                 response_deserializer=Commons__pb2.GetConfigurationResponse.FromString,
                 )
+        self.stream_read = channel.stream_stream(
+                '/eu.ifak.ehs.DataSourceAdapter/stream_read',
+                request_serializer=DataSourceAdapter__pb2.ReadManyRequest.SerializeToString,
+                response_deserializer=DataSourceAdapter__pb2.ReadManyResponse.FromString,
+                )
+        self.stream_write = channel.stream_stream(
+                '/eu.ifak.ehs.DataSourceAdapter/stream_write',
+                request_serializer=DataSourceAdapter__pb2.WriteRequest.SerializeToString,
+                response_deserializer=DataSourceAdapter__pb2.WriteResponse.FromString,
+                )
 
 
 class DataSourceAdapterServicer(object):
@@ -52,6 +67,12 @@ class DataSourceAdapterServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def read_many(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def write(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -64,6 +85,20 @@ class DataSourceAdapterServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def stream_read(self, request_iterator, context):
+        """long-lived streams: reads are answered concurrently, each response with the id of its request,
+        while writes are answered in the order they arrive
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def stream_write(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DataSourceAdapterServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -77,6 +112,11 @@ def add_DataSourceAdapterServicer_to_server(servicer, server):
                     request_deserializer=DataSourceAdapter__pb2.ReadRequest.FromString,
                     response_serializer=DataSourceAdapter__pb2.ReadResponse.SerializeToString,
             ),
+            'read_many': grpc.unary_unary_rpc_method_handler(
+                    servicer.read_many,
+                    request_deserializer=DataSourceAdapter__pb2.ReadManyRequest.FromString,
+                    response_serializer=DataSourceAdapter__pb2.ReadManyResponse.SerializeToString,
+            ),
             'write': grpc.unary_unary_rpc_method_handler(
                     servicer.write,
                     request_deserializer=DataSourceAdapter__pb2.WriteRequest.FromString,
@@ -87,6 +127,16 @@ def add_DataSourceAdapterServicer_to_server(servicer, server):
                     request_deserializer=Commons__pb2.GetConfigurationRequest.FromString,
                     response_serializer=Commons__pb2.GetConfigurationResponse.SerializeToString,
             ),
+            'stream_read': grpc.stream_stream_rpc_method_handler(
+                    servicer.stream_read,
+                    request_deserializer=DataSourceAdapter__pb2.ReadManyRequest.FromString,
+                    response_serializer=DataSourceAdapter__pb2.ReadManyResponse.SerializeToString,
+            ),
+            'stream_write': grpc.stream_stream_rpc_method_handler(
+                    servicer.stream_write,
+                    request_deserializer=DataSourceAdapter__pb2.WriteRequest.FromString,
+                    response_serializer=DataSourceAdapter__pb2.WriteResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'eu.ifak.ehs.DataSourceAdapter', rpc_method_handlers)
@@ -131,6 +181,23 @@ class DataSourceAdapter(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def read_many(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/eu.ifak.ehs.DataSourceAdapter/read_many',
+            DataSourceAdapter__pb2.ReadManyRequest.SerializeToString,
+            DataSourceAdapter__pb2.ReadManyResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def write(request,
             target,
@@ -164,3 +231,37 @@ class DataSourceAdapter(object):
             Commons__pb2.GetConfigurationResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def stream_read(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/eu.ifak.ehs.DataSourceAdapter/stream_read',
+            DataSourceAdapter__pb2.ReadManyRequest.SerializeToString,
+            DataSourceAdapter__pb2.ReadManyResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def stream_write(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/eu.ifak.ehs.DataSourceAdapter/stream_write',
+            DataSourceAdapter__pb2.WriteRequest.SerializeToString,
+            DataSourceAdapter__pb2.WriteResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
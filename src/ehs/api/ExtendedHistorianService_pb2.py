@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=b'P\001',
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x1e\x45xtendedHistorianService.proto\x12\x0b\x65u.ifak.ehs\x1a\rCommons.proto\"0\n\x17SetConfigurationRequest\x12\x15\n\rconfiguration\x18\x01 \x01(\t\"?\n\x18SetConfigurationResponse\x12#\n\x06status\x18\x01 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"\x14\n\x12GetChannelsRequest\"R\n\x0e\x43hannelAddress\x12\x14\n\x0c\x61\x64\x61pter_name\x18\x01 \x01(\t\x12\x14\n\x0c\x63hannel_name\x18\x02 \x01(\t\x12\x14\n\x0c\x63hannel_type\x18\x03 \x01(\t\"f\n\x13GetChannelsResponse\x12*\n\x05value\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"J\n\x10GetValuesRequest\x12\x36\n\x11\x63hannel_addresses\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\"d\n\x11GetValuesResponse\x12*\n\x05value\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ValueAndStatus\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"}\n\x13GetHistoriesRequest\x12\x36\n\x11\x63hannel_addresses\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12\x17\n\x0f\x62\x65gin_inclusive\x18\x02 \x01(\x03\x12\x15\n\rend_exclusive\x18\x03 \x01(\x03\"B\n\x0fTimeSeriesValue\x12\x0c\n\x04time\x18\x01 \x01(\x03\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.eu.ifak.ehs.Value\"E\n\x16ListOfTimeSeriesValues\x12+\n\x05value\x18\x01 \x03(\x0b\x32\x1c.eu.ifak.ehs.TimeSeriesValue\"o\n\x14GetHistoriesResponse\x12\x32\n\x05value\x18\x01 \x03(\x0b\x32#.eu.ifak.ehs.ListOfTimeSeriesValues\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"\x17\n\x15GetAdapterListRequest\"H\n\x16GetAdapterListResponse\x12.\n\x05value\x18\x01 \x03(\x0b\x32\x1f.eu.ifak.ehs.AdapterInformation\"p\n\x12\x41\x64\x61pterInformation\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x03 \x01(\t\x12\x0c\n\x04port\x18\x04 \x01(\t\x12\x18\n\x10\x63\x61n_provide_data\x18\x05 \x01(\x08\x32\xfc\x04\n\x18\x45xtendedHistorianService\x12=\n\x04ping\x12\x18.eu.ifak.ehs.PingRequest\x1a\x19.eu.ifak.ehs.PingResponse\"\x00\x12\x62\n\x11get_configuration\x12$.eu.ifak.ehs.GetConfigurationRequest\x1a%.eu.ifak.ehs.GetConfigurationResponse\"\x00\x12\x62\n\x11set_configuration\x12$.eu.ifak.ehs.SetConfigurationRequest\x1a%.eu.ifak.ehs.SetConfigurationResponse\"\x00\x12S\n\x0cget_channels\x12\x1f.eu.ifak.ehs.GetChannelsRequest\x1a .eu.ifak.ehs.GetChannelsResponse\"\x00\x12M\n\nget_values\x12\x1d.eu.ifak.ehs.GetValuesRequest\x1a\x1e.eu.ifak.ehs.GetValuesResponse\"\x00\x12V\n\rget_histories\x12 .eu.ifak.ehs.GetHistoriesRequest\x1a!.eu.ifak.ehs.GetHistoriesResponse\"\x00\x12]\n\x10get_adapter_list\x12\".eu.ifak.ehs.GetAdapterListRequest\x1a#.eu.ifak.ehs.GetAdapterListResponse\"\x00\x42\x02P\x01\x62\x06proto3'
+  serialized_pb=b'\n\x1e\x45xtendedHistorianService.proto\x12\x0b\x65u.ifak.ehs\x1a\rCommons.proto\"0\n\x17SetConfigurationRequest\x12\x15\n\rconfiguration\x18\x01 \x01(\t\"?\n\x18SetConfigurationResponse\x12#\n\x06status\x18\x01 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"\x14\n\x12GetChannelsRequest\"R\n\x0e\x43hannelAddress\x12\x14\n\x0c\x61\x64\x61pter_name\x18\x01 \x01(\t\x12\x14\n\x0c\x63hannel_name\x18\x02 \x01(\t\x12\x14\n\x0c\x63hannel_type\x18\x03 \x01(\t\"f\n\x13GetChannelsResponse\x12*\n\x05value\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"[\n\x10GetValuesRequest\x12\x36\n\x11\x63hannel_addresses\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12\x0f\n\x07max_age\x18\x02 \x01(\x03\"d\n\x11GetValuesResponse\x12*\n\x05value\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ValueAndStatus\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"\xca\x01\n\x13GetHistoriesRequest\x12\x36\n\x11\x63hannel_addresses\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12\x17\n\x0f\x62\x65gin_inclusive\x18\x02 \x01(\x03\x12\x15\n\rend_exclusive\x18\x03 \x01(\x03\x12\x12\n\nresolution\x18\x04 \x01(\x03\x12\x12\n\nmax_points\x18\x05 \x01(\x05\x12\x11\n\treduction\x18\x06 \x01(\t\x12\x10\n\x08\x63olumnar\x18\x07 \x01(\x08\"B\n\x0fTimeSeriesValue\x12\x0c\n\x04time\x18\x01 \x01(\x03\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.eu.ifak.ehs.Value\"E\n\x16ListOfTimeSeriesValues\x12+\n\x05value\x18\x01 \x03(\x0b\x32\x1c.eu.ifak.ehs.TimeSeriesValue\"v\n\x11TimeSeriesColumns\x12\x0c\n\x04time\x18\x01 \x01(\x0c\x12\x12\n\nbool_value\x18\x02 \x01(\x0c\x12\x13\n\x0bint64_value\x18\x03 \x01(\x0c\x12\x14\n\x0c\x64ouble_value\x18\x04 \x01(\x0c\x12\x14\n\x0cstring_value\x18\x05 \x03(\t\"\xa0\x01\n\x14GetHistoriesResponse\x12\x32\n\x05value\x18\x01 \x03(\x0b\x32#.eu.ifak.ehs.ListOfTimeSeriesValues\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\x12/\n\x07\x63olumns\x18\x03 \x03(\x0b\x32\x1e.eu.ifak.ehs.TimeSeriesColumns\"\xb1\x01\n\x1dGetAggregatedHistoriesRequest\x12\x36\n\x11\x63hannel_addresses\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12\x17\n\x0f\x62\x65gin_inclusive\x18\x02 \x01(\x03\x12\x15\n\rend_exclusive\x18\x03 \x01(\x03\x12\x14\n\x0c\x62ucket_width\x18\x04 \x01(\x03\x12\x12\n\naggregates\x18\x05 \x03(\t\"0\n\x10\x41ggregatedBucket\x12\r\n\x05\x62\x65gin\x18\x01 \x01(\x03\x12\r\n\x05value\x18\x02 \x03(\x01\"G\n\x17ListOfAggregatedBuckets\x12,\n\x05value\x18\x01 \x03(\x0b\x32\x1d.eu.ifak.ehs.AggregatedBucket\"z\n\x1eGetAggregatedHistoriesResponse\x12\x33\n\x05value\x18\x01 \x03(\x0b\x32$.eu.ifak.ehs.ListOfAggregatedBuckets\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"}\n\x14ImportSamplesRequest\x12\x34\n\x0f\x63hannel_address\x18\x01 \x01(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12/\n\x07\x63olumns\x18\x02 \x01(\x0b\x32\x1e.eu.ifak.ehs.TimeSeriesColumns\"K\n\x15ImportSamplesResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x03\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"\x90\x01\n\x16\x45xportHistoriesRequest\x12\x36\n\x11\x63hannel_addresses\x18\x01 \x03(\x0b\x32\x1b.eu.ifak.ehs.ChannelAddress\x12\x17\n\x0f\x62\x65gin_inclusive\x18\x02 \x01(\x03\x12\x15\n\rend_exclusive\x18\x03 \x01(\x03\x12\x0e\n\x06\x66ormat\x18\x04 \x01(\t\"L\n\x17\x45xportHistoriesResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"\x16\n\x14GetStatisticsRequest\"K\n\x15GetStatisticsResponse\x12\r\n\x05value\x18\x01 \x01(\t\x12#\n\x06status\x18\x02 \x01(\x0e\x32\x13.eu.ifak.ehs.Status\"\x17\n\x15GetAdapterListRequest\"H\n\x16GetAdapterListResponse\x12.\n\x05value\x18\x01 \x03(\x0b\x32\x1f.eu.ifak.ehs.AdapterInformation\"p\n\x12\x41\x64\x61pterInformation\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x03 \x01(\t\x12\x0c\n\x04port\x18\x04 \x01(\t\x12\x18\n\x10\x63\x61n_provide_data\x18\x05 \x01(\x08\x32\x8e\x08\n\x18\x45xtendedHistorianService\x12=\n\x04ping\x12\x18.eu.ifak.ehs.PingRequest\x1a\x19.eu.ifak.ehs.PingResponse\"\x00\x12\x62\n\x11get_configuration\x12$.eu.ifak.ehs.GetConfigurationRequest\x1a%.eu.ifak.ehs.GetConfigurationResponse\"\x00\x12\x62\n\x11set_configuration\x12$.eu.ifak.ehs.SetConfigurationRequest\x1a%.eu.ifak.ehs.SetConfigurationResponse\"\x00\x12S\n\x0cget_channels\x12\x1f.eu.ifak.ehs.GetChannelsRequest\x1a .eu.ifak.ehs.GetChannelsResponse\"\x00\x12M\n\nget_values\x12\x1d.eu.ifak.ehs.GetValuesRequest\x1a\x1e.eu.ifak.ehs.GetValuesResponse\"\x00\x12V\n\rget_histories\x12 .eu.ifak.ehs.GetHistoriesRequest\x1a!.eu.ifak.ehs.GetHistoriesResponse\"\x00\x12u\n\x18get_aggregated_histories\x12*.eu.ifak.ehs.GetAggregatedHistoriesRequest\x1a+.eu.ifak.ehs.GetAggregatedHistoriesResponse\"\x00\x12[\n\x0eimport_samples\x12!.eu.ifak.ehs.ImportSamplesRequest\x1a\".eu.ifak.ehs.ImportSamplesResponse\"\x00(\x01\x12\x61\n\x10\x65xport_histories\x12#.eu.ifak.ehs.ExportHistoriesRequest\x1a$.eu.ifak.ehs.ExportHistoriesResponse\"\x00\x30\x01\x12Y\n\x0eget_statistics\x12!.eu.ifak.ehs.GetStatisticsRequest\x1a\".eu.ifak.ehs.GetStatisticsResponse\"\x00\x12]\n\x10get_adapter_list\x12\".eu.ifak.ehs.GetAdapterListRequest\x1a#.eu.ifak.ehs.GetAdapterListResponse\"\x00\x42\x02P\x01\x62\x06proto3'
   ,
   dependencies=[Commons__pb2.DESCRIPTOR,])
 
@@ -216,6 +216,13 @@ _GETVALUESREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='max_age', full_name='eu.ifak.ehs.GetValuesRequest.max_age', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -229,7 +236,7 @@ _GETVALUESREQUEST = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=387,
-  serialized_end=461,
+  serialized_end=478,
 )
 
 
@@ -267,8 +274,8 @@ _GETVALUESRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=463,
-  serialized_end=563,
+  serialized_start=480,
+  serialized_end=580,
 )
 
 
@@ -301,6 +308,34 @@ _GETHISTORIESREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='resolution', full_name='eu.ifak.ehs.GetHistoriesRequest.resolution', index=3,
+      number=4, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='max_points', full_name='eu.ifak.ehs.GetHistoriesRequest.max_points', index=4,
+      number=5, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='reduction', full_name='eu.ifak.ehs.GetHistoriesRequest.reduction', index=5,
+      number=6, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='columnar', full_name='eu.ifak.ehs.GetHistoriesRequest.columnar', index=6,
+      number=7, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -313,8 +348,8 @@ _GETHISTORIESREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=565,
-  serialized_end=690,
+  serialized_start=583,
+  serialized_end=785,
 )
 
 
@@ -352,8 +387,8 @@ _TIMESERIESVALUE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=692,
-  serialized_end=758,
+  serialized_start=787,
+  serialized_end=853,
 )
 
 
@@ -384,8 +419,68 @@ _LISTOFTIMESERIESVALUES = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=760,
-  serialized_end=829,
+  serialized_start=855,
+  serialized_end=924,
+)
+
+
+_TIMESERIESCOLUMNS = _descriptor.Descriptor(
+  name='TimeSeriesColumns',
+  full_name='eu.ifak.ehs.TimeSeriesColumns',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='time', full_name='eu.ifak.ehs.TimeSeriesColumns.time', index=0,
+      number=1, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='bool_value', full_name='eu.ifak.ehs.TimeSeriesColumns.bool_value', index=1,
+      number=2, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='int64_value', full_name='eu.ifak.ehs.TimeSeriesColumns.int64_value', index=2,
+      number=3, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='double_value', full_name='eu.ifak.ehs.TimeSeriesColumns.double_value', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='string_value', full_name='eu.ifak.ehs.TimeSeriesColumns.string_value', index=4,
+      number=5, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=926,
+  serialized_end=1044,
 )
 
 
@@ -411,6 +506,13 @@ _GETHISTORIESRESPONSE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='columns', full_name='eu.ifak.ehs.GetHistoriesResponse.columns', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -423,8 +525,412 @@ _GETHISTORIESRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=831,
-  serialized_end=942,
+  serialized_start=1047,
+  serialized_end=1207,
+)
+
+
+_GETAGGREGATEDHISTORIESREQUEST = _descriptor.Descriptor(
+  name='GetAggregatedHistoriesRequest',
+  full_name='eu.ifak.ehs.GetAggregatedHistoriesRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='channel_addresses', full_name='eu.ifak.ehs.GetAggregatedHistoriesRequest.channel_addresses', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='begin_inclusive', full_name='eu.ifak.ehs.GetAggregatedHistoriesRequest.begin_inclusive', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='end_exclusive', full_name='eu.ifak.ehs.GetAggregatedHistoriesRequest.end_exclusive', index=2,
+      number=3, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='bucket_width', full_name='eu.ifak.ehs.GetAggregatedHistoriesRequest.bucket_width', index=3,
+      number=4, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='aggregates', full_name='eu.ifak.ehs.GetAggregatedHistoriesRequest.aggregates', index=4,
+      number=5, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1210,
+  serialized_end=1387,
+)
+
+
+_AGGREGATEDBUCKET = _descriptor.Descriptor(
+  name='AggregatedBucket',
+  full_name='eu.ifak.ehs.AggregatedBucket',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='begin', full_name='eu.ifak.ehs.AggregatedBucket.begin', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='eu.ifak.ehs.AggregatedBucket.value', index=1,
+      number=2, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1389,
+  serialized_end=1437,
+)
+
+
+_LISTOFAGGREGATEDBUCKETS = _descriptor.Descriptor(
+  name='ListOfAggregatedBuckets',
+  full_name='eu.ifak.ehs.ListOfAggregatedBuckets',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='value', full_name='eu.ifak.ehs.ListOfAggregatedBuckets.value', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1439,
+  serialized_end=1510,
+)
+
+
+_GETAGGREGATEDHISTORIESRESPONSE = _descriptor.Descriptor(
+  name='GetAggregatedHistoriesResponse',
+  full_name='eu.ifak.ehs.GetAggregatedHistoriesResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='value', full_name='eu.ifak.ehs.GetAggregatedHistoriesResponse.value', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='eu.ifak.ehs.GetAggregatedHistoriesResponse.status', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1512,
+  serialized_end=1634,
+)
+
+
+_IMPORTSAMPLESREQUEST = _descriptor.Descriptor(
+  name='ImportSamplesRequest',
+  full_name='eu.ifak.ehs.ImportSamplesRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='channel_address', full_name='eu.ifak.ehs.ImportSamplesRequest.channel_address', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='columns', full_name='eu.ifak.ehs.ImportSamplesRequest.columns', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1636,
+  serialized_end=1761,
+)
+
+
+_IMPORTSAMPLESRESPONSE = _descriptor.Descriptor(
+  name='ImportSamplesResponse',
+  full_name='eu.ifak.ehs.ImportSamplesResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='count', full_name='eu.ifak.ehs.ImportSamplesResponse.count', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='eu.ifak.ehs.ImportSamplesResponse.status', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1763,
+  serialized_end=1838,
+)
+
+
+_EXPORTHISTORIESREQUEST = _descriptor.Descriptor(
+  name='ExportHistoriesRequest',
+  full_name='eu.ifak.ehs.ExportHistoriesRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='channel_addresses', full_name='eu.ifak.ehs.ExportHistoriesRequest.channel_addresses', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='begin_inclusive', full_name='eu.ifak.ehs.ExportHistoriesRequest.begin_inclusive', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='end_exclusive', full_name='eu.ifak.ehs.ExportHistoriesRequest.end_exclusive', index=2,
+      number=3, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='format', full_name='eu.ifak.ehs.ExportHistoriesRequest.format', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1841,
+  serialized_end=1985,
+)
+
+
+_EXPORTHISTORIESRESPONSE = _descriptor.Descriptor(
+  name='ExportHistoriesResponse',
+  full_name='eu.ifak.ehs.ExportHistoriesResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='data', full_name='eu.ifak.ehs.ExportHistoriesResponse.data', index=0,
+      number=1, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='eu.ifak.ehs.ExportHistoriesResponse.status', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1987,
+  serialized_end=2063,
+)
+
+
+_GETSTATISTICSREQUEST = _descriptor.Descriptor(
+  name='GetStatisticsRequest',
+  full_name='eu.ifak.ehs.GetStatisticsRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2065,
+  serialized_end=2087,
+)
+
+
+_GETSTATISTICSRESPONSE = _descriptor.Descriptor(
+  name='GetStatisticsResponse',
+  full_name='eu.ifak.ehs.GetStatisticsResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='value', full_name='eu.ifak.ehs.GetStatisticsResponse.value', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='eu.ifak.ehs.GetStatisticsResponse.status', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2089,
+  serialized_end=2164,
 )
 
 
@@ -448,8 +954,8 @@ _GETADAPTERLISTREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=944,
-  serialized_end=967,
+  serialized_start=2166,
+  serialized_end=2189,
 )
 
 
@@ -480,8 +986,8 @@ _GETADAPTERLISTRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=969,
-  serialized_end=1041,
+  serialized_start=2191,
+  serialized_end=2263,
 )
 
 
@@ -540,8 +1046,8 @@ _ADAPTERINFORMATION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1043,
-  serialized_end=1155,
+  serialized_start=2265,
+  serialized_end=2377,
 )
 
 _SETCONFIGURATIONRESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
@@ -555,6 +1061,17 @@ _TIMESERIESVALUE.fields_by_name['value'].message_type = Commons__pb2._VALUE
 _LISTOFTIMESERIESVALUES.fields_by_name['value'].message_type = _TIMESERIESVALUE
 _GETHISTORIESRESPONSE.fields_by_name['value'].message_type = _LISTOFTIMESERIESVALUES
 _GETHISTORIESRESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
+_GETHISTORIESRESPONSE.fields_by_name['columns'].message_type = _TIMESERIESCOLUMNS
+_GETAGGREGATEDHISTORIESREQUEST.fields_by_name['channel_addresses'].message_type = _CHANNELADDRESS
+_LISTOFAGGREGATEDBUCKETS.fields_by_name['value'].message_type = _AGGREGATEDBUCKET
+_GETAGGREGATEDHISTORIESRESPONSE.fields_by_name['value'].message_type = _LISTOFAGGREGATEDBUCKETS
+_GETAGGREGATEDHISTORIESRESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
+_IMPORTSAMPLESREQUEST.fields_by_name['channel_address'].message_type = _CHANNELADDRESS
+_IMPORTSAMPLESREQUEST.fields_by_name['columns'].message_type = _TIMESERIESCOLUMNS
+_IMPORTSAMPLESRESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
+_EXPORTHISTORIESREQUEST.fields_by_name['channel_addresses'].message_type = _CHANNELADDRESS
+_EXPORTHISTORIESRESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
+_GETSTATISTICSRESPONSE.fields_by_name['status'].enum_type = Commons__pb2._STATUS
 _GETADAPTERLISTRESPONSE.fields_by_name['value'].message_type = _ADAPTERINFORMATION
 DESCRIPTOR.message_types_by_name['SetConfigurationRequest'] = _SETCONFIGURATIONREQUEST
 DESCRIPTOR.message_types_by_name['SetConfigurationResponse'] = _SETCONFIGURATIONRESPONSE
@@ -566,7 +1083,18 @@ DESCRIPTOR.message_types_by_name['GetValuesResponse'] = _GETVALUESRESPONSE
 DESCRIPTOR.message_types_by_name['GetHistoriesRequest'] = _GETHISTORIESREQUEST
 DESCRIPTOR.message_types_by_name['TimeSeriesValue'] = _TIMESERIESVALUE
 DESCRIPTOR.message_types_by_name['ListOfTimeSeriesValues'] = _LISTOFTIMESERIESVALUES
+DESCRIPTOR.message_types_by_name['TimeSeriesColumns'] = _TIMESERIESCOLUMNS
 DESCRIPTOR.message_types_by_name['GetHistoriesResponse'] = _GETHISTORIESRESPONSE
+DESCRIPTOR.message_types_by_name['GetAggregatedHistoriesRequest'] = _GETAGGREGATEDHISTORIESREQUEST
+DESCRIPTOR.message_types_by_name['AggregatedBucket'] = _AGGREGATEDBUCKET
+DESCRIPTOR.message_types_by_name['ListOfAggregatedBuckets'] = _LISTOFAGGREGATEDBUCKETS
+DESCRIPTOR.message_types_by_name['GetAggregatedHistoriesResponse'] = _GETAGGREGATEDHISTORIESRESPONSE
+DESCRIPTOR.message_types_by_name['ImportSamplesRequest'] = _IMPORTSAMPLESREQUEST
+DESCRIPTOR.message_types_by_name['ImportSamplesResponse'] = _IMPORTSAMPLESRESPONSE
+DESCRIPTOR.message_types_by_name['ExportHistoriesRequest'] = _EXPORTHISTORIESREQUEST
+DESCRIPTOR.message_types_by_name['ExportHistoriesResponse'] = _EXPORTHISTORIESRESPONSE
+DESCRIPTOR.message_types_by_name['GetStatisticsRequest'] = _GETSTATISTICSREQUEST
+DESCRIPTOR.message_types_by_name['GetStatisticsResponse'] = _GETSTATISTICSRESPONSE
 DESCRIPTOR.message_types_by_name['GetAdapterListRequest'] = _GETADAPTERLISTREQUEST
 DESCRIPTOR.message_types_by_name['GetAdapterListResponse'] = _GETADAPTERLISTRESPONSE
 DESCRIPTOR.message_types_by_name['AdapterInformation'] = _ADAPTERINFORMATION
@@ -642,6 +1170,13 @@ ListOfTimeSeriesValues = _reflection.GeneratedProtocolMessageType('ListOfTimeSer
   })
 _sym_db.RegisterMessage(ListOfTimeSeriesValues)
 
+TimeSeriesColumns = _reflection.GeneratedProtocolMessageType('TimeSeriesColumns', (_message.Message,), {
+  'DESCRIPTOR' : _TIMESERIESCOLUMNS,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.TimeSeriesColumns)
+  })
+_sym_db.RegisterMessage(TimeSeriesColumns)
+
 GetHistoriesResponse = _reflection.GeneratedProtocolMessageType('GetHistoriesResponse', (_message.Message,), {
   'DESCRIPTOR' : _GETHISTORIESRESPONSE,
   '__module__' : 'ExtendedHistorianService_pb2'
@@ -649,6 +1184,76 @@ GetHistoriesResponse = _reflection.GeneratedProtocolMessageType('GetHistoriesRes
   })
 _sym_db.RegisterMessage(GetHistoriesResponse)
 
+GetAggregatedHistoriesRequest = _reflection.GeneratedProtocolMessageType('GetAggregatedHistoriesRequest', (_message.Message,), {
+  'DESCRIPTOR' : _GETAGGREGATEDHISTORIESREQUEST,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.GetAggregatedHistoriesRequest)
+  })
+_sym_db.RegisterMessage(GetAggregatedHistoriesRequest)
+
+AggregatedBucket = _reflection.GeneratedProtocolMessageType('AggregatedBucket', (_message.Message,), {
+  'DESCRIPTOR' : _AGGREGATEDBUCKET,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.AggregatedBucket)
+  })
+_sym_db.RegisterMessage(AggregatedBucket)
+
+ListOfAggregatedBuckets = _reflection.GeneratedProtocolMessageType('ListOfAggregatedBuckets', (_message.Message,), {
+  'DESCRIPTOR' : _LISTOFAGGREGATEDBUCKETS,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.ListOfAggregatedBuckets)
+  })
+_sym_db.RegisterMessage(ListOfAggregatedBuckets)
+
+GetAggregatedHistoriesResponse = _reflection.GeneratedProtocolMessageType('GetAggregatedHistoriesResponse', (_message.Message,), {
+  'DESCRIPTOR' : _GETAGGREGATEDHISTORIESRESPONSE,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.GetAggregatedHistoriesResponse)
+  })
+_sym_db.RegisterMessage(GetAggregatedHistoriesResponse)
+
+ImportSamplesRequest = _reflection.GeneratedProtocolMessageType('ImportSamplesRequest', (_message.Message,), {
+  'DESCRIPTOR' : _IMPORTSAMPLESREQUEST,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.ImportSamplesRequest)
+  })
+_sym_db.RegisterMessage(ImportSamplesRequest)
+
+ImportSamplesResponse = _reflection.GeneratedProtocolMessageType('ImportSamplesResponse', (_message.Message,), {
+  'DESCRIPTOR' : _IMPORTSAMPLESRESPONSE,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.ImportSamplesResponse)
+  })
+_sym_db.RegisterMessage(ImportSamplesResponse)
+
+ExportHistoriesRequest = _reflection.GeneratedProtocolMessageType('ExportHistoriesRequest', (_message.Message,), {
+  'DESCRIPTOR' : _EXPORTHISTORIESREQUEST,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.ExportHistoriesRequest)
+  })
+_sym_db.RegisterMessage(ExportHistoriesRequest)
+
+ExportHistoriesResponse = _reflection.GeneratedProtocolMessageType('ExportHistoriesResponse', (_message.Message,), {
+  'DESCRIPTOR' : _EXPORTHISTORIESRESPONSE,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.ExportHistoriesResponse)
+  })
+_sym_db.RegisterMessage(ExportHistoriesResponse)
+
+GetStatisticsRequest = _reflection.GeneratedProtocolMessageType('GetStatisticsRequest', (_message.Message,), {
+  'DESCRIPTOR' : _GETSTATISTICSREQUEST,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.GetStatisticsRequest)
+  })
+_sym_db.RegisterMessage(GetStatisticsRequest)
+
+GetStatisticsResponse = _reflection.GeneratedProtocolMessageType('GetStatisticsResponse', (_message.Message,), {
+  'DESCRIPTOR' : _GETSTATISTICSRESPONSE,
+  '__module__' : 'ExtendedHistorianService_pb2'
+  # @@protoc_insertion_point(class_scope:eu.ifak.ehs.GetStatisticsResponse)
+  })
+_sym_db.RegisterMessage(GetStatisticsResponse)
+
 GetAdapterListRequest = _reflection.GeneratedProtocolMessageType('GetAdapterListRequest', (_message.Message,), {
   'DESCRIPTOR' : _GETADAPTERLISTREQUEST,
   '__module__' : 'ExtendedHistorianService_pb2'
@@ -680,8 +1285,8 @@ _EXTENDEDHISTORIANSERVICE = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=1158,
-  serialized_end=1794,
+  serialized_start=2380,
+  serialized_end=3418,
   methods=[
   _descriptor.MethodDescriptor(
     name='ping',
@@ -743,10 +1348,50 @@ _EXTENDEDHISTORIANSERVICE = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='get_aggregated_histories',
+    full_name='eu.ifak.ehs.ExtendedHistorianService.get_aggregated_histories',
+    index=6,
+    containing_service=None,
+    input_type=_GETAGGREGATEDHISTORIESREQUEST,
+    output_type=_GETAGGREGATEDHISTORIESRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='import_samples',
+    full_name='eu.ifak.ehs.ExtendedHistorianService.import_samples',
+    index=7,
+    containing_service=None,
+    input_type=_IMPORTSAMPLESREQUEST,
+    output_type=_IMPORTSAMPLESRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='export_histories',
+    full_name='eu.ifak.ehs.ExtendedHistorianService.export_histories',
+    index=8,
+    containing_service=None,
+    input_type=_EXPORTHISTORIESREQUEST,
+    output_type=_EXPORTHISTORIESRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='get_statistics',
+    full_name='eu.ifak.ehs.ExtendedHistorianService.get_statistics',
+    index=9,
+    containing_service=None,
+    input_type=_GETSTATISTICSREQUEST,
+    output_type=_GETSTATISTICSRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
   _descriptor.MethodDescriptor(
     name='get_adapter_list',
     full_name='eu.ifak.ehs.ExtendedHistorianService.get_adapter_list',
-    index=6,
+    index=10,
     containing_service=None,
     input_type=_GETADAPTERLISTREQUEST,
     output_type=_GETADAPTERLISTRESPONSE,
@@ -45,6 +45,26 @@ class ExtendedHistorianServiceStub(object):
                 request_serializer=ExtendedHistorianService__pb2.GetHistoriesRequest.SerializeToString,
                 response_deserializer=ExtendedHistorianService__pb2.GetHistoriesResponse.FromString,
                 )
+        self.get_aggregated_histories = channel.unary_unary(
+                '/eu.ifak.ehs.ExtendedHistorianService/get_aggregated_histories',
+                request_serializer=ExtendedHistorianService__pb2.GetAggregatedHistoriesRequest.SerializeToString,
+                response_deserializer=ExtendedHistorianService__pb2.GetAggregatedHistoriesResponse.FromString,
+                )
+        self.import_samples = channel.stream_unary(
+                '/eu.ifak.ehs.ExtendedHistorianService/import_samples',
+                request_serializer=ExtendedHistorianService__pb2.ImportSamplesRequest.SerializeToString,
+                response_deserializer=ExtendedHistorianService__pb2.ImportSamplesResponse.FromString,
+                )
+        self.export_histories = channel.unary_stream(
+                '/eu.ifak.ehs.ExtendedHistorianService/export_histories',
+                request_serializer=ExtendedHistorianService__pb2.ExportHistoriesRequest.SerializeToString,
+                response_deserializer=ExtendedHistorianService__pb2.ExportHistoriesResponse.FromString,
+                )
+        self.get_statistics = channel.unary_unary(
+                '/eu.ifak.ehs.ExtendedHistorianService/get_statistics',
+                request_serializer=ExtendedHistorianService__pb2.GetStatisticsRequest.SerializeToString,
+                response_deserializer=ExtendedHistorianService__pb2.GetStatisticsResponse.FromString,
+                )
         self.get_adapter_list = channel.unary_unary(
                 '/eu.ifak.ehs.ExtendedHistorianService/get_adapter_list',
                 request_serializer=ExtendedHistorianService__pb2.GetAdapterListRequest.SerializeToString,
@@ -91,6 +111,30 @@ class ExtendedHistorianServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def get_aggregated_histories(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def import_samples(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def export_histories(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def get_statistics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def get_adapter_list(self, request, context):
         """deprecated: use get_configuration
         """
@@ -131,6 +175,26 @@ def add_ExtendedHistorianServiceServicer_to_server(servicer, server):
                     request_deserializer=ExtendedHistorianService__pb2.GetHistoriesRequest.FromString,
                     response_serializer=ExtendedHistorianService__pb2.GetHistoriesResponse.SerializeToString,
             ),
+            'get_aggregated_histories': grpc.unary_unary_rpc_method_handler(
+                    servicer.get_aggregated_histories,
+                    request_deserializer=ExtendedHistorianService__pb2.GetAggregatedHistoriesRequest.FromString,
+                    response_serializer=ExtendedHistorianService__pb2.GetAggregatedHistoriesResponse.SerializeToString,
+            ),
+            'import_samples': grpc.stream_unary_rpc_method_handler(
+                    servicer.import_samples,
+                    request_deserializer=ExtendedHistorianService__pb2.ImportSamplesRequest.FromString,
+                    response_serializer=ExtendedHistorianService__pb2.ImportSamplesResponse.SerializeToString,
+            ),
+            'export_histories': grpc.unary_stream_rpc_method_handler(
+                    servicer.export_histories,
+                    request_deserializer=ExtendedHistorianService__pb2.ExportHistoriesRequest.FromString,
+                    response_serializer=ExtendedHistorianService__pb2.ExportHistoriesResponse.SerializeToString,
+            ),
+            'get_statistics': grpc.unary_unary_rpc_method_handler(
+                    servicer.get_statistics,
+                    request_deserializer=ExtendedHistorianService__pb2.GetStatisticsRequest.FromString,
+                    response_serializer=ExtendedHistorianService__pb2.GetStatisticsResponse.SerializeToString,
+            ),
             'get_adapter_list': grpc.unary_unary_rpc_method_handler(
                     servicer.get_adapter_list,
                     request_deserializer=ExtendedHistorianService__pb2.GetAdapterListRequest.FromString,
@@ -248,6 +312,74 @@ class ExtendedHistorianService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def get_aggregated_histories(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/eu.ifak.ehs.ExtendedHistorianService/get_aggregated_histories',
+            ExtendedHistorianService__pb2.GetAggregatedHistoriesRequest.SerializeToString,
+            ExtendedHistorianService__pb2.GetAggregatedHistoriesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def import_samples(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/eu.ifak.ehs.ExtendedHistorianService/import_samples',
+            ExtendedHistorianService__pb2.ImportSamplesRequest.SerializeToString,
+            ExtendedHistorianService__pb2.ImportSamplesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def export_histories(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/eu.ifak.ehs.ExtendedHistorianService/export_histories',
+            ExtendedHistorianService__pb2.ExportHistoriesRequest.SerializeToString,
+            ExtendedHistorianService__pb2.ExportHistoriesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def get_statistics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/eu.ifak.ehs.ExtendedHistorianService/get_statistics',
+            ExtendedHistorianService__pb2.GetStatisticsRequest.SerializeToString,
+            ExtendedHistorianService__pb2.GetStatisticsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def get_adapter_list(request,
             target,
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+"""Gorilla-style compression of time series chunks, as described in
+
+    Pelkonen, T. et al.: Gorilla: A Fast, Scalable, In-Memory Time Series Database. VLDB 2015.
+
+Time stamps are encoded as delta-of-delta, double values by XOR with their predecessor and
+int64 values as delta-of-delta, each with variable bit lengths. Strings are dictionary encoded
+with run lengths of dictionary indexes, and bools as run lengths of alternating values. A chunk
+starts with the number of samples, followed by the time stamps and then the values.
+"""
+
+import struct
+from typing import List, Tuple
+
+
+# (prefix, prefix length, value length) of the delta-of-delta buckets, the last one takes any value
+TIME_BUCKETS = ((0b10, 2, 16), (0b110, 3, 24), (0b1110, 4, 32), (0b1111, 4, 64))  # for jittering nanosecond time stamps
+INT64_BUCKETS = ((0b10, 2, 7), (0b110, 3, 9), (0b1110, 4, 12), (0b1111, 4, 64))  # as in the paper, e.g. for counters
+COMPRESSIBLE_TYPES = ('double', 'int64', 'bool', 'string')
+MASK64 = (1 << 64) - 1
+SIGN64 = 1 << 63
+
+
+class BitWriter:
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.acc = 0
+        self.bits = 0
+
+    def write(self, value: int, n: int) -> None:
+        """Appends the n lowest bits of value."""
+        self.acc = (self.acc << n) | (value & ((1 << n) - 1))
+        self.bits += n
+        if self.bits >= 64:
+            self.bits -= 64
+            self.buffer += (self.acc >> self.bits).to_bytes(8, 'big')
+            self.acc &= (1 << self.bits) - 1
+
+    def getvalue(self) -> bytes:
+        padding = -self.bits % 8
+        return bytes(self.buffer) + (self.acc << padding).to_bytes((self.bits + padding) // 8, 'big')
+
+
+def bit_string(data: bytes) -> str:
+    """Decoders slice the bits of a chunk out of a string of '0' and '1', which is faster than shifting integers."""
+    return bin(int.from_bytes(data, 'big'))[2:].zfill(len(data) * 8)
+
+
+def read_signed(bits: str, pos: int, n: int) -> int:
+    value = int(bits[pos:pos + n], 2)
+    if value >= 1 << (n - 1):
+        value -= 1 << n
+    return value
+
+
+def wrap64(value: int) -> int:
+    """Wraps around like a signed 64 bit integer, so that deltas of any int64 values fit into 64 bits."""
+    return ((value + SIGN64) & MASK64) - SIGN64
+
+
+def write_delta_of_deltas(writer: BitWriter, values: List[int], buckets) -> None:
+    """The first value is written with 64 bits, the first delta as delta-of-delta to 0."""
+    if not values:
+        return
+    writer.write(values[0], 64)
+    previous = values[0]
+    previous_delta = 0
+    for value in values[1:]:
+        delta = wrap64(value - previous)
+        dod = wrap64(delta - previous_delta)
+        if dod == 0:
+            writer.write(0, 1)
+        else:
+            for prefix, prefix_length, length in buckets:
+                if -(1 << (length - 1)) <= dod < (1 << (length - 1)):
+                    writer.write(prefix, prefix_length)
+                    writer.write(dod, length)
+                    break
+        previous = value
+        previous_delta = delta
+
+
+def read_delta_of_deltas(bits: str, pos: int, count: int, buckets) -> Tuple[List[int], int]:
+    """Returns the values and the position after them."""
+    if count == 0:
+        return [], pos
+    lengths = [length for prefix, prefix_length, length in buckets]
+    last = len(lengths) - 1
+    value = read_signed(bits, pos, 64)
+    pos += 64
+    values = [value]
+    append = values.append
+    delta = 0
+    for _ in range(count - 1):
+        if bits[pos] == '1':
+            pos += 1
+            index = 0
+            while index < last and bits[pos] == '1':
+                index += 1
+                pos += 1
+            if index < last:
+                pos += 1
+            n = lengths[index]
+            dod = int(bits[pos:pos + n], 2)
+            pos += n
+            if dod >= 1 << (n - 1):
+                dod -= 1 << n
+            delta += dod
+            if not -SIGN64 <= delta < SIGN64:
+                delta = wrap64(delta)
+        else:
+            pos += 1
+        value += delta
+        if not -SIGN64 <= value < SIGN64:
+            value = wrap64(value)
+        append(value)
+    return values, pos
+
+
+def write_xor_doubles(writer: BitWriter, values: List[float]) -> None:
+    if not values:
+        return
+    bits = [struct.unpack('>Q', struct.pack('>d', v))[0] for v in values]
+    writer.write(bits[0], 64)
+    previous = bits[0]
+    previous_leading = -1
+    previous_trailing = 0
+    for value in bits[1:]:
+        xor = value ^ previous
+        previous = value
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if previous_leading >= 0 and leading >= previous_leading and trailing >= previous_trailing:
+            # the meaningful bits fit into the window of the previous value
+            writer.write(0b10, 2)
+            writer.write(xor >> previous_trailing, 64 - previous_leading - previous_trailing)
+        else:
+            length = 64 - leading - trailing
+            writer.write(0b11, 2)
+            writer.write(leading, 5)
+            writer.write(length - 1, 6)
+            writer.write(xor >> trailing, length)
+            previous_leading = leading
+            previous_trailing = trailing
+
+
+def read_xor_doubles(bits: str, pos: int, count: int) -> Tuple[List[float], int]:
+    """Returns the values and the position after them."""
+    if count == 0:
+        return [], pos
+    value = int(bits[pos:pos + 64], 2)
+    pos += 64
+    words = [value]
+    append = words.append
+    leading = 0
+    trailing = 0
+    length = 64
+    for _ in range(count - 1):
+        if bits[pos] == '1':
+            if bits[pos + 1] == '1':
+                leading = int(bits[pos + 2:pos + 7], 2)
+                length = int(bits[pos + 7:pos + 13], 2) + 1
+                trailing = 64 - leading - length
+                pos += 13
+            else:
+                pos += 2
+            value ^= int(bits[pos:pos + length], 2) << trailing
+            pos += length
+        else:
+            pos += 1
+        append(value)
+    return list(struct.unpack(f'>{count}d', struct.pack(f'>{count}Q', *words))), pos
+
+
+def write_gamma(writer: BitWriter, n: int) -> None:
+    """Elias gamma code of n >= 1: 1 bit for 1, 3 bits for 2 and 3, 2 * floor(log2(n)) + 1 bits in general."""
+    length = n.bit_length()
+    writer.write(0, length - 1)
+    writer.write(n, length)
+
+
+def read_gamma(bits: str, pos: int) -> Tuple[int, int]:
+    """Returns the number and the position after it."""
+    one = bits.index('1', pos)
+    end = 2 * one - pos + 1
+    return int(bits[one:end], 2), end
+
+
+def runs(values: list) -> List[Tuple[object, int]]:
+    """Returns (value, run length) tuples of the consecutive equal values."""
+    result = []
+    for value in values:
+        if result and result[-1][0] == value:
+            result[-1][1] += 1
+        else:
+            result.append([value, 1])
+    return result
+
+
+def write_bool_runs(writer: BitWriter, values: list) -> None:
+    """The first value is written with 1 bit, followed by the run lengths of alternating values."""
+    if not values:
+        return
+    writer.write(1 if values[0] else 0, 1)
+    for value, length in runs([1 if v else 0 for v in values]):
+        write_gamma(writer, length)
+
+
+def read_bool_runs(bits: str, pos: int, count: int) -> Tuple[list, int]:
+    """Returns the values as integers 0 and 1, like they are stored in the samples table."""
+    if count == 0:
+        return [], pos
+    value = int(bits[pos])
+    pos += 1
+    values = []
+    while len(values) < count:
+        length, pos = read_gamma(bits, pos)
+        values += [value] * length
+        value ^= 1
+    return values, pos
+
+
+def write_dictionary_runs(writer: BitWriter, values: list) -> None:
+    """The dictionary of distinct strings is followed by (dictionary index, run length) tuples."""
+    dictionary = {}
+    for value in values:
+        dictionary.setdefault(value, len(dictionary))
+    writer.write(len(dictionary), 32)
+    for value in dictionary:
+        encoded = value.encode('utf-8')
+        writer.write(len(encoded), 32)
+        writer.write(int.from_bytes(encoded, 'big'), 8 * len(encoded))
+    width = (len(dictionary) - 1).bit_length()
+    for value, length in runs(values):
+        writer.write(dictionary[value], width)
+        write_gamma(writer, length)
+
+
+def read_dictionary_runs(bits: str, pos: int, count: int) -> Tuple[list, int]:
+    """The values refer to the string objects of the dictionary, so no string is allocated per sample."""
+    size = int(bits[pos:pos + 32], 2)
+    pos += 32
+    dictionary = []
+    for _ in range(size):
+        length = int(bits[pos:pos + 32], 2)
+        pos += 32
+        encoded = int(bits[pos:pos + 8 * length] or '0', 2).to_bytes(length, 'big')
+        pos += 8 * length
+        dictionary.append(encoded.decode('utf-8'))
+    width = (size - 1).bit_length() if size else 0
+    values = []
+    while len(values) < count:
+        index = int(bits[pos:pos + width], 2) if width else 0
+        pos += width
+        length, pos = read_gamma(bits, pos)
+        values += [dictionary[index]] * length
+    return values, pos
+
+
+def encode_chunk(channel_type: str, times: List[int], values: list) -> bytes:
+    """Encodes time stamps in ascending order and their values of the given channel type."""
+    writer = BitWriter()
+    writer.write(len(times), 32)
+    write_delta_of_deltas(writer, times, TIME_BUCKETS)
+    if channel_type == 'double':
+        write_xor_doubles(writer, [float(v) for v in values])
+    elif channel_type == 'int64':
+        write_delta_of_deltas(writer, [int(v) for v in values], INT64_BUCKETS)
+    elif channel_type == 'bool':
+        write_bool_runs(writer, values)
+    elif channel_type == 'string':
+        write_dictionary_runs(writer, [str(v) for v in values])
+    else:
+        raise ValueError(f"Channels of type '{channel_type}' cannot be compressed.")
+    return writer.getvalue()
+
+
+def decode_chunk(channel_type: str, data: bytes) -> Tuple[List[int], list]:
+    """Returns the time stamps and the values of a chunk."""
+    bits = bit_string(data)
+    count = int(bits[:32], 2)
+    times, pos = read_delta_of_deltas(bits, 32, count, TIME_BUCKETS)
+    if channel_type == 'double':
+        values, pos = read_xor_doubles(bits, pos, count)
+    elif channel_type == 'int64':
+        values, pos = read_delta_of_deltas(bits, pos, count, INT64_BUCKETS)
+    elif channel_type == 'bool':
+        values, pos = read_bool_runs(bits, pos, count)
+    elif channel_type == 'string':
+        values, pos = read_dictionary_runs(bits, pos, count)
+    else:
+        raise ValueError(f"Channels of type '{channel_type}' cannot be compressed.")
+    return times, values
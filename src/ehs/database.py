@@ -0,0 +1,1603 @@
+# -*- coding: utf-8 -*-
+
+"""The storage module of the EHS, which persists the sampled channel values in an SQLite database.
+"""
+
+import argparse
+import bisect
+import collections
+import contextlib
+from ehs import compression
+from ehs.storage import Storage, convert_value
+import itertools
+import logging
+import math
+import numpy
+import operator
+import os
+import os.path
+import pathlib
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Tuple
+
+
+SCHEMA_VERSION = 7  # stored as PRAGMA user_version, see migrate()
+BACKEND = "sqlite"
+BATCH_SIZE = 1000  # samples
+FLUSH_INTERVAL = 1.0  # seconds
+JOURNAL_MODE = "wal"
+SYNCHRONOUS = "normal"
+CHECKPOINT_INTERVAL = 10.0  # seconds
+WAL_SIZE_LIMIT = 67_108_864  # bytes, above which the Checkpointer resets the WAL, also the size it is truncated to after a checkpoint
+CHECKPOINT_ESCALATION = 30  # passive checkpoints in a row, which left pages behind, after which the readers are waited for
+CHECKPOINT_TIMEOUT = 0.05  # seconds, which a truncating checkpoint waits for readers, at most a tenth of the flush interval
+READERS = 4  # connections
+CHUNK_INTERVAL = 3600.0  # seconds
+SEAL_INTERVAL = 60.0  # seconds
+CACHED_STATEMENTS = 256  # prepared statements per connection
+RETENTION = None  # seconds, or None to keep the samples forever
+RETENTION_INTERVAL = 600.0  # seconds
+ROLLUPS = (60.0, 3600.0)  # resolutions in seconds
+ROLLUP_TYPES = ('double', 'int64', 'bool')
+MAINTENANCE_INTERVAL = 600.0  # seconds
+WRITE_LATENCY_BUDGET = 0.05  # seconds, which a maintenance step may delay a flush window
+VACUUM_PAGES = 64  # pages of the first incremental vacuum step
+REINDEX_THRESHOLD = 0.25  # dropped fraction of the chunks, after which their index is rebuilt
+WRITE_DURATIONS = 100  # flush windows, of which the write durations are kept for statistics()
+AGGREGATES = ('min', 'max', 'avg', 'sum', 'count', 'first', 'last', 'stddev')
+IMPORT_BATCH_SIZE = 100_000  # samples
+VALUE_DTYPES = {'double': numpy.float64, 'int64': numpy.int64, 'bool': numpy.bool_, 'string': object}
+DATABASE_CONF = """
+type: object
+properties:
+    database:
+        type: object
+        properties:
+            backend:
+                enum: [sqlite, memory]
+            capacity:
+                type: integer
+                minimum: 1
+            batch_size:
+                type: integer
+                minimum: 1
+            flush_interval:
+                type: number
+                exclusiveMinimum: 0
+            journal_mode:
+                enum: [wal, delete]
+            synchronous:
+                enum: [normal, full, extra]
+            checkpoint_interval:
+                type: number
+                exclusiveMinimum: 0
+            wal_size_limit:
+                type: integer
+                minimum: 0
+            readers:
+                type: integer
+                minimum: 1
+            chunk_interval:
+                type: number
+                exclusiveMinimum: 0
+            seal_interval:
+                type: number
+                exclusiveMinimum: 0
+            retention:
+                type: number
+                exclusiveMinimum: 0
+            retention_interval:
+                type: number
+                exclusiveMinimum: 0
+            rollups:
+                type: array
+                items:
+                    type: number
+                    exclusiveMinimum: 0
+            maintenance_interval:
+                type: number
+                exclusiveMinimum: 0
+            write_latency_budget:
+                type: number
+                exclusiveMinimum: 0
+"""
+
+
+def migrate(db_con: sqlite3.Connection) -> None:
+    """Brings a database of an older EHS version up to SCHEMA_VERSION, one transaction per version."""
+    migrations = [migrate_to_time_keyed_tables, migrate_to_integer_time, migrate_to_samples_table, migrate_to_chunks, migrate_to_rollups, migrate_to_rollup_squares,
+                  migrate_to_complete_rollups]
+    version = db_con.execute("PRAGMA user_version;").fetchone()[0]
+    for next_version in range(version + 1, SCHEMA_VERSION + 1):
+        logging.info(f"Migrating the database to schema version {next_version} ...")
+        db_con.execute("BEGIN;")
+        try:
+            migrations[next_version - 1](db_con)
+            db_con.execute(f"PRAGMA user_version={next_version};")
+            db_con.commit()
+        except Exception:
+            db_con.rollback()
+            raise
+
+
+def rebuild_channel_tables(db_con: sqlite3.Connection, time_type, time_expression) -> None:
+    """Copies every channel table into a new one clustered by time and replaces the former table by it."""
+    table_names = [row[0] for row in db_con.execute("SELECT name FROM sqlite_schema WHERE type='table' AND name NOT LIKE 'sqlite_%';")]
+    for table_name in table_names:
+        value_type = db_con.execute("SELECT type FROM pragma_table_info(?) WHERE name='value';", (table_name,)).fetchone()[0]
+        db_con.execute("CREATE TABLE {tn}__migration (time {tt} PRIMARY KEY, value {ct}) WITHOUT ROWID;".format(tn=table_name, tt=time_type, ct=value_type))
+        db_con.execute("INSERT OR REPLACE INTO {tn}__migration SELECT {te}, value FROM {tn} ORDER BY time;".format(tn=table_name, te=time_expression))
+        db_con.execute("DROP TABLE {tn};".format(tn=table_name))
+        db_con.execute("ALTER TABLE {tn}__migration RENAME TO {tn};".format(tn=table_name))
+
+
+def migrate_to_time_keyed_tables(db_con: sqlite3.Connection) -> None:
+    """Version 1: rebuilds the former (time REAL, value) heap tables as tables clustered by time."""
+    rebuild_channel_tables(db_con, "REAL", "time")
+
+
+def migrate_to_integer_time(db_con: sqlite3.Connection) -> None:
+    """Version 2: stores the time stamps as INTEGER nanoseconds instead of REAL."""
+    rebuild_channel_tables(db_con, "INTEGER", "CAST(time AS INTEGER)")
+
+
+def migrate_to_samples_table(db_con: sqlite3.Connection) -> None:
+    """Version 3: moves the samples of all channel tables into the channels dictionary and the samples table.
+
+    The former tables don't distinguish bool from int64 channels. Such channels are registered
+    as int64, until the EHS configuration declares their type with Database.create_channel().
+    """
+    channel_types = {'INTEGER': 'int64', 'REAL': 'double', 'TEXT': 'string'}
+    table_names = [row[0] for row in db_con.execute("SELECT name FROM sqlite_schema WHERE type='table' AND name NOT LIKE 'sqlite_%';")]
+    db_con.execute("CREATE TABLE channels (id INTEGER PRIMARY KEY, adapter TEXT NOT NULL, variable TEXT NOT NULL, type TEXT NOT NULL, UNIQUE (adapter, variable));")
+    db_con.execute("CREATE TABLE samples (channel INTEGER NOT NULL, time INTEGER NOT NULL, value, PRIMARY KEY (channel, time)) WITHOUT ROWID;")
+    for table_name in table_names:
+        adapter_name, variable_name = table_name.split('__', 1)
+        value_type = db_con.execute("SELECT type FROM pragma_table_info(?) WHERE name='value';", (table_name,)).fetchone()[0]
+        channel_id = db_con.execute("INSERT INTO channels (adapter, variable, type) VALUES (?, ?, ?);",
+                                    (adapter_name, variable_name, channel_types[value_type])).lastrowid
+        db_con.execute("INSERT INTO samples SELECT ?, time, value FROM {tn} ORDER BY time;".format(tn=table_name), (channel_id,))
+        db_con.execute("DROP TABLE {tn};".format(tn=table_name))
+
+
+def migrate_to_chunks(db_con: sqlite3.Connection) -> None:
+    """Version 4: adds the table of compressed chunks, each holding the samples of one channel and time window."""
+    db_con.execute("CREATE TABLE chunks (channel INTEGER NOT NULL, begin INTEGER NOT NULL, end INTEGER NOT NULL, count INTEGER NOT NULL, data BLOB NOT NULL, PRIMARY KEY (channel, begin));")
+
+
+def migrate_to_rollups(db_con: sqlite3.Connection) -> None:
+    """Version 5: adds the table of rollups, each holding the aggregates of one channel, resolution and time bucket.
+
+    The rollups of the samples before the migration are computed by the RollupBackfiller, see version 7.
+    """
+    db_con.execute("CREATE TABLE rollups (channel INTEGER NOT NULL, resolution INTEGER NOT NULL, begin INTEGER NOT NULL, count INTEGER NOT NULL, "
+                   "total REAL NOT NULL, minimum NOT NULL, maximum NOT NULL, first_time INTEGER NOT NULL, first NOT NULL, last_time INTEGER NOT NULL, last NOT NULL, "
+                   "PRIMARY KEY (channel, resolution, begin)) WITHOUT ROWID;")
+
+
+def migrate_to_rollup_squares(db_con: sqlite3.Connection) -> None:
+    """Version 6: adds the sum of squares to the rollups, which is NULL for the buckets rolled up before."""
+    db_con.execute("ALTER TABLE rollups ADD COLUMN squares REAL;")
+
+
+def migrate_to_complete_rollups(db_con: sqlite3.Connection) -> None:
+    """Version 7: adds the table of the resolutions, of which the rollups cover all samples.
+
+    It starts empty, so the rollups of all configured resolutions are recomputed once by the RollupBackfiller,
+    including the ones without samples from before version 5 and the sum of squares missing before version 6.
+    """
+    db_con.execute("CREATE TABLE complete_rollups (resolution INTEGER PRIMARY KEY) WITHOUT ROWID;")
+
+
+def merge_time_series(older, newer):
+    """Merges two lists of (time, value) tuples in ascending order, while newer samples replace older ones."""
+    if not older:
+        return newer
+    if not newer:
+        return older
+    if older[-1][0] < newer[0][0]:
+        return older + newer
+    merged = dict(older)
+    merged.update(newer)
+    return sorted(merged.items())
+
+
+def merge_columns(older, newer):
+    """Merges two (times, values) tuples of arrays in ascending order of time, while newer samples replace older ones."""
+    if len(older[0]) == 0:
+        return newer
+    if len(newer[0]) == 0:
+        return older
+    times = numpy.concatenate((older[0], newer[0]))
+    values = numpy.concatenate((older[1], newer[1]))
+    if older[0][-1] < newer[0][0]:
+        return times, values
+    # a stable sort keeps newer samples behind older ones of the same time stamp, of which the last one is kept
+    order = numpy.argsort(times, kind='stable')
+    times = times[order]
+    last = numpy.append(times[1:] != times[:-1], True)
+    return times[last], values[order][last]
+
+
+def to_arrays(times, values, channel_type):
+    """Returns the lists of times and values as (times, values) tuple of arrays, without the samples without value."""
+    if None in values:
+        times = [t for t, value in zip(times, values) if value is not None]
+        values = [value for value in values if value is not None]
+    return numpy.array(times, dtype=numpy.int64), numpy.array(values, dtype=VALUE_DTYPES.get(channel_type, object))
+
+
+def to_columns(time_series, channel_type):
+    """Returns the (time, value) tuples of a time series as (times, values) tuple of arrays, without the samples without value."""
+    return to_arrays([sample[0] for sample in time_series], [sample[1] for sample in time_series], channel_type)
+
+
+def get_database(root_dir, database_config: dict) -> Storage:
+    """Creates the storage backend as specified by the optional 'database' section of the EHS configuration."""
+    if database_config.get('backend', BACKEND) == 'memory':
+        # imported here, since ehs.memory builds on this module
+        from ehs.memory import MemoryStorage, CAPACITY
+        return MemoryStorage(
+            capacity=database_config.get('capacity', CAPACITY),
+            retention=database_config.get('retention', RETENTION),
+            retention_interval=database_config.get('retention_interval', RETENTION_INTERVAL))
+    return Database(
+        root_dir,
+        batch_size=database_config.get('batch_size', BATCH_SIZE),
+        flush_interval=database_config.get('flush_interval', FLUSH_INTERVAL),
+        journal_mode=database_config.get('journal_mode', JOURNAL_MODE),
+        synchronous=database_config.get('synchronous', SYNCHRONOUS),
+        checkpoint_interval=database_config.get('checkpoint_interval', CHECKPOINT_INTERVAL),
+        wal_size_limit=database_config.get('wal_size_limit', WAL_SIZE_LIMIT),
+        readers=database_config.get('readers', READERS),
+        chunk_interval=database_config.get('chunk_interval', CHUNK_INTERVAL),
+        seal_interval=database_config.get('seal_interval', SEAL_INTERVAL),
+        retention=database_config.get('retention', RETENTION),
+        retention_interval=database_config.get('retention_interval', RETENTION_INTERVAL),
+        rollups=database_config.get('rollups', ROLLUPS),
+        maintenance_interval=database_config.get('maintenance_interval', MAINTENANCE_INTERVAL),
+        write_latency_budget=database_config.get('write_latency_budget', WRITE_LATENCY_BUDGET))
+
+
+def aggregate_columns(times, values, begin_inclusive, bucket_width, aggregates):
+    """Returns the (bucket begin, aggregate values) tuples of the non-empty buckets of numeric columns, see AGGREGATES."""
+    if len(times) == 0:
+        return []
+    values = values.astype(numpy.float64)
+    buckets = (times - begin_inclusive) // bucket_width
+    starts = numpy.flatnonzero(numpy.diff(buckets, prepend=buckets[0] - 1))
+    counts = numpy.diff(numpy.append(starts, len(times)))
+    sums = numpy.add.reduceat(values, starts)
+    columns = []
+    for aggregate in aggregates:
+        if aggregate == 'min':
+            columns.append(numpy.minimum.reduceat(values, starts))
+        elif aggregate == 'max':
+            columns.append(numpy.maximum.reduceat(values, starts))
+        elif aggregate == 'avg':
+            columns.append(sums / counts)
+        elif aggregate == 'sum':
+            columns.append(sums)
+        elif aggregate == 'count':
+            columns.append(counts)
+        elif aggregate == 'first':
+            columns.append(values[starts])
+        elif aggregate == 'last':
+            columns.append(values[starts + counts - 1])
+        elif aggregate == 'stddev':
+            # the population standard deviation, from the deviations of the bucket means
+            deviations = values - numpy.repeat(sums / counts, counts)
+            columns.append(numpy.sqrt(numpy.add.reduceat(deviations * deviations, starts) / counts))
+        else:
+            raise ValueError(f"Unknown aggregate '{aggregate}'.")
+    begins = (begin_inclusive + buckets[starts] * bucket_width).tolist()
+    return list(zip(begins, numpy.column_stack(columns).tolist()))
+
+
+def aggregate_rollups(rows, aggregates):
+    """Returns the aggregates of the (count, total, minimum, maximum, first, last, squares) rows of consecutive rollup buckets."""
+    count = sum(row[0] for row in rows)
+    total = sum(row[1] for row in rows)
+    results = []
+    for aggregate in aggregates:
+        if aggregate == 'min':
+            results.append(min(row[2] for row in rows))
+        elif aggregate == 'max':
+            results.append(max(row[3] for row in rows))
+        elif aggregate == 'avg':
+            results.append(total / count)
+        elif aggregate == 'sum':
+            results.append(total)
+        elif aggregate == 'count':
+            results.append(count)
+        elif aggregate == 'first':
+            results.append(rows[0][4])
+        elif aggregate == 'last':
+            results.append(rows[-1][5])
+        elif aggregate == 'stddev':
+            # the population standard deviation, from the sum of squares
+            mean = total / count
+            results.append(math.sqrt(max(sum(row[6] for row in rows) / count - mean * mean, 0.0)))
+        else:
+            raise ValueError(f"Unknown aggregate '{aggregate}'.")
+    return results
+
+
+def group_buckets(rows, begin_inclusive, bucket_width):
+    """Groups rows, which start with a time stamp in ascending order, into lists per bucket and returns (bucket begin, rows) tuples."""
+    groups = []
+    for row in rows:
+        begin = row[0] - (row[0] - begin_inclusive) % bucket_width
+        if groups and groups[-1][0] == begin:
+            groups[-1][1].append(row[1:])
+        else:
+            groups.append((begin, [row[1:]]))
+    return groups
+
+
+def query_samples(db_con: sqlite3.Connection, channel_types: Dict[int, str], channel_ids, begin_inclusive, end_exclusive, chunk_width):
+    """Reads the samples of the channel ids in the time range with one query of the chunks and one of the samples table.
+
+    No chunk is wider than chunk_width, so the chunks, which overlap the time range, begin within chunk_width
+    before it and the scan of the (channel, begin) key is bounded on both sides, whatever the length of the history.
+
+    Returns the (times, values) lists of the decoded chunks per channel id and the (times, values)
+    lists of the samples table per channel id, which replace sealed samples with the same time stamp.
+    """
+    ids = ", ".join("?" * len(channel_ids))
+    sqlcmd = "SELECT channel, data FROM chunks WHERE channel IN ({ids}) AND begin>? AND begin<? AND end>? ORDER BY channel, begin;".format(ids=ids)
+    chunks = db_con.execute(sqlcmd, tuple(channel_ids) + (max(begin_inclusive - chunk_width, -2 ** 63), end_exclusive, begin_inclusive)).fetchall()
+    sqlcmd = "SELECT channel, time, value FROM samples WHERE channel IN ({ids}) AND time>=? AND time<? ORDER BY channel, time;".format(ids=ids)
+    head = {}
+    head_channel_id = None
+    for channel_id, t, value in db_con.execute(sqlcmd, tuple(channel_ids) + (begin_inclusive, end_exclusive)):
+        if channel_id != head_channel_id:
+            head_channel_id = channel_id
+            head_times, head_values = head.setdefault(channel_id, ([], []))
+        head_times.append(t)
+        head_values.append(value)
+
+    sealed = {}
+    for channel_id, data in chunks:
+        times, values = compression.decode_chunk(channel_types[channel_id], data)
+        lo = bisect.bisect_left(times, begin_inclusive)
+        hi = bisect.bisect_left(times, end_exclusive)
+        sealed_times, sealed_values = sealed.setdefault(channel_id, ([], []))
+        sealed_times.extend(times[lo:hi])
+        sealed_values.extend(values[lo:hi])
+    return sealed, head
+
+
+def read_columns(db_con: sqlite3.Connection, channel_id, channel_type, begin_inclusive, end_exclusive, chunk_width):
+    """Returns the (times, values) tuple of arrays of a channel in the time range, read with db_con."""
+    sealed, head = query_samples(db_con, {channel_id: channel_type}, [channel_id], begin_inclusive, end_exclusive, chunk_width)
+    return merge_columns(to_arrays(*sealed.get(channel_id, ([], [])), channel_type), to_arrays(*head.get(channel_id, ([], [])), channel_type))
+
+
+def next_sample_time(db_con: sqlite3.Connection, channel_id, t, chunk_width):
+    """Returns the time stamp of the first sample of the channel at or after t, or None.
+
+    For sealed samples, it is the begin of their chunk, if the chunk begins later than t.
+    Chunks, which end after t, begin within chunk_width before t, see query_samples().
+    """
+    sqlcmd = "SELECT min(begin) FROM chunks WHERE channel=? AND begin>? AND end>?;"
+    chunk_begin = db_con.execute(sqlcmd, (channel_id, max(t - chunk_width, -2 ** 63), t)).fetchone()[0]
+    sample_time = db_con.execute("SELECT min(time) FROM samples WHERE channel=? AND time>=?;", (channel_id, t)).fetchone()[0]
+    times = [max(chunk_begin, t)] if chunk_begin is not None else []
+    times += [sample_time] if sample_time is not None else []
+    return min(times) if times else None
+
+
+def rollup_rows(channel_id, rollup, times, values):
+    """Returns the rows of the rollups table of the buckets of rollup, which hold the samples of a channel in ascending order of time."""
+    if len(times) == 0:
+        return []
+    values = values.astype(numpy.int64) if values.dtype == numpy.bool_ else values
+    buckets = times - times % rollup
+    starts = numpy.flatnonzero(numpy.diff(buckets, prepend=buckets[0] - 1))
+    ends = numpy.append(starts[1:], len(buckets)) - 1
+    floats = values.astype(numpy.float64)
+    return list(zip([channel_id] * len(starts), [rollup] * len(starts), buckets[starts].tolist(),
+                    (ends - starts + 1).tolist(), numpy.add.reduceat(floats, starts).tolist(),
+                    numpy.minimum.reduceat(values, starts).tolist(), numpy.maximum.reduceat(values, starts).tolist(),
+                    times[starts].tolist(), values[starts].tolist(), times[ends].tolist(), values[ends].tolist(),
+                    numpy.add.reduceat(floats * floats, starts).tolist()))
+
+
+def rebuild_buckets(db_con: sqlite3.Connection, channel_id, channel_type, rollup, begin_inclusive, end_exclusive, chunk_width) -> None:
+    """Replaces the buckets of rollup of a channel, which begin in the time range aligned to rollup, by ones recomputed from its samples, without committing."""
+    times, values = read_columns(db_con, channel_id, channel_type, begin_inclusive, end_exclusive, chunk_width)
+    db_con.execute("DELETE FROM rollups WHERE channel=? AND resolution=? AND begin>=? AND begin<?;", (channel_id, rollup, begin_inclusive, end_exclusive))
+    db_con.executemany("INSERT INTO rollups (channel, resolution, begin, count, total, minimum, maximum, first_time, first, last_time, last, squares) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);", rollup_rows(channel_id, rollup, times, values))
+
+
+class Request:
+    """A mutation, which is executed by the DatabaseWriter with its connection as first argument."""
+
+    def __init__(self, function, *args) -> None:
+        self.function = function
+        self.args = args
+        self.result = None
+        self.error: Exception = None
+        self.done = threading.Event()
+
+    def execute(self, db_con: sqlite3.Connection) -> None:
+        try:
+            self.result = self.function(db_con, *self.args)
+        except Exception as e:
+            self.error = e
+        self.done.set()
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class DatabaseWriter(threading.Thread):
+    """The single writer actor, which owns the read-write connection to the database.
+
+    All mutations are serialized through the inbox of the writer. Samples are collected
+    into flush windows, which end after batch_size samples or flush_interval seconds,
+    whatever comes first, and are written with executemany in a single transaction.
+    Requests are executed in the order they arrive, after the samples queued before them.
+
+    The rollups of each flush window are aggregated in memory and merged into the rollups
+    table by one upsert per channel, resolution and bucket, in the transaction of the window.
+    A sample, which isn't newer than all stored samples of its channel, may replace one, so the
+    buckets it falls into are recomputed from the samples instead, see rewritten_buckets().
+    """
+
+    def __init__(self, data_file, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, journal_mode=JOURNAL_MODE, synchronous=SYNCHRONOUS,
+                 wal_size_limit=WAL_SIZE_LIMIT, channel_types: Dict[int, str] = None, rollups_ns=(), chunk_width_ns=int(CHUNK_INTERVAL * 1_000_000_000)) -> None:
+        threading.Thread.__init__(self, name="database-writer", daemon=True)
+        self.data_file = data_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.wal_size_limit = wal_size_limit
+        self.channel_types = {} if channel_types is None else channel_types
+        self.rollups_ns = rollups_ns
+        # the width of the widest chunk, see query_samples()
+        self.chunk_width_ns = chunk_width_ns
+        self.inbox = queue.Queue()
+        # guards stopped, so that no message is queued behind the stop
+        self.lock = threading.Lock()
+        self.stopped = False
+        self.db_con: sqlite3.Connection = None
+        # the seconds of the last flush windows, from the insert to the commit
+        self.write_durations = collections.deque(maxlen=WRITE_DURATIONS)
+        # a time stamp per channel id, after which no sample has been stored, loaded on demand
+        self.latest_times: Dict[int, int] = {}
+
+    def put(self, message) -> None:
+        with self.lock:
+            if self.stopped:
+                raise sqlite3.ProgrammingError("The database writer has been stopped.")
+            self.inbox.put(message)
+
+    def tell(self, channel_id, t, value) -> None:
+        """Queues a sample for the current flush window."""
+        self.put((channel_id, t, value))
+
+    def ask(self, function, *args):
+        """Executes function(db_con, *args) in the writer thread and returns its result."""
+        request = Request(function, *args)
+        self.put(request)
+        return request.wait()
+
+    def stop(self) -> None:
+        """Writes the open flush window, closes the connection and ends the thread, after which tell() and ask() raise."""
+        with self.lock:
+            if self.stopped:
+                return
+            self.stopped = True
+            self.inbox.put(None)
+        self.join()
+
+    def run(self) -> None:
+        self.db_con = sqlite3.connect(self.data_file, cached_statements=CACHED_STATEMENTS)
+        # only takes effect on a new database, before the journal mode writes its first page, see main() for existing ones
+        self.db_con.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+        self.db_con.execute(f"PRAGMA journal_mode={self.journal_mode};")
+        self.db_con.execute(f"PRAGMA synchronous={self.synchronous};")
+        if self.journal_mode == "wal":
+            # checkpoints are left to the Checkpointer, so that no commit of a flush window has to run one
+            self.db_con.execute("PRAGMA wal_autocheckpoint=0;")
+            self.db_con.execute(f"PRAGMA journal_size_limit={self.wal_size_limit};")
+        while True:
+            batch, message = self.collect_batch()
+            if batch:
+                self.write_batch(batch)
+            if isinstance(message, Request):
+                message.execute(self.db_con)
+            elif message is None:
+                break
+        self.db_con.close()
+
+    def collect_batch(self):
+        """Waits for the first sample and collects further ones until the flush window closes.
+
+        Returns the batch and the message, which closed the window early: a Request, None for
+        a stop, or False if the window closed regularly.
+        """
+        message = self.inbox.get()
+        if not isinstance(message, tuple):
+            return [], message
+        batch = [message]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                message = self.inbox.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if not isinstance(message, tuple):
+                return batch, message
+            batch.append(message)
+        return batch, False
+
+    def write_batch(self, batch) -> None:
+        """Writes the samples of one flush window and their rollups in a single transaction, in the order of the primary key.
+
+        If the transaction fails, it is rolled back and the samples are written one channel at a time,
+        so that only the samples of a failing channel are dropped, but never committed without their rollups.
+        """
+        batch.sort(key=lambda sample: sample[:2])
+        # of several samples with the same channel and time stamp, the last one is kept
+        batch = list({sample[:2]: sample for sample in batch}.values())
+        start = time.perf_counter()
+        try:
+            latest_times = self.write_samples(batch)
+            self.db_con.commit()
+            self.latest_times.update(latest_times)
+        except Exception as e:
+            self.db_con.rollback()
+            logging.error(e)
+            for channel_id, samples in itertools.groupby(batch, key=operator.itemgetter(0)):
+                samples = list(samples)
+                try:
+                    latest_times = self.write_samples(samples)
+                    self.db_con.commit()
+                    self.latest_times.update(latest_times)
+                except Exception as e:
+                    self.db_con.rollback()
+                    logging.error(f"Dropped {len(samples)} samples of channel {channel_id}: {e}")
+        self.write_durations.append(time.perf_counter() - start)
+
+    def write_samples(self, samples) -> Dict[int, int]:
+        """Inserts the sorted samples and merges their rollups, without committing.
+
+        Returns the latest time stamps of the channels, which may only be recorded in latest_times after the commit.
+        """
+        rewritten, latest_times = self.rewritten_buckets(samples) if self.rollups_ns else (set(), {})
+        self.db_con.executemany("INSERT OR REPLACE INTO samples VALUES (?, ?, ?);", samples)
+        if self.rollups_ns:
+            self.db_con.executemany(ROLLUP_UPSERT, self.aggregate_batch(samples, rewritten))
+            for channel_id, resolution, begin in sorted(rewritten):
+                rebuild_buckets(self.db_con, channel_id, self.channel_types[channel_id], resolution, begin, begin + resolution, self.chunk_width_ns)
+        return latest_times
+
+    def rewritten_buckets(self, samples):
+        """Returns the (channel id, resolution, begin) keys of the rollup buckets of the sorted samples of numeric channels, which may replace a stored sample.
+
+        Also returns the latest time stamps of the channels including the samples, without recording them in latest_times.
+        """
+        rewritten = set()
+        latest_times = {}
+        for channel_id, channel_samples in itertools.groupby(samples, key=operator.itemgetter(0)):
+            if self.channel_types.get(channel_id) not in ROLLUP_TYPES:
+                continue
+            channel_samples = list(channel_samples)
+            latest = self.latest_times.get(channel_id)
+            if latest is None:
+                last_time = self.db_con.execute("SELECT max(time) FROM samples WHERE channel=?;", (channel_id,)).fetchone()[0]
+                # chunks don't overlap, so the last one ends latest
+                chunk = self.db_con.execute("SELECT end FROM chunks WHERE channel=? ORDER BY begin DESC LIMIT 1;", (channel_id,)).fetchone()
+                latest = max(-1 if last_time is None else last_time, -1 if chunk is None else chunk[0] - 1)
+            for _, t, value in channel_samples:
+                if t > latest:
+                    break
+                rewritten.update((channel_id, resolution, t - t % resolution) for resolution in self.rollups_ns)
+            latest_times[channel_id] = max(latest, channel_samples[-1][1])
+        return rewritten, latest_times
+
+    def aggregate_batch(self, batch, rewritten=frozenset()):
+        """Returns the rollup rows of the samples of numeric channels in a sorted batch, except for the rewritten buckets.
+
+        The sum and the sum of squares are accumulated as floats, like the REAL columns they are
+        stored in, since the squares of large int64 values, e.g. nanosecond clocks, overflow INTEGER.
+        NaN is stored as NULL by SQLite, so like samples without value, it isn't rolled up.
+        """
+        buckets = {}
+        for channel_id, t, value in batch:
+            if value is None or self.channel_types.get(channel_id) not in ROLLUP_TYPES:
+                continue
+            number = float(value)
+            if math.isnan(number):
+                continue
+            for resolution in self.rollups_ns:
+                key = (channel_id, resolution, t - t % resolution)
+                if key in rewritten:
+                    continue
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [1, number, value, value, t, value, t, value, number * number]
+                else:
+                    bucket[0] += 1
+                    bucket[1] += number
+                    if value < bucket[2]:
+                        bucket[2] = value
+                    if value > bucket[3]:
+                        bucket[3] = value
+                    bucket[6] = t
+                    bucket[7] = value
+                    bucket[8] += number * number
+        return [key + tuple(bucket) for key, bucket in buckets.items()]
+
+
+# merges the aggregates of a flush window into a rollup, of which the buckets only get samples newer than the stored ones
+ROLLUP_UPSERT = """INSERT INTO rollups (channel, resolution, begin, count, total, minimum, maximum, first_time, first, last_time, last, squares)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (channel, resolution, begin) DO UPDATE SET
+count=count+excluded.count, total=total+excluded.total, squares=squares+excluded.squares, minimum=min(minimum, excluded.minimum), maximum=max(maximum, excluded.maximum),
+first_time=min(first_time, excluded.first_time), first=CASE WHEN excluded.first_time<first_time THEN excluded.first ELSE first END,
+last_time=max(last_time, excluded.last_time), last=CASE WHEN excluded.last_time>=last_time THEN excluded.last ELSE last END;"""
+
+
+# the samples of a window, which are sealed into its chunk
+SEALED_ROWS = "SELECT time, value FROM samples WHERE channel=? AND time>=? AND time<? AND value IS NOT NULL ORDER BY time;"
+
+
+def reset_wal(db_con: sqlite3.Connection, readers: "ReadConnectionPool", timeout):
+    """Executed by the writer: checkpoints and truncates the WAL and returns (busy, WAL pages, checkpointed pages).
+
+    The readers of the pool are paused, so that the checkpoint doesn't have to wait for a moment without
+    readers. It waits at most timeout seconds for the current readers and for the ones of other processes.
+    """
+    with readers.pause(timeout) as idle:
+        if not idle:
+            return 1, None, None
+        busy_timeout = db_con.execute("PRAGMA busy_timeout;").fetchone()[0]
+        db_con.execute(f"PRAGMA busy_timeout={int(timeout * 1000)};")
+        try:
+            return db_con.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchone()
+        finally:
+            db_con.execute(f"PRAGMA busy_timeout={busy_timeout};")
+
+
+class Checkpointer(threading.Thread):
+    """Copies the WAL content back into the database file in the background.
+
+    Passive checkpoints neither wait for readers nor block the DatabaseWriter. Pages of
+    transactions, which are still needed by a reader, are left in the WAL for the next run.
+    With readers always active, the WAL would never be reset and grow without limit. So once
+    it exceeds wal_size_limit bytes, or CHECKPOINT_ESCALATION passive checkpoints in a row
+    left pages behind, the WAL is reset by the writer between two flush windows, see reset_wal().
+    A truncating checkpoint keeps other writers out while it waits for the readers, so it runs
+    in the writer, which holds back new readers and waits at most CHECKPOINT_TIMEOUT seconds or
+    a tenth of its flush interval for the current ones. If they stay busy, it is tried again in the next run.
+    """
+
+    def __init__(self, data_file, writer: DatabaseWriter, readers: "ReadConnectionPool", interval=CHECKPOINT_INTERVAL, wal_size_limit=WAL_SIZE_LIMIT) -> None:
+        threading.Thread.__init__(self, name="database-checkpointer", daemon=True)
+        self.data_file = data_file
+        self.writer = writer
+        self.readers = readers
+        self.interval = interval
+        self.wal_size_limit = wal_size_limit
+        self.timeout = min(CHECKPOINT_TIMEOUT, writer.flush_interval / 10)
+        # the passive checkpoints in a row, which left pages in the WAL
+        self.incomplete = 0
+        self.stopped = threading.Event()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        db_con = sqlite3.connect(self.data_file)
+        page_size = db_con.execute("PRAGMA page_size;").fetchone()[0]
+        while not self.stopped.wait(self.interval):
+            try:
+                self.checkpoint(db_con, page_size)
+            except Exception as e:
+                logging.error(e)
+        db_con.close()
+
+    def checkpoint(self, db_con: sqlite3.Connection, page_size) -> None:
+        busy, wal_pages, checkpointed_pages = db_con.execute("PRAGMA wal_checkpoint(PASSIVE);").fetchone()
+        logging.debug(f"Checkpointed {checkpointed_pages} of {wal_pages} WAL pages.")
+        self.incomplete = self.incomplete + 1 if checkpointed_pages < wal_pages else 0
+        if wal_pages * page_size > self.wal_size_limit or self.incomplete >= CHECKPOINT_ESCALATION:
+            busy, _, checkpointed_pages = self.writer.ask(reset_wal, self.readers, self.timeout)
+            if busy:
+                logging.warning(f"The WAL of {wal_pages} pages could not be reset, since readers were busy for {self.timeout} s.")
+            else:
+                logging.debug(f"Reset the WAL after checkpointing {checkpointed_pages} pages.")
+                self.incomplete = 0
+
+
+class ChunkSealer(threading.Thread):
+    """Runs Database.seal() periodically, so that the encoding doesn't take place in the DatabaseWriter."""
+
+    def __init__(self, database: "Database", interval=SEAL_INTERVAL) -> None:
+        threading.Thread.__init__(self, name="database-sealer", daemon=True)
+        self.database = database
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                chunks = self.database.seal()
+                if chunks:
+                    logging.debug(f"Sealed {chunks} chunks.")
+            except Exception as e:
+                logging.error(e)
+
+
+class Expirer(threading.Thread):
+    """Runs the expire() of a storage backend periodically, so that expired samples are dropped in the background."""
+
+    def __init__(self, database: Storage, interval=RETENTION_INTERVAL) -> None:
+        threading.Thread.__init__(self, name="database-expirer", daemon=True)
+        self.database = database
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                chunks = self.database.expire()
+                if chunks:
+                    logging.debug(f"Dropped {chunks} expired chunks.")
+            except Exception as e:
+                logging.error(e)
+
+
+class RollupBackfiller(threading.Thread):
+    """Computes the rollups of the resolutions, which don't cover all samples yet, from the samples in the background.
+
+    That is the case after a migration from a version without rollups or after a resolution has been
+    added to the configuration. Until a resolution is complete, queries don't use it, see Database.select_rollup().
+    """
+
+    def __init__(self, database: "Database", resolutions) -> None:
+        threading.Thread.__init__(self, name="database-backfiller", daemon=True)
+        self.database = database
+        self.resolutions = resolutions
+        self.stopped = threading.Event()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        try:
+            for rollup in self.resolutions:
+                start = time.perf_counter()
+                for channel_id, channel_type in list(self.database.channel_types.items()):
+                    if channel_type in ROLLUP_TYPES and not self.database.backfill_rollup(channel_id, rollup, self.stopped):
+                        return
+                self.database.writer.ask(self.database.complete_rollup, rollup)
+                logging.info(f"Computed the rollups of {rollup / 1_000_000_000} s in {time.perf_counter() - start:.1f} s.")
+        except Exception as e:
+            logging.error(e)
+
+
+class Maintainer(threading.Thread):
+    """Reclaims the space of dropped chunks and keeps the indexes compact in the background.
+
+    The free pages are returned to the file system by incremental vacuum steps of the DatabaseWriter.
+    The number of pages of a step is adapted, so that a step takes at most write_latency_budget
+    seconds: it is halved after a step over the budget and doubled after one under half of it.
+    After each step, the maintainer pauses as long as the step took, so at least half of the time
+    of the writer is left to the flush windows. The index of the chunks is rebuilt, if more than
+    REINDEX_THRESHOLD of them have been dropped since the last rebuild. The state of the current
+    or last run is kept in progress.
+    """
+
+    def __init__(self, database: "Database", interval=MAINTENANCE_INTERVAL, write_latency_budget=WRITE_LATENCY_BUDGET) -> None:
+        threading.Thread.__init__(self, name="database-maintainer", daemon=True)
+        self.database = database
+        self.interval = interval
+        self.write_latency_budget = write_latency_budget
+        self.stopped = threading.Event()
+        self.pages = VACUUM_PAGES
+        self.progress = {'state': 'idle', 'runs': 0, 'reclaimed_pages': 0, 'free_pages': None,
+                         'reindexes': 0, 'step_pages': self.pages, 'step_duration': 0.0, 'last_run': None}
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                self.maintain()
+            except Exception as e:
+                logging.error(e)
+            finally:
+                self.progress['state'] = 'idle'
+
+    def maintain(self) -> None:
+        """Runs one maintenance: rebuilds the index of the chunks, if due, vacuums the free pages and updates the statistics of the query planner."""
+        self.progress['runs'] += 1
+        self.progress['last_run'] = time.time_ns()
+        if self.database.reindex_due():
+            self.progress['state'] = 'reindexing'
+            self.database.writer.ask(self.database.reindex_chunks)
+            self.progress['reindexes'] += 1
+        self.progress['state'] = 'vacuuming'
+        reclaimed = self.vacuum()
+        if reclaimed:
+            logging.debug(f"Reclaimed {reclaimed} free pages.")
+        self.progress['state'] = 'optimizing'
+        self.database.writer.ask(lambda db_con: db_con.execute("PRAGMA optimize;"))
+        self.progress['state'] = 'idle'
+
+    def vacuum(self) -> int:
+        """Vacuums the free pages in throttled steps, until none are left or the maintainer is stopped, and returns their number."""
+        reclaimed = 0
+        while not self.stopped.is_set():
+            start = time.perf_counter()
+            free_pages, vacuumed = self.database.writer.ask(self.database.vacuum_step, self.pages)
+            duration = time.perf_counter() - start
+            reclaimed += vacuumed
+            self.progress['reclaimed_pages'] += vacuumed
+            self.progress['free_pages'] = free_pages - vacuumed
+            self.progress['step_pages'] = self.pages
+            self.progress['step_duration'] = duration
+            if vacuumed == 0 or free_pages == vacuumed:
+                break
+            if duration > self.write_latency_budget:
+                self.pages = max(1, self.pages // 2)
+            elif duration < self.write_latency_budget / 2:
+                self.pages *= 2
+            self.stopped.wait(duration)
+        return reclaimed
+
+
+class ReadConnectionPool:
+    """A bounded pool of read-only connections, which are opened on demand.
+
+    A caller waits, if all connections are in use. Since a connection is only used by one
+    thread at a time, it may be handed over between threads. While the pool is paused, e.g.
+    for resetting the WAL, no further connection is handed out.
+    """
+
+    def __init__(self, data_file, size=READERS) -> None:
+        self.uri = pathlib.Path(os.path.abspath(data_file)).as_uri() + "?mode=ro"
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.available = threading.BoundedSemaphore(size)
+        # held by pause(), so that new readers don't compete for the connections being returned
+        self.gate = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+
+    @contextlib.contextmanager
+    def pause(self, timeout):
+        """Holds back new readers and waits at most timeout seconds for the current ones to finish, then yields whether they did."""
+        deadline = time.monotonic() + timeout
+        acquired = 0
+        with self.gate:
+            try:
+                while acquired < self.size and self.available.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                    acquired += 1
+                yield acquired == self.size
+            finally:
+                for _ in range(acquired):
+                    self.available.release()
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self.gate:
+            self.available.acquire()
+        try:
+            try:
+                db_con = self.idle.get_nowait()
+            except queue.Empty:
+                db_con = self.connect()
+            try:
+                yield db_con
+            finally:
+                self.idle.put(db_con)
+        finally:
+            self.available.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class Importer:
+    """Writes large amounts of samples, e.g. of a former historian, in sorted batches of batch_size samples.
+
+    Each batch is written by the DatabaseWriter in a transaction of its own, in the order of the
+    primary key of the samples table, which is its only index. A sample replaces one with the same
+    channel and time stamp, so importing the same data twice doesn't change the database. The
+    rollups of the imported time ranges are rebuilt from the samples by close(), instead of being
+    updated incrementally, which would count the samples of a repeated import twice.
+    """
+
+    def __init__(self, database: "Database", batch_size=IMPORT_BATCH_SIZE) -> None:
+        self.database = database
+        self.batch_size = batch_size
+        self.batch = []
+        self.count = 0
+        # the time range (first, last) of the imported samples of each (adapter, variable)
+        self.ranges: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def add(self, channel_ref, channel_type, times, values) -> None:
+        """Queues the samples with value of a channel, which is created with channel_type, if it doesn't exist yet.
+
+        Raises a ValueError, if the samples don't fit the channel, see Storage.check_samples().
+        """
+        self.database.check_samples(channel_ref, channel_type, values)
+        if None in values:
+            times = [t for t, value in zip(times, values) if value is not None]
+            values = [value for value in values if value is not None]
+        if not times:
+            return
+        channel_id = self.database.resolve_channel(channel_ref)
+        if channel_id is None:
+            self.database.create_channel(channel_ref, channel_type)
+            channel_id = self.database.resolve_channel(channel_ref)
+        if self.database.channel_types[channel_id] == 'bool':
+            values = [int(value) for value in values]
+        elif self.database.channel_types[channel_id] == 'double':
+            values = [float(value) for value in values]
+        self.batch.extend(zip([channel_id] * len(times), times, values))
+        key = (channel_ref['adapter'], channel_ref['variable'])
+        first, last = self.ranges.get(key, (min(times), max(times)))
+        self.ranges[key] = (min(first, min(times)), max(last, max(times)))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.batch:
+            self.database.writer.ask(self.database.store_samples, self.batch)
+            self.count += len(self.batch)
+            self.batch = []
+
+    def close(self) -> int:
+        """Writes the remaining samples, rebuilds the rollups of the imported time ranges and returns the number of imported samples."""
+        self.flush()
+        for (adapter_name, variable_name), (first, last) in self.ranges.items():
+            self.database.rebuild_rollups({'adapter': adapter_name, 'variable': variable_name}, first, last + 1)
+        self.ranges = {}
+        return self.count
+
+
+class Database(Storage):
+    """The SQLite storage backend, which stores the time series of all channels in one samples table.
+
+    The channels table is a dictionary, which maps each adapter variable to the integer id
+    and the type of its channel. The samples table is clustered by channel id and time
+    (a WITHOUT ROWID table with (channel, time) as primary key), so range queries of one or
+    several channels are a single indexed scan and the schema doesn't grow with the number
+    of channels. A later sample with the same time stamp replaces the former one. Time
+    stamps are stored as INTEGER nanoseconds, as given by time.time_ns().
+
+    The samples of completed time windows of chunk_interval seconds are sealed into the
+    chunks table, where each row holds the compressed samples of one channel and window
+    (see ehs.compression). The samples table then only holds the recent samples.
+
+    Numeric channels are rolled up into time buckets of each resolution of rollups, holding
+    the count, sum, minimum, maximum, first and last value of the bucket. The rollups are
+    updated with each flush window, so a query of a coarse resolution doesn't read the samples,
+    see select_rollup() and get_rollup_list(). The rollups of a resolution are only used, once
+    they cover all samples, which the RollupBackfiller ensures for resolutions added later.
+
+    The chunks are the time partitions of the retention: samples, which are older than the
+    retention of their channel, are dropped a whole window at a time, see expire(). Their
+    pages are returned to the file system by the Maintainer, see statistics() for its progress.
+
+    Mutations are delegated to a single DatabaseWriter, while reads use the read-only
+    connections of a ReadConnectionPool, so history queries don't share cursor state with
+    the ingestion. In WAL journal mode, readers and the writer don't block each other.
+    Samples of an open flush window are not yet visible to get_time_series().
+    """
+
+    def __init__(self, root_dir, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, journal_mode=JOURNAL_MODE,
+                 synchronous=SYNCHRONOUS, checkpoint_interval=CHECKPOINT_INTERVAL, wal_size_limit=WAL_SIZE_LIMIT, readers=READERS,
+                 chunk_interval=CHUNK_INTERVAL, seal_interval=SEAL_INTERVAL, retention=RETENTION,
+                 retention_interval=RETENTION_INTERVAL, rollups=ROLLUPS, maintenance_interval=MAINTENANCE_INTERVAL,
+                 write_latency_budget=WRITE_LATENCY_BUDGET):
+        """root_dir should be ehs.logging_dir"""
+        Storage.__init__(self)
+        self.data_dir = os.path.join(root_dir, 'data')
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+        self.data_file = os.path.join(self.data_dir, 'data.db')
+        # the catalogue of all channels is loaded once and updated on creation
+        self.chunk_interval_ns = int(chunk_interval * 1_000_000_000)
+        self.seal_interval_ns = int(seal_interval * 1_000_000_000)
+        # the width of the widest chunk, see query_samples()
+        self.chunk_width_ns = self.chunk_interval_ns
+        self.retention_ns = None if retention is None else int(retention * 1_000_000_000)
+        # the retentions of single channels, which replace the default retention_ns
+        self.retentions_ns: Dict[int, int] = {}
+        self.rollups_ns = sorted(int(rollup * 1_000_000_000) for rollup in rollups)
+        # the resolutions of rollups_ns, of which the rollups cover all samples, in ascending order
+        self.complete_rollups_ns = []
+        # the chunks dropped by expire() since the index of the chunks has been rebuilt
+        self.dropped_chunks = 0
+
+        self.writer = DatabaseWriter(self.data_file, batch_size=batch_size, flush_interval=flush_interval,
+                                     journal_mode=journal_mode, synchronous=synchronous, wal_size_limit=wal_size_limit,
+                                     channel_types=self.channel_types, rollups_ns=self.rollups_ns, chunk_width_ns=self.chunk_interval_ns)
+        self.writer.start()
+        # the writer creates the database file, before the first reader may open it
+        self.writer.ask(migrate)
+        self.writer.ask(self.load_catalogue)
+        self.writer.ask(self.load_chunk_width)
+        self.writer.ask(self.load_complete_rollups)
+
+        self.readers = ReadConnectionPool(self.data_file, size=readers)
+        self.checkpointer: Checkpointer = None
+        if journal_mode == "wal":
+            self.checkpointer = Checkpointer(self.data_file, self.writer, self.readers, interval=checkpoint_interval, wal_size_limit=wal_size_limit)
+            self.checkpointer.start()
+        self.sealer = ChunkSealer(self, interval=seal_interval)
+        self.sealer.start()
+        self.expirer = Expirer(self, interval=retention_interval)
+        self.expirer.start()
+        self.maintainer = Maintainer(self, interval=maintenance_interval, write_latency_budget=write_latency_budget)
+        self.maintainer.start()
+        self.backfiller = RollupBackfiller(self, [rollup for rollup in self.rollups_ns if rollup not in self.complete_rollups_ns])
+        self.backfiller.start()
+
+    def load_catalogue(self, db_con: sqlite3.Connection) -> None:
+        """Executed by the writer once at start-up: reads all channels into the in-memory catalogue."""
+        for channel_id, adapter_name, variable_name, channel_type in db_con.execute("SELECT id, adapter, variable, type FROM channels;"):
+            self.channel_types[channel_id] = channel_type
+            self.channel_ids[(adapter_name, variable_name)] = channel_id
+
+    def load_chunk_width(self, db_con: sqlite3.Connection) -> None:
+        """Executed by the writer once at start-up: finds the widest chunk, which is wider than chunk_interval, if it has been sealed with a longer one."""
+        widest = db_con.execute("SELECT max(end - begin) FROM chunks;").fetchone()[0]
+        self.chunk_width_ns = max(self.chunk_interval_ns, widest or 0)
+        self.writer.chunk_width_ns = self.chunk_width_ns
+
+    def load_complete_rollups(self, db_con: sqlite3.Connection) -> None:
+        """Executed by the writer once at start-up: drops the rollups of the resolutions, which are no longer configured, and loads the complete ones."""
+        complete = [row[0] for row in db_con.execute("SELECT resolution FROM complete_rollups;")]
+        for rollup in set(complete) - set(self.rollups_ns):
+            db_con.execute("DELETE FROM rollups WHERE resolution=?;", (rollup,))
+            db_con.execute("DELETE FROM complete_rollups WHERE resolution=?;", (rollup,))
+        db_con.commit()
+        self.complete_rollups_ns = sorted(rollup for rollup in complete if rollup in self.rollups_ns)
+
+    def complete_rollup(self, db_con: sqlite3.Connection, rollup) -> None:
+        """Executed by the writer: records, that the rollups of a resolution cover all samples."""
+        db_con.execute("INSERT OR IGNORE INTO complete_rollups VALUES (?);", (rollup,))
+        db_con.commit()
+        self.complete_rollups_ns = sorted(self.complete_rollups_ns + [rollup])
+
+    def create_channels(self, channels):
+        """Registers all (channel_ref, channel_type) tuples, which are not yet in the catalogue with that type, in one transaction."""
+        missing = []
+        for channel_ref, channel_type in channels:
+            channel_id = self.channel_ids.get((channel_ref['adapter'], channel_ref['variable']))
+            if channel_id is None or self.channel_types[channel_id] != channel_type:
+                missing.append((channel_ref, channel_type))
+        if missing:
+            self.writer.ask(self.create_missing_channels, missing)
+
+    def create_missing_channels(self, db_con: sqlite3.Connection, channels):
+        """Executed by the writer, so that checking and creating the channels cannot interleave with other mutations."""
+        # the catalogue is only updated after the commit
+        created = {}
+        for channel_ref, channel_type in channels:
+            key = (channel_ref['adapter'], channel_ref['variable'])
+            channel_id = created.get(key, (self.channel_ids.get(key), None))[0]
+            if channel_id is None:
+                channel_id = db_con.execute("INSERT INTO channels (adapter, variable, type) VALUES (?, ?, ?);", key + (channel_type,)).lastrowid
+            else:
+                db_con.execute("UPDATE channels SET type=? WHERE id=?;", (channel_type, channel_id))
+                previous_type = created[key][1] if key in created else self.channel_types[channel_id]
+                if previous_type != channel_type:
+                    self.convert_channel(db_con, channel_id, previous_type, channel_type)
+            created[key] = (channel_id, channel_type)
+        db_con.commit()
+        for key, (channel_id, channel_type) in created.items():
+            self.channel_types[channel_id] = channel_type
+            self.channel_ids[key] = channel_id
+
+    def convert_channel(self, db_con: sqlite3.Connection, channel_id, previous_type, channel_type) -> None:
+        """Executed by the writer without committing: converts the samples of a channel, which changes its type, see convert_value().
+
+        The chunks are re-encoded with the codec of the new type, one at a time, and the rollups are
+        recomputed, so that no read decodes a chunk or a bucket of the former type. Samples, of which
+        the value doesn't convert, are dropped.
+        """
+        dropped = 0
+        begins = [row[0] for row in db_con.execute("SELECT begin FROM chunks WHERE channel=? ORDER BY begin;", (channel_id,))]
+        for begin in begins:
+            data = db_con.execute("SELECT data FROM chunks WHERE channel=? AND begin=?;", (channel_id, begin)).fetchone()[0]
+            times, values = compression.decode_chunk(previous_type, data)
+            samples = [(t, value) for t, value in zip(times, (convert_value(value, channel_type) for value in values)) if value is not None]
+            dropped += len(times) - len(samples)
+            if samples:
+                data = compression.encode_chunk(channel_type, [t for t, value in samples], [value for t, value in samples])
+                db_con.execute("UPDATE chunks SET count=?, data=? WHERE channel=? AND begin=?;", (len(samples), data, channel_id, begin))
+            else:
+                db_con.execute("DELETE FROM chunks WHERE channel=? AND begin=?;", (channel_id, begin))
+        rows = db_con.execute("SELECT time, value FROM samples WHERE channel=? AND value IS NOT NULL;", (channel_id,)).fetchall()
+        converted = [(convert_value(value, channel_type), channel_id, t) for t, value in rows]
+        db_con.executemany("UPDATE samples SET value=? WHERE channel=? AND time=?;", [row for row in converted if row[0] is not None])
+        db_con.executemany("DELETE FROM samples WHERE channel=? AND time=?;", [row[1:] for row in converted if row[0] is None])
+        dropped += sum(1 for row in converted if row[0] is None)
+        self.writer.latest_times.pop(channel_id, None)
+
+        db_con.execute("DELETE FROM rollups WHERE channel=?;", (channel_id,))
+        if channel_type in ROLLUP_TYPES:
+            for rollup in self.rollups_ns:
+                window = rollup * max(1, self.chunk_interval_ns // rollup)
+                begin = next_sample_time(db_con, channel_id, -2 ** 63, self.chunk_width_ns)
+                while begin is not None:
+                    begin -= begin % rollup
+                    rebuild_buckets(db_con, channel_id, channel_type, rollup, begin, begin + window, self.chunk_width_ns)
+                    begin = next_sample_time(db_con, channel_id, begin + window, self.chunk_width_ns)
+        if dropped:
+            logging.warning(f"Dropped {dropped} samples of channel {channel_id}, which don't convert from {previous_type} to {channel_type}.")
+
+    def set_retentions(self, retentions):
+        """Sets the retention in seconds of each (channel_ref, retention) tuple, while None keeps the samples forever."""
+        for channel_ref, retention in retentions:
+            channel_id = self.resolve_channel(channel_ref)
+            if channel_id is None:
+                logging.error(f"No channel {channel_ref} has been created in the database.")
+                continue
+            self.retentions_ns[channel_id] = None if retention is None else int(retention * 1_000_000_000)
+
+    def save(self, channel_ref, t, value):
+        """Queues a sample for the next flush window.
+
+        The writer inserts it with a parameterized statement, so values are never parsed as SQL.
+        """
+        channel_id = self.channel_ids.get((channel_ref['adapter'], channel_ref['variable']))
+        if channel_id is None:
+            logging.error(f"No channel {channel_ref} has been created in the database.")
+            return
+        if type(value) is bool:
+            value = int(value)
+
+        # whether type(value) fits the channel type is currently unchecked
+        self.writer.tell(channel_id, t, value)
+
+    def flush(self):
+        """Blocks until all samples queued so far are written to the database."""
+        self.writer.ask(lambda db_con: None)
+
+    def close(self):
+        self.backfiller.stop()
+        self.maintainer.stop()
+        self.expirer.stop()
+        self.sealer.stop()
+        if self.checkpointer is not None:
+            self.checkpointer.stop()
+        self.readers.close()
+        self.writer.stop()
+
+    def get_time_series_list(self, channel_refs, begin_inclusive, end_exclusive):
+        """Returns a list of (time, value) tuples for each channel_ref, read by a single indexed scan over all channels."""
+        time_series_list = [[] for _ in channel_refs]
+        indexes, sealed, head = self.read_samples(channel_refs, begin_inclusive, end_exclusive)
+        for channel_id, channel_indexes in indexes.items():
+            sealed_times, sealed_values = sealed.get(channel_id, ([], []))
+            head_times, head_values = head.get(channel_id, ([], []))
+            time_series = merge_time_series(list(zip(sealed_times, sealed_values)), list(zip(head_times, head_values)))
+            for i in channel_indexes:
+                time_series_list[i] = time_series
+        return time_series_list
+
+    def get_columns_list(self, channel_refs, begin_inclusive, end_exclusive):
+        """Returns a (times, values) tuple of arrays for each channel_ref, like get_time_series_list() does as tuples.
+
+        The times are an int64 array, the values an array of the channel type, see VALUE_DTYPES.
+        Samples without value are left out.
+        """
+        columns_list = [(numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=object)) for _ in channel_refs]
+        indexes, sealed, head = self.read_samples(channel_refs, begin_inclusive, end_exclusive)
+        for channel_id, channel_indexes in indexes.items():
+            channel_type = self.channel_types[channel_id]
+            columns = merge_columns(to_arrays(*sealed.get(channel_id, ([], [])), channel_type),
+                                    to_arrays(*head.get(channel_id, ([], [])), channel_type))
+            for i in channel_indexes:
+                columns_list[i] = columns
+        return columns_list
+
+    def next_time(self, channel_ref, t):
+        """Returns the time stamp of the first sample of the channel at or after t, or None.
+
+        For sealed samples, it is the begin of their chunk, if the chunk begins later than t.
+        """
+        channel_id = self.resolve_channel(channel_ref)
+        if channel_id is None:
+            return None
+        with self.readers.connection() as db_con:
+            return next_sample_time(db_con, channel_id, t, self.chunk_width_ns)
+
+    def get_latest_list(self, channel_refs):
+        """Returns the (time, value) tuple of the latest sample of each channel_ref or None, from the samples table or the last chunk."""
+        latest_list = [None for _ in channel_refs]
+        with self.readers.connection() as db_con:
+            for i, channel_ref in enumerate(channel_refs):
+                channel_id = self.resolve_channel(channel_ref)
+                if channel_id is None:
+                    continue
+                latest = db_con.execute("SELECT time, value FROM samples WHERE channel=? ORDER BY time DESC LIMIT 1;", (channel_id,)).fetchone()
+                chunk = db_con.execute("SELECT end, data FROM chunks WHERE channel=? ORDER BY begin DESC LIMIT 1;", (channel_id,)).fetchone()
+                # samples, which arrived late for a sealed window, may be older than the last chunk
+                if chunk is not None and (latest is None or latest[0] < chunk[0]):
+                    times, values = compression.decode_chunk(self.channel_types[channel_id], chunk[1])
+                    if times and (latest is None or latest[0] < times[-1]):
+                        latest = (times[-1], values[-1])
+                latest_list[i] = latest
+        return latest_list
+
+    def read_samples(self, channel_refs, begin_inclusive, end_exclusive):
+        """Reads the samples of the channels in the time range with one query of the chunks and one of the samples table.
+
+        Returns the indexes of the channel_refs per channel id, the (times, values) lists of the
+        decoded chunks per channel id and the (times, values) lists of the samples table per
+        channel id, which replace sealed samples with the same time stamp.
+        """
+        indexes = {}
+        for i, channel_ref in enumerate(channel_refs):
+            channel_id = self.resolve_channel(channel_ref)
+            if channel_id is not None:
+                indexes.setdefault(channel_id, []).append(i)
+        if not indexes:
+            return indexes, {}, {}
+
+        with self.readers.connection() as db_con:
+            sealed, head = query_samples(db_con, self.channel_types, list(indexes), begin_inclusive, end_exclusive, self.chunk_width_ns)
+        return indexes, sealed, head
+
+    def select_rollup(self, resolution):
+        """Returns the coarsest complete rollup resolution in nanoseconds, which is at most resolution, or None."""
+        complete_rollups_ns = self.complete_rollups_ns
+        index = bisect.bisect_right(complete_rollups_ns, resolution)
+        return complete_rollups_ns[index - 1] if index else None
+
+    def get_rollup_list(self, channel_refs, begin_inclusive, end_exclusive, rollup):
+        """Returns a list of (begin, count, minimum, maximum, mean, first, last) tuples of the buckets of rollup for each channel_ref.
+
+        The buckets, which overlap the time range, are returned, so the first one may begin before begin_inclusive.
+        The buckets of a rollup, which isn't complete yet, are computed from the samples.
+        """
+        rollup_list = [[] for _ in channel_refs]
+        with self.readers.connection() as db_con:
+            for i, channel_ref in enumerate(channel_refs):
+                channel_id = self.resolve_channel(channel_ref)
+                if channel_id is None:
+                    continue
+                if rollup not in self.complete_rollups_ns:
+                    times, values = read_columns(db_con, channel_id, self.channel_types[channel_id], begin_inclusive - begin_inclusive % rollup, end_exclusive,
+                                                 self.chunk_width_ns)
+                    rollup_list[i] = [(row[2], row[3], row[5], row[6], row[4] / row[3], row[8], row[10]) for row in rollup_rows(channel_id, rollup, times, values)]
+                    continue
+                sqlcmd = "SELECT begin, count, minimum, maximum, total / count, first, last FROM rollups WHERE channel=? AND resolution=? AND begin>? AND begin<? ORDER BY begin;"
+                rollup_list[i] = db_con.execute(sqlcmd, (channel_id, rollup, begin_inclusive - rollup, end_exclusive)).fetchall()
+        return rollup_list
+
+    def get_rollup_time_series_list(self, channel_refs, begin_inclusive, end_exclusive, rollup):
+        """Returns a list of (begin, mean) tuples of the buckets of rollup for each channel_ref.
+
+        The mean is rounded for int64 channels and the majority for bool channels. Channels,
+        which aren't rolled up, return their samples.
+        """
+        time_series_list = self.get_rollup_list(channel_refs, begin_inclusive, end_exclusive, rollup)
+        raw_indexes = []
+        for i, channel_ref in enumerate(channel_refs):
+            channel_type = self.channel_types.get(self.resolve_channel(channel_ref))
+            if channel_type == 'double':
+                time_series_list[i] = [(bucket[0], bucket[4]) for bucket in time_series_list[i]]
+            elif channel_type == 'int64':
+                time_series_list[i] = [(bucket[0], round(bucket[4])) for bucket in time_series_list[i]]
+            elif channel_type == 'bool':
+                time_series_list[i] = [(bucket[0], bucket[4] >= 0.5) for bucket in time_series_list[i]]
+            else:
+                raw_indexes.append(i)
+        if raw_indexes:
+            raw_list = self.get_time_series_list([channel_refs[i] for i in raw_indexes], begin_inclusive, end_exclusive)
+            for i, time_series in zip(raw_indexes, raw_list):
+                time_series_list[i] = time_series
+        return time_series_list
+
+    def importer(self, batch_size=IMPORT_BATCH_SIZE) -> Importer:
+        return Importer(self, batch_size=batch_size)
+
+    def store_samples(self, db_con: sqlite3.Connection, samples) -> None:
+        """Executed by the writer: writes the (channel id, time, value) tuples of an import in a single transaction, in the order of the primary key."""
+        samples.sort(key=lambda sample: sample[:2])
+        db_con.executemany("INSERT OR REPLACE INTO samples VALUES (?, ?, ?);", samples)
+        db_con.commit()
+        # the rollups of imports are rebuilt by Importer.close(), but later flush windows must know about the imported time stamps
+        for channel_id in {sample[0] for sample in samples}:
+            self.writer.latest_times.pop(channel_id, None)
+
+    def rebuild_rollups(self, channel_ref, begin_inclusive, end_exclusive) -> None:
+        """Recomputes the rollup buckets of a channel, which overlap the time range, from its samples.
+
+        The samples are read one window of about chunk_interval at a time, each rebuilt in a transaction
+        of its own, so the memory doesn't grow with the time range. Windows without samples are skipped.
+        """
+        channel_id = self.resolve_channel(channel_ref)
+        if not self.rollups_ns or channel_id is None or self.channel_types[channel_id] not in ROLLUP_TYPES:
+            return
+        for rollup in self.rollups_ns:
+            self.rebuild_rollup(channel_id, rollup, begin_inclusive, end_exclusive)
+
+    def rebuild_rollup(self, channel_id, rollup, begin_inclusive, end_exclusive, stopped: threading.Event = None) -> bool:
+        """Recomputes the buckets of one rollup of a channel, which overlap the time range, and returns False, if stopped before the end."""
+        window = rollup * max(1, self.chunk_interval_ns // rollup)
+        begin = begin_inclusive - begin_inclusive % rollup
+        end = end_exclusive + -end_exclusive % rollup
+        while begin < end:
+            if stopped is not None and stopped.is_set():
+                return False
+            begin = self.writer.ask(self.replace_rollups, channel_id, rollup, begin, min(begin + window, end), end)
+        return True
+
+    def backfill_rollup(self, channel_id, rollup, stopped: threading.Event = None) -> bool:
+        """Recomputes the buckets of one rollup of a channel over all of its samples and returns False, if stopped before the end."""
+        with self.readers.connection() as db_con:
+            first = next_sample_time(db_con, channel_id, -2 ** 63, self.chunk_width_ns)
+            last_time = db_con.execute("SELECT max(time) FROM samples WHERE channel=?;", (channel_id,)).fetchone()[0]
+            chunk = db_con.execute("SELECT end FROM chunks WHERE channel=? ORDER BY begin DESC LIMIT 1;", (channel_id,)).fetchone()
+        if first is None:
+            return True
+        last = max(-2 ** 63 if last_time is None else last_time, -2 ** 63 if chunk is None else chunk[0] - 1)
+        return self.rebuild_rollup(channel_id, rollup, first, last + 1, stopped)
+
+    def replace_rollups(self, db_con: sqlite3.Connection, channel_id, rollup, begin_inclusive, window_end, end_exclusive) -> int:
+        """Executed by the writer: recomputes the buckets of rollup of a channel in the aligned window and returns the begin of the next one with samples.
+
+        The buckets between the window and the next one, which have no samples, are deleted.
+        """
+        rebuild_buckets(db_con, channel_id, self.channel_types[channel_id], rollup, begin_inclusive, window_end, self.chunk_width_ns)
+        following = next_sample_time(db_con, channel_id, window_end, self.chunk_width_ns)
+        next_begin = end_exclusive if following is None else min(following - following % rollup, end_exclusive)
+        db_con.execute("DELETE FROM rollups WHERE channel=? AND resolution=? AND begin>=? AND begin<?;", (channel_id, rollup, window_end, next_begin))
+        db_con.commit()
+        return next_begin
+
+    def select_aligned_rollup(self, begin_inclusive, end_exclusive, bucket_width):
+        """Returns the coarsest complete rollup resolution, of which buckets exactly cover the time range and each bucket of bucket_width, or None."""
+        for rollup in reversed(self.complete_rollups_ns):
+            if begin_inclusive % rollup == 0 and end_exclusive % rollup == 0 and bucket_width % rollup == 0:
+                return rollup
+        return None
+
+    def get_aggregated_list(self, channel_refs, begin_inclusive, end_exclusive, bucket_width, aggregates):
+        """Returns a list of (bucket begin, aggregate values) tuples of the non-empty buckets for each channel_ref of a numeric channel.
+
+        The buckets of bucket_width nanoseconds start at begin_inclusive, the aggregate values are in the
+        order of aggregates, see AGGREGATES. If the buckets are aligned to a rollup, they are combined from
+        its buckets instead of the samples, unless the sum of squares for stddev is missing. Channels, which
+        aren't numeric, have no buckets.
+        """
+        if bucket_width <= 0:
+            raise ValueError(f"The bucket width must be positive, not {bucket_width}.")
+        for aggregate in aggregates:
+            if aggregate not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate '{aggregate}'.")
+        aggregated_list = [None if self.channel_types.get(self.resolve_channel(channel_ref)) in ROLLUP_TYPES else [] for channel_ref in channel_refs]
+        rollup = self.select_aligned_rollup(begin_inclusive, end_exclusive, bucket_width)
+        if rollup is not None:
+            with self.readers.connection() as db_con:
+                for i, channel_ref in enumerate(channel_refs):
+                    if aggregated_list[i] is not None:
+                        continue
+                    channel_id = self.resolve_channel(channel_ref)
+                    sqlcmd = "SELECT begin, count, total, minimum, maximum, first, last, squares FROM rollups WHERE channel=? AND resolution=? AND begin>=? AND begin<? ORDER BY begin;"
+                    rows = db_con.execute(sqlcmd, (channel_id, rollup, begin_inclusive, end_exclusive)).fetchall()
+                    if 'stddev' in aggregates and any(row[7] is None for row in rows):
+                        continue
+                    aggregated_list[i] = [(begin, aggregate_rollups(group, aggregates)) for begin, group in group_buckets(rows, begin_inclusive, bucket_width)]
+
+        raw_indexes = [i for i, aggregated in enumerate(aggregated_list) if aggregated is None]
+        if raw_indexes:
+            columns_list = self.get_columns_list([channel_refs[i] for i in raw_indexes], begin_inclusive, end_exclusive)
+            for i, (times, values) in zip(raw_indexes, columns_list):
+                aggregated_list[i] = aggregate_columns(times, values, begin_inclusive, bucket_width, aggregates)
+        return aggregated_list
+
+    def seal(self, horizon=None) -> int:
+        """Compresses the windows of chunk_interval, which end before horizon, into chunks.
+
+        The horizon defaults to one seal_interval ago. Samples, which arrive for a window after it
+        has been sealed, stay in the samples table until the next run merges them into the chunk.
+        Samples without value cannot be encoded and stay in the samples table as well, so reads
+        return them like before sealing. Returns the number of sealed chunks.
+        """
+        if horizon is None:
+            horizon = time.time_ns() - self.seal_interval_ns
+        with self.readers.connection() as db_con:
+            channels = db_con.execute("SELECT id, type FROM channels;").fetchall()
+
+        sealed = 0
+        for channel_id, channel_type in channels:
+            if channel_type not in compression.COMPRESSIBLE_TYPES:
+                continue
+            after = None
+            while True:
+                with self.readers.connection() as db_con:
+                    if after is None:
+                        first = db_con.execute("SELECT min(time) FROM samples WHERE channel=? AND value IS NOT NULL;", (channel_id,)).fetchone()[0]
+                    else:
+                        first = db_con.execute("SELECT min(time) FROM samples WHERE channel=? AND time>=? AND value IS NOT NULL;", (channel_id, after)).fetchone()[0]
+                    if first is None:
+                        break
+                    begin = first - first % self.chunk_interval_ns
+                    end = begin + self.chunk_interval_ns
+                    if end > horizon:
+                        break
+                    rows = db_con.execute(SEALED_ROWS, (channel_id, begin, end)).fetchall()
+                    chunk = db_con.execute("SELECT data FROM chunks WHERE channel=? AND begin=?;", (channel_id, begin)).fetchone()
+
+                samples = rows
+                if chunk is not None:
+                    samples = merge_time_series(list(zip(*compression.decode_chunk(channel_type, chunk[0]))), samples)
+                times = [t for t, value in samples]
+                values = [value for t, value in samples]
+                data = compression.encode_chunk(channel_type, times, values)
+                if self.writer.ask(self.store_chunk, channel_id, begin, end, rows, len(samples), data):
+                    sealed += 1
+                after = end
+        return sealed
+
+    def store_chunk(self, db_con: sqlite3.Connection, channel_id, begin, end, rows, chunk_count, data) -> bool:
+        """Executed by the writer: replaces the samples with value of a window, which are the encoded rows, by its chunk.
+
+        If any of the samples of the window changed, since they have been read for encoding, e.g. by a sample,
+        which replaced one with the same time stamp, nothing is stored. SQLite stores NaN as NULL, so the rows compare exactly.
+        """
+        if db_con.execute(SEALED_ROWS, (channel_id, begin, end)).fetchall() != rows:
+            return False
+        db_con.execute("INSERT OR REPLACE INTO chunks (channel, begin, end, count, data) VALUES (?, ?, ?, ?, ?);", (channel_id, begin, end, chunk_count, data))
+        db_con.execute("DELETE FROM samples WHERE channel=? AND time>=? AND time<? AND value IS NOT NULL;", (channel_id, begin, end))
+        db_con.commit()
+        return True
+
+
+    def expire(self, now=None) -> int:
+        """Drops the samples, which are older than the retention of their channel, and returns the number of dropped chunks.
+
+        Only whole windows of chunk_interval are dropped, so samples are kept up to one chunk_interval
+        longer than their retention. Each channel is expired in a transaction of its own, so that the
+        flush windows of the DatabaseWriter are delayed by the deletion of one channel at most.
+        """
+        if now is None:
+            now = time.time_ns()
+        dropped = 0
+        for channel_id in list(self.channel_types):
+            retention = self.retentions_ns.get(channel_id, self.retention_ns)
+            if retention is None:
+                continue
+            horizon = now - retention
+            horizon -= horizon % self.chunk_interval_ns
+            dropped += self.writer.ask(self.drop_windows, channel_id, horizon)
+        return dropped
+
+    def drop_windows(self, db_con: sqlite3.Connection, channel_id, horizon) -> int:
+        """Executed by the writer: deletes the chunks and samples of a channel, which end before horizon.
+
+        A chunk is deleted with its row, so no sample has to be visited. The freed pages are reused by later chunks.
+        """
+        dropped = db_con.execute("DELETE FROM chunks WHERE channel=? AND end<=?;", (channel_id, horizon)).rowcount
+        db_con.execute("DELETE FROM samples WHERE channel=? AND time<?;", (channel_id, horizon))
+        db_con.execute("DELETE FROM rollups WHERE channel=? AND begin+resolution<=?;", (channel_id, horizon))
+        db_con.commit()
+        self.dropped_chunks += dropped
+        return dropped
+
+    def reindex_due(self) -> bool:
+        """Whether more than REINDEX_THRESHOLD of the chunks have been dropped since the last rebuild of their index."""
+        if self.dropped_chunks == 0:
+            return False
+        with self.readers.connection() as db_con:
+            chunks = db_con.execute("SELECT count(*) FROM chunks;").fetchone()[0]
+        return self.dropped_chunks > REINDEX_THRESHOLD * (chunks + self.dropped_chunks)
+
+    def reindex_chunks(self, db_con: sqlite3.Connection) -> None:
+        """Executed by the writer: rebuilds the primary key index of the chunks, which is sparse after many windows have been dropped."""
+        db_con.execute("REINDEX chunks;")
+        db_con.commit()
+        self.dropped_chunks = 0
+
+    def vacuum_step(self, db_con: sqlite3.Connection, pages) -> Tuple[int, int]:
+        """Executed by the writer: returns up to pages free pages to the file system and returns the free pages before and the vacuumed ones.
+
+        Nothing is vacuumed, if the database hasn't been created with incremental auto-vacuum.
+        """
+        if db_con.execute("PRAGMA auto_vacuum;").fetchone()[0] != 2:
+            return 0, 0
+        free_pages = db_con.execute("PRAGMA freelist_count;").fetchone()[0]
+        if free_pages:
+            # executescript, since execute() only vacuums a single page
+            db_con.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+        return free_pages, free_pages - db_con.execute("PRAGMA freelist_count;").fetchone()[0]
+
+    def statistics(self) -> dict:
+        """Returns the size of the database file, the write durations of the last flush windows and the progress of the maintenance."""
+        with self.readers.connection() as db_con:
+            page_size = db_con.execute("PRAGMA page_size;").fetchone()[0]
+            page_count = db_con.execute("PRAGMA page_count;").fetchone()[0]
+            free_pages = db_con.execute("PRAGMA freelist_count;").fetchone()[0]
+            auto_vacuum = db_con.execute("PRAGMA auto_vacuum;").fetchone()[0]
+            chunks = db_con.execute("SELECT count(*) FROM chunks;").fetchone()[0]
+        durations = sorted(self.writer.write_durations)
+        return {
+            'backend': 'sqlite',
+            'channels': len(self.channel_types),
+            'chunks': chunks,
+            'page_size': page_size,
+            'page_count': page_count,
+            'free_pages': free_pages,
+            'incremental_vacuum': auto_vacuum == 2,
+            'complete_rollups': [rollup / 1_000_000_000 for rollup in self.complete_rollups_ns],
+            'write_durations': {
+                'windows': len(durations),
+                'median': durations[len(durations) // 2] if durations else None,
+                'max': durations[-1] if durations else None,
+            },
+            'maintenance': dict(self.maintainer.progress),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converts a data.db file of an older EHS version to the current schema.")
+    parser.add_argument("data_file", type=str, help="Location of the data.db file, e.g. data/data.db next to the EHS configuration.")
+    parser.add_argument("--compact", action="store_true", help="Rewrites the file without free pages and with incremental auto-vacuum, while the EHS is stopped.")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.data_file):
+        logging.error(f"The database file '{args.data_file}' doesn't exist.")
+        return 1
+    db_con = sqlite3.connect(args.data_file)
+    try:
+        version = db_con.execute("PRAGMA user_version;").fetchone()[0]
+        migrate(db_con)
+        logging.info(f"Converted '{args.data_file}' from schema version {version} to {SCHEMA_VERSION}.")
+        if args.compact:
+            size = os.path.getsize(args.data_file)
+            db_con.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+            db_con.execute("VACUUM;")
+            db_con.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            logging.info(f"Compacted '{args.data_file}' from {size:,} to {os.path.getsize(args.data_file):,} bytes.")
+    finally:
+        db_con.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
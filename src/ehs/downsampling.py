@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""Shape preserving reduction of time series for plotting, which selects a subset of the samples.
+
+LTTB (Largest-Triangle-Three-Buckets) is described in
+
+    Steinarsson, S.: Downsampling Time Series for Visual Representation. University of Iceland, 2013.
+
+and M4, which keeps the first, last, minimum and maximum sample of each pixel column, in
+
+    Jugel, U. et al.: M4: A Visualization-Oriented Time Series Data Aggregation. VLDB 2014.
+
+Both return the indexes of the selected samples in ascending order, so the samples themselves
+are passed through unchanged.
+"""
+
+import numpy
+from typing import Tuple
+
+
+REDUCTIONS = ('lttb', 'm4')
+
+
+def lttb_indexes(times: numpy.ndarray, values: numpy.ndarray, max_points: int) -> numpy.ndarray:
+    """Selects max_points samples: the first, the last and the one of each bucket, which spans the largest
+    triangle with the sample selected in the previous bucket and the mean of the next bucket.
+    """
+    n = len(times)
+    if max_points >= n or n <= 2:
+        return numpy.arange(n)
+    if max_points < 3:
+        return numpy.array([0, n - 1][:max_points])
+    # relative times as double, so that the areas of nanosecond time stamps don't overflow
+    x = (times - times[0]).astype(numpy.float64)
+    y = values.astype(numpy.float64)
+    # the bucket boundaries of the n - 2 inner samples
+    bounds = numpy.floor(numpy.linspace(1, n - 1, max_points - 1)).astype(numpy.int64)
+    # the mean of each bucket, as well as the last sample as last bucket
+    sums_x = numpy.add.reduceat(x[:-1], bounds[:-1])
+    sums_y = numpy.add.reduceat(y[:-1], bounds[:-1])
+    sizes = numpy.diff(bounds)
+    mean_x = numpy.append(sums_x / sizes, x[-1])
+    mean_y = numpy.append(sums_y / sizes, y[-1])
+
+    indexes = numpy.empty(max_points, dtype=numpy.int64)
+    indexes[0] = 0
+    indexes[-1] = n - 1
+    selected = 0
+    for i in range(max_points - 2):
+        begin, end = bounds[i], bounds[i + 1]
+        # twice the triangle areas of all candidates of the bucket at once
+        areas = numpy.abs((x[selected] - mean_x[i + 1]) * (y[begin:end] - y[selected])
+                          - (x[selected] - x[begin:end]) * (mean_y[i + 1] - y[selected]))
+        selected = begin + int(numpy.argmax(areas))
+        indexes[i + 1] = selected
+    return indexes
+
+
+def m4_indexes(times: numpy.ndarray, values: numpy.ndarray, max_points: int) -> numpy.ndarray:
+    """Selects the first, last, minimum and maximum sample of each of max_points // 4 columns of equal time span."""
+    n = len(times)
+    columns = max_points // 4
+    if max_points >= n:
+        return numpy.arange(n)
+    if columns < 1:
+        return numpy.array([0, n - 1][:max_points])
+    span = int(times[-1] - times[0]) + 1
+    column = ((times - times[0]).astype(numpy.float64) * (columns / span)).astype(numpy.int64)
+    y = values.astype(numpy.float64)
+    starts = numpy.flatnonzero(numpy.diff(column, prepend=-1))
+    ends = numpy.append(starts[1:], n) - 1
+    # sorted by column and value, the first sample of each column is its minimum, the last one its maximum
+    order = numpy.lexsort((y, column))
+    minima = order[starts]
+    maxima = order[ends]
+    return numpy.unique(numpy.concatenate((starts, ends, minima, maxima)))
+
+
+def reduce_columns(times: numpy.ndarray, values: numpy.ndarray, max_points: int, reduction='lttb') -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Returns at most max_points of the samples of a numeric time series given as arrays."""
+    if len(times) <= max_points:
+        return times, values
+    if reduction == 'lttb':
+        indexes = lttb_indexes(times, values, max_points)
+    elif reduction == 'm4':
+        indexes = m4_indexes(times, values, max_points)
+    else:
+        raise ValueError(f"Unknown reduction '{reduction}'.")
+    return times[indexes], values[indexes]
@@ -7,15 +7,22 @@ import ehs
 from ehs import RETRY_TIME
 from ehs.api import ExtendedHistorianService_pb2, ExtendedHistorianService_pb2_grpc, DataSourceAdapter_pb2, DataSourceAdapter_pb2_grpc, Commons_pb2
 from ehs import GRPCServer
+from ehs.database import DATABASE_CONF, get_database, to_columns
+from ehs.downsampling import reduce_columns
+from ehs.storage import Storage
+import collections
+import concurrent.futures
 import grpc
+import itertools
 import logging
+import numpy
+import operator
 import os
 import os.path
-import sqlite3
+import threading
 import time
 from typing import Dict, List, Tuple
 import yaml
-import apscheduler.events
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -40,6 +47,19 @@ properties:
                             type: string
                         port:
                             type: string
+                        variables:
+                            type: array
+                            items:
+                                type: object
+                                properties:
+                                    retention:
+                                        type: number
+                                        exclusiveMinimum: 0
+                        concurrency:
+                            type: integer
+                            minimum: 1
+                        stream:
+                            type: boolean
                     required:
                     - name
                     - address
@@ -50,6 +70,27 @@ required:
 - adapters
 """
 
+JOB_CONF = """
+type: object
+properties:
+    jobs:
+        type: object
+        additionalProperties:
+            type: object
+            properties:
+                retention:
+                    type: number
+                    exclusiveMinimum: 0
+                deadline:
+                    type: number
+                    exclusiveMinimum: 0
+"""
+
+ADAPTER_CONCURRENCY = 4  # concurrent reads per adapter
+TICK_DURATIONS = 1000  # ticks per job, of which the durations are kept for the statistics
+STREAM_WINDOW = 16  # read requests per adapter, which are sent but not yet answered or queued for sending
+RECONNECT_INTERVAL = 1.0  # seconds between the attempts to reopen a broken stream
+
 
 def read_file(script_dir, rel_file_path):
     file_path = os.path.join(script_dir, rel_file_path)
@@ -103,6 +144,196 @@ class ChannelAddress:
     def __str__(self):
         return f"{self.adapter_name}.{self.channel_name}: {self.channel_type}"
 
+class Channel:
+    """A configured channel, which is compiled once at start-up, so sampling it doesn't search the configuration.
+
+    It holds the channel_ref for the storage, the adapter proxy, the prepared ReadRequest and
+    extract(), which returns the value of the channel type from a ReadResponse.
+    """
+
+    def __init__(self, adapter_name, variable_name, channel_type, proxy) -> None:
+        self.channel_ref = {'adapter': adapter_name, 'variable': variable_name}
+        self.channel_type = channel_type
+        self.proxy = proxy
+        self.read_request = DataSourceAdapter_pb2.ReadRequest(address=variable_name)
+        self.extract = None
+        if channel_type in ('bool', 'int64', 'double', 'string'):
+            self.extract = operator.attrgetter(f"value.{channel_type}_value")
+
+
+class ChannelGroup:
+    """The channels of a job on one adapter, which are read by a single read_many request per tick."""
+
+    def __init__(self, adapter_name, channels) -> None:
+        self.adapter_name = adapter_name
+        self.channels = tuple(channels)
+        self.proxy = self.channels[0].proxy
+        self.read_many_request = DataSourceAdapter_pb2.ReadManyRequest(addresses=[channel.read_request.address for channel in self.channels])
+
+
+class ReadStream:
+    """A long-lived stream_read to an adapter, over which the read_many requests of all jobs are pipelined.
+
+    Requests are queued and sent by the request iterator of the stream as soon as it is open, each with
+    an id, by which its response is matched, since the adapter answers several requests concurrently
+    and in the order of completion. At most window requests are queued or in flight,
+    further callers wait for a free slot, which is the flow control towards the scheduler. If the stream
+    breaks, e.g. because the adapter restarted, the requests in flight fail and the stream is reopened
+    every RECONNECT_INTERVAL seconds, while the queued requests wait for the new stream. An adapter
+    without stream_read is read by unary read_many requests instead.
+    """
+
+    def __init__(self, adapter_name, proxy: DataSourceAdapter_pb2_grpc.DataSourceAdapterStub, window=STREAM_WINDOW) -> None:
+        self.adapter_name = adapter_name
+        self.proxy = proxy
+        self.slots = threading.BoundedSemaphore(window)
+        self.condition = threading.Condition()
+        # the (request, future) tuples, which are not yet sent, and the ones by id, which are sent but not yet answered
+        self.queued = collections.deque()
+        self.in_flight: Dict[int, Tuple[DataSourceAdapter_pb2.ReadManyRequest, concurrent.futures.Future]] = {}
+        self.ids = itertools.count(1)
+        # identifies the open stream, so the request iterator of a broken one ends
+        self.generation = 0
+        self.supported = True
+        self.connected = False
+        self.reconnects = 0
+        self.call = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"stream-{adapter_name}", daemon=True)
+        self.thread.start()
+
+    def read_many(self, request, timeout) -> DataSourceAdapter_pb2.ReadManyResponse:
+        """Sends the request over the stream and returns its response within timeout seconds, or raises a TimeoutError."""
+        if not self.supported:
+            return self.proxy.read_many(request, timeout=timeout)
+        deadline = time.monotonic() + timeout
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No slot of the stream to '{self.adapter_name}' became free in time.")
+        future = concurrent.futures.Future()
+        future.add_done_callback(lambda f: self.slots.release())
+        with self.condition:
+            self.queued.append((request, future))
+            self.condition.notify_all()
+        try:
+            return future.result(timeout=remaining_time(deadline))
+        except (concurrent.futures.TimeoutError, TimeoutError):
+            # a request, which isn't sent yet, is dropped instead of occupying the stream after its deadline
+            future.cancel()
+            raise TimeoutError(f"The stream to '{self.adapter_name}' didn't answer in time.")
+
+    def requests(self, generation):
+        """The request iterator of a stream, which ends with the stream or the ReadStream."""
+        while True:
+            with self.condition:
+                while not self.queued and self.generation == generation and not self.stopped.is_set():
+                    self.condition.wait()
+                if self.generation != generation or self.stopped.is_set():
+                    return
+                request, future = self.queued.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                # the request of a group is shared by the ticks of its job, so the id is set on a copy
+                message = DataSourceAdapter_pb2.ReadManyRequest()
+                message.CopyFrom(request)
+                message.id = next(self.ids)
+                self.in_flight[message.id] = (request, future)
+            yield message
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            generation = self.generation
+            try:
+                self.call = self.proxy.stream_read(self.requests(generation))
+                # the adapter sends its initial metadata, once it has accepted the stream
+                self.call.initial_metadata()
+                self.connected = self.call.is_active()
+                for response in self.call:
+                    with self.condition:
+                        request, future = self.in_flight.pop(response.id, (None, None))
+                    if future is None:
+                        logging.warning(f"The adapter '{self.adapter_name}' answered the unknown read request {response.id}.")
+                        continue
+                    future.set_result(response)
+                error = ConnectionError(f"The adapter '{self.adapter_name}' closed the stream.")
+            except grpc.RpcError as e:
+                error = e
+                if e.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    logging.warning(f"The adapter '{self.adapter_name}' doesn't implement stream_read, so it is read by unary read_many requests.")
+                    self.supported = False
+            self.connected = False
+            with self.condition:
+                self.generation += 1
+                self.condition.notify_all()
+                failed = list(self.in_flight.values())
+                self.in_flight.clear()
+                if not self.supported or self.stopped.is_set():
+                    failed.extend(self.queued)
+                    self.queued.clear()
+            for request, future in failed:
+                if not future.running() and not future.set_running_or_notify_cancel():
+                    continue
+                if not self.supported:
+                    self.answer_unary(request, future)
+                else:
+                    future.set_exception(error)
+            if not self.supported:
+                return
+            if not self.stopped.wait(RECONNECT_INTERVAL):
+                self.reconnects += 1
+
+    def answer_unary(self, request, future) -> None:
+        """Answers a request, which was meant for the stream, by a unary read_many request."""
+        try:
+            future.set_result(self.proxy.read_many(request, timeout=RECONNECT_INTERVAL))
+        except Exception as e:
+            future.set_exception(e)
+
+    def statistics(self) -> dict:
+        return {'supported': self.supported, 'connected': self.connected, 'reconnects': self.reconnects,
+                'queued': len(self.queued), 'in_flight': len(self.in_flight)}
+
+    def close(self) -> None:
+        self.stopped.set()
+        with self.condition:
+            self.condition.notify_all()
+        if self.call is not None:
+            self.call.cancel()
+        self.thread.join(timeout=RECONNECT_INTERVAL)
+
+
+# the little-endian dtypes of the bytes fields of TimeSeriesColumns
+COLUMN_DTYPES = {'bool': numpy.dtype(numpy.bool_), 'int64': numpy.dtype('<i8'), 'double': numpy.dtype('<f8')}
+
+
+def pack_columns(columns: ExtendedHistorianService_pb2.TimeSeriesColumns, channel_type, times, values) -> None:
+    """Fills the columns message with the times and values, numeric ones as raw bytes without a Python object per sample."""
+    columns.time = numpy.asarray(times, dtype=COLUMN_DTYPES['int64']).tobytes()
+    if channel_type in COLUMN_DTYPES:
+        setattr(columns, f"{channel_type}_value", numpy.asarray(values, dtype=COLUMN_DTYPES[channel_type]).tobytes())
+    elif channel_type == 'string':
+        columns.string_value.extend(values.tolist() if isinstance(values, numpy.ndarray) else values)
+    else:
+        raise ValueError(f"Bad channel data type: {channel_type}")
+
+
+def unpack_columns(columns: ExtendedHistorianService_pb2.TimeSeriesColumns, channel_type):
+    """Returns the (times, values) arrays of a columns message, of which the numeric ones are read-only views of its bytes."""
+    times = numpy.frombuffer(columns.time, dtype=COLUMN_DTYPES['int64'])
+    if channel_type in COLUMN_DTYPES:
+        return times, numpy.frombuffer(getattr(columns, f"{channel_type}_value"), dtype=COLUMN_DTYPES[channel_type])
+    elif channel_type == 'string':
+        return times, numpy.array(columns.string_value, dtype=object)
+    raise ValueError(f"Bad channel data type: {channel_type}")
+
+
+def remaining_time(deadline) -> float:
+    """Returns the seconds until the deadline of time.monotonic() or raises a TimeoutError, if it has passed."""
+    timeout = deadline - time.monotonic()
+    if timeout <= 0:
+        raise TimeoutError("The deadline passed before the read started.")
+    return timeout
+
+
 class EHSClient():
     """This class is to be used by data analytics applications to easily access the EHS.
     """
@@ -137,9 +368,10 @@ class EHSClient():
             retval.append(channel_address)
         return retval
 
-    def get_values(self, channel_addresses: List[ChannelAddress]) -> List[Tuple[bool | int | float | str, int]]:
-        logging.debug(f"get_values(channel_addresses={channel_addresses})")
-        request = ExtendedHistorianService_pb2.GetValuesRequest()
+    def get_values(self, channel_addresses: List[ChannelAddress], max_age: int = 0) -> List[Tuple[bool | int | float | str, int]]:
+        """With max_age in nanoseconds, the EHS returns the latest sampled values, which are at most that old, without reading the devices."""
+        logging.debug(f"get_values(channel_addresses={channel_addresses}, max_age={max_age})")
+        request = ExtendedHistorianService_pb2.GetValuesRequest(max_age=max_age)
         for a in channel_addresses:
             ca = request.channel_addresses.add()
             ca.adapter_name = a.adapter_name
@@ -162,10 +394,15 @@ class EHSClient():
             counter += 1
         return retval
 
-    def get_histories(self, channel_addresses: List[ChannelAddress], begin_inclusive: int, end_exclusive: int) -> list[list[list[int, bool | int | float | str]]]:
-        """Return value ist a list of time series, while each time series is a list of tuples, with a time stamp and a value."""
-        logging.debug(f"get_histories(channel_addresses={channel_addresses}, begin_inclusive={begin_inclusive}, end_exclusive={end_exclusive})")
-        request = ExtendedHistorianService_pb2.GetHistoriesRequest(begin_inclusive=begin_inclusive, end_exclusive=end_exclusive)
+    def get_histories(self, channel_addresses: List[ChannelAddress], begin_inclusive: int, end_exclusive: int, resolution: int = 0, max_points: int = 0, reduction: str = "lttb") -> list[list[list[int, bool | int | float | str]]]:
+        """Return value ist a list of time series, while each time series is a list of tuples, with a time stamp and a value.
+
+        With a resolution in nanoseconds, numeric channels return the mean of each time bucket of the coarsest rollup within that resolution.
+        With max_points, the EHS reduces numeric time series by the reduction 'lttb' or 'm4' to at most max_points samples for plotting.
+        """
+        logging.debug(f"get_histories(channel_addresses={channel_addresses}, begin_inclusive={begin_inclusive}, end_exclusive={end_exclusive}, resolution={resolution}, max_points={max_points})")
+        request = ExtendedHistorianService_pb2.GetHistoriesRequest(begin_inclusive=begin_inclusive, end_exclusive=end_exclusive, resolution=resolution,
+                                                                   max_points=max_points, reduction=reduction)
         for a in channel_addresses:
             ca = request.channel_addresses.add()
             ca.adapter_name = a.adapter_name
@@ -206,6 +443,97 @@ class EHSClient():
             counter += 1
         return retval
 
+    def get_history_columns(self, channel_addresses: List[ChannelAddress], begin_inclusive: int, end_exclusive: int, resolution: int = 0, max_points: int = 0, reduction: str = "lttb") -> List[Tuple[numpy.ndarray, numpy.ndarray]]:
+        """Like get_histories(), but returns each time series as tuple of an int64 array of the time stamps and an array of the values.
+
+        The time series are transferred as raw little-endian columns, which is much faster for long time series.
+        The numeric arrays are read-only views of the received bytes.
+        """
+        logging.debug(f"get_history_columns(channel_addresses={channel_addresses}, begin_inclusive={begin_inclusive}, end_exclusive={end_exclusive}, resolution={resolution}, max_points={max_points})")
+        request = ExtendedHistorianService_pb2.GetHistoriesRequest(begin_inclusive=begin_inclusive, end_exclusive=end_exclusive, resolution=resolution,
+                                                                   max_points=max_points, reduction=reduction, columnar=True)
+        for a in channel_addresses:
+            ca = request.channel_addresses.add()
+            ca.adapter_name = a.adapter_name
+            ca.channel_name = a.channel_name
+            ca.channel_type = a.channel_type
+        cl = self.ehs_proxy.get_histories(request).columns  # cl ... columns list
+        retval = []
+        for a, columns in zip(channel_addresses, cl):
+            try:
+                retval.append(unpack_columns(columns, a.channel_type))
+            except ValueError as e:
+                logging.error(e)
+                retval.append((numpy.frombuffer(columns.time, dtype=COLUMN_DTYPES['int64']), numpy.empty(0)))
+        return retval
+
+    def get_aggregated_histories(self, channel_addresses: List[ChannelAddress], begin_inclusive: int, end_exclusive: int, bucket_width: int, aggregates: List[str]) -> list[list[list[int, list[float]]]]:
+        """Return value is a list of bucket lists of numeric channels, while each bucket is a list of its begin and a list of the values of the aggregates.
+
+        The aggregates are computed by the EHS, for time buckets of bucket_width nanoseconds, see ehs.database.AGGREGATES.
+        """
+        logging.debug(f"get_aggregated_histories(channel_addresses={channel_addresses}, begin_inclusive={begin_inclusive}, end_exclusive={end_exclusive}, bucket_width={bucket_width}, aggregates={aggregates})")
+        request = ExtendedHistorianService_pb2.GetAggregatedHistoriesRequest(begin_inclusive=begin_inclusive, end_exclusive=end_exclusive, bucket_width=bucket_width, aggregates=aggregates)
+        for a in channel_addresses:
+            ca = request.channel_addresses.add()
+            ca.adapter_name = a.adapter_name
+            ca.channel_name = a.channel_name
+            ca.channel_type = a.channel_type
+        bl = self.ehs_proxy.get_aggregated_histories(request).value  # bl ... bucket lists
+        retval = []
+        for buckets in bl:
+            retval.append([[b.begin, list(b.value)] for b in buckets.value])
+        return retval
+
+    def import_samples(self, blocks) -> int:
+        """Streams the (ChannelAddress, times, values) blocks into the storage of the EHS and returns the number of imported samples.
+
+        A value replaces the one of the same channel and time stamp, so an import can be repeated. Samples without value
+        are skipped, and blocks of a channel, which exists with another type, are rejected. See also ehs.importer.
+        """
+        logging.debug(f"import_samples(..)")
+
+        def requests():
+            for a, times, values in blocks:
+                if None in values:
+                    # samples without value cannot be transferred, and the storage skips them anyway
+                    times = [t for t, v in zip(times, values) if v is not None]
+                    values = [v for v in values if v is not None]
+                request = ExtendedHistorianService_pb2.ImportSamplesRequest()
+                request.channel_address.adapter_name = a.adapter_name
+                request.channel_address.channel_name = a.channel_name
+                request.channel_address.channel_type = a.channel_type
+                pack_columns(request.columns, a.channel_type, times, values)
+                yield request
+
+        response = self.ehs_proxy.import_samples(requests())
+        if response.status != Commons_pb2.SUCCESS:
+            logging.error(f"Importing the samples failed with status {response.status}.")
+        return response.count
+
+    def export_histories(self, channel_addresses: List[ChannelAddress], begin_inclusive: int, end_exclusive: int, file_name: str, file_format: str = "parquet") -> int:
+        """Writes the time series into a Parquet or Arrow IPC file, as it is streamed by the EHS, and returns its size. See also ehs.exporter."""
+        logging.debug(f"export_histories(channel_addresses={channel_addresses}, begin_inclusive={begin_inclusive}, end_exclusive={end_exclusive}, file_name={file_name}, file_format={file_format})")
+        request = ExtendedHistorianService_pb2.ExportHistoriesRequest(begin_inclusive=begin_inclusive, end_exclusive=end_exclusive, format=file_format)
+        for a in channel_addresses:
+            ca = request.channel_addresses.add()
+            ca.adapter_name = a.adapter_name
+            ca.channel_name = a.channel_name
+            ca.channel_type = a.channel_type
+        size = 0
+        with open(file_name, "wb") as file:
+            for response in self.ehs_proxy.export_histories(request):
+                if response.status != Commons_pb2.SUCCESS:
+                    raise IOError(f"Exporting the time series failed with status {response.status}.")
+                size += file.write(response.data)
+        return size
+
+    def get_statistics(self) -> str:
+        """Returns the size of the database, the write durations of its last flush windows, the progress of its maintenance and the tick durations of the jobs as YAML."""
+        logging.debug(f"get_statistics()")
+        request = ExtendedHistorianService_pb2.GetStatisticsRequest()
+        return self.ehs_proxy.get_statistics(request).value
+
     # deprecated:
     def get_adapter_list(self):
         logging.debug(f"get_adapter_list()")
@@ -293,18 +621,31 @@ class EHSGRPCInterface(ExtendedHistorianService_pb2_grpc.ExtendedHistorianServic
         try:
 
             channel_addresses = request.channel_addresses
+            max_age = request.max_age
 
             for channel_address in channel_addresses:
 
                 adapter_name = channel_address.adapter_name
                 channel_name = channel_address.channel_name
                 channel_type = channel_address.channel_type
-                adapter = self.ehs.adapters[adapter_name]
-                read_request = DataSourceAdapter_pb2.ReadRequest(address=channel_name)
+                channel = self.ehs.channels.get((adapter_name, channel_name))
+                if channel is not None:
+                    adapter = channel.proxy
+                    read_request = channel.read_request
+                else:
+                    # a variable, which isn't configured, is read as well
+                    adapter = self.ehs.adapters[adapter_name]
+                    read_request = DataSourceAdapter_pb2.ReadRequest(address=channel_name)
                 response_value = response.value.add()
 
                 try:
-                    read_response = adapter.read(read_request)
+                    t = time.time_ns()
+                    latest_value = self.ehs.latest_values.get((adapter_name, channel_name))
+                    if max_age > 0 and latest_value is not None and t - latest_value[0] <= max_age:
+                        read_response = latest_value[1]
+                    else:
+                        read_response = adapter.read(read_request)
+                        self.ehs.latest_values[(adapter_name, channel_name)] = (t, read_response)
                     response_value.status = read_response.status
 
                     if channel_type == 'bool':
@@ -347,16 +688,49 @@ class EHSGRPCInterface(ExtendedHistorianService_pb2_grpc.ExtendedHistorianServic
             begin_inclusive = request.begin_inclusive
             end_exclusive = request.end_exclusive
 
-            for channel_address in channel_addresses:
-                adapter_name = channel_address.adapter_name
-                channel_name = channel_address.channel_name
-                channel_type = channel_address.channel_type
+            resolution = request.resolution
+            max_points = request.max_points
+            reduction = request.reduction or 'lttb'
+
+            columnar = request.columnar
+
+            channels = [self.ehs.channels.get((a.adapter_name, a.channel_name)) for a in channel_addresses]
+            channel_refs = [{'adapter': a.adapter_name, 'variable': a.channel_name} if c is None else c.channel_ref for a, c in zip(channel_addresses, channels)]
+            # the configured type of a channel takes precedence over the requested one
+            channel_types = [a.channel_type if c is None else c.channel_type for a, c in zip(channel_addresses, channels)]
+            rollup = self.ehs.db.select_rollup(resolution) if resolution > 0 else None
+            if rollup is None:
+                db_columns_list = self.ehs.db.get_columns_list(channel_refs, begin_inclusive, end_exclusive)
+            else:
+                db_time_series_list = self.ehs.db.get_rollup_time_series_list(channel_refs, begin_inclusive, end_exclusive, rollup)
+                db_columns_list = [to_columns(ts, channel_type) for channel_type, ts in zip(channel_types, db_time_series_list)]
+
+            for channel_address, channel_type, (times, values) in zip(channel_addresses, channel_types, db_columns_list):
+                if channel_type != channel_address.channel_type:
+                    logging.error(f"Bad requestet data type '{channel_address.channel_type}' in get_histories for {channel_address.adapter_name}.{channel_address.channel_name}, which is of type '{channel_type}'.")
+
+                    response.status = Commons_pb2.TYPE_MISMATCH
+                    channel_type = channel_address.channel_type
+                    times, values = times[:0], values[:0]
+
+                if max_points > 0 and channel_type in ('bool', 'int64', 'double'):
+                    times, values = reduce_columns(times, values, max_points, reduction)
+
+                if columnar:
+                    # the arrays are copied into bytes fields, without a Python object per sample
+                    try:
+                        pack_columns(response.columns.add(), channel_type, times, values)
+                    except ValueError:
+                        logging.error(f"Bad requestet data type '{channel_type}' in get_histories for {channel_address}.")
+
+                        response.status = Commons_pb2.TYPE_MISMATCH
+                    continue
+
                 list_of_time_series_values = response.value.add()
-                db_time_series = self.ehs.db.get_time_series(adapter_name, channel_name, begin_inclusive, end_exclusive)
 
-                for time_stamp, value in db_time_series:
+                for time_stamp, value in zip(times.tolist(), values.tolist()):
                     time_series_value = list_of_time_series_values.value.add()
-                    time_series_value.time = int(time_stamp)
+                    time_series_value.time = time_stamp
                     
                     if channel_type == 'bool':
                         time_series_value.value.bool_value = value
@@ -382,6 +756,123 @@ class EHSGRPCInterface(ExtendedHistorianService_pb2_grpc.ExtendedHistorianServic
 
         return response
 
+    def get_aggregated_histories(self, request, context):
+        logging.debug(f"ExtendedHistorianService.get_aggregated_histories(..)")
+
+        response = ExtendedHistorianService_pb2.GetAggregatedHistoriesResponse()
+
+        try:
+            channel_addresses = request.channel_addresses
+            aggregates = list(request.aggregates)
+
+            channels = [self.ehs.channels.get((a.adapter_name, a.channel_name)) for a in channel_addresses]
+            channel_refs = [{'adapter': a.adapter_name, 'variable': a.channel_name} if c is None else c.channel_ref for a, c in zip(channel_addresses, channels)]
+            # the configured type of a channel takes precedence over the requested one, like in get_histories()
+            channel_types = [a.channel_type if c is None else c.channel_type for a, c in zip(channel_addresses, channels)]
+            numeric_indexes = [i for i, (a, channel_type) in enumerate(zip(channel_addresses, channel_types))
+                               if channel_type == a.channel_type and channel_type in ('bool', 'int64', 'double')]
+            # the storage has no buckets for channels, which aren't numeric, whatever type is requested
+            db_aggregated_list = self.ehs.db.get_aggregated_list([channel_refs[i] for i in numeric_indexes], request.begin_inclusive, request.end_exclusive,
+                                                                 request.bucket_width, aggregates)
+            aggregated = dict(zip(numeric_indexes, db_aggregated_list))
+
+            for i, (channel_address, channel_type) in enumerate(zip(channel_addresses, channel_types)):
+                list_of_buckets = response.value.add()
+
+                if i not in aggregated:
+                    logging.error(f"Bad requestet data type '{channel_address.channel_type}' in get_aggregated_histories for {channel_address.adapter_name}.{channel_address.channel_name}, which is of type '{channel_type}'.")
+
+                    response.status = Commons_pb2.TYPE_MISMATCH
+                    continue
+
+                for begin, values in aggregated[i]:
+                    bucket = list_of_buckets.value.add()
+                    bucket.begin = begin
+                    bucket.value.extend(values)
+
+        except Exception as e:
+            logging.error(e)
+            
+            response.status = Commons_pb2.UNKNOWN
+
+        return response
+
+    def import_samples(self, request_iterator, context):
+        logging.debug(f"ExtendedHistorianService.import_samples(..)")
+
+        response = ExtendedHistorianService_pb2.ImportSamplesResponse()
+        importer = self.ehs.db.importer()
+
+        try:
+            for request in request_iterator:
+                channel_address = request.channel_address
+                channel_type = channel_address.channel_type
+                channel_ref = {'adapter': channel_address.adapter_name, 'variable': channel_address.channel_name}
+
+                if channel_type not in ('bool', 'int64', 'double', 'string'):
+                    logging.error(f"Bad requestet data type '{channel_type}' in import_samples for {channel_address}.")
+
+                    response.status = Commons_pb2.TYPE_MISMATCH
+                    continue
+
+                try:
+                    times, values = unpack_columns(request.columns, channel_type)
+                    importer.add(channel_ref, channel_type, times.tolist(), values.tolist())
+                except ValueError as e:
+                    logging.error(e)
+
+                    response.status = Commons_pb2.TYPE_MISMATCH
+
+        except Exception as e:
+            logging.error(e)
+            
+            response.status = Commons_pb2.UNKNOWN
+
+        # the samples received so far are kept, even if the stream broke off
+        try:
+            response.count = importer.close()
+
+        except Exception as e:
+            logging.error(e)
+            
+            response.status = Commons_pb2.UNKNOWN
+
+        return response
+
+    def export_histories(self, request, context):
+        logging.debug(f"ExtendedHistorianService.export_histories(..)")
+
+        try:
+            # pyarrow is an optional dependency, which is only needed for exports
+            from ehs import exporter
+
+            channel_refs = [{'adapter': a.adapter_name, 'variable': a.channel_name} for a in request.channel_addresses]
+            for data in exporter.iter_export(self.ehs.db, channel_refs, request.begin_inclusive, request.end_exclusive, request.format or 'parquet'):
+                yield ExtendedHistorianService_pb2.ExportHistoriesResponse(data=data, status=Commons_pb2.SUCCESS)
+
+        except Exception as e:
+            logging.error(e)
+
+            yield ExtendedHistorianService_pb2.ExportHistoriesResponse(status=Commons_pb2.UNKNOWN)
+
+    def get_statistics(self, request, context):
+        logging.debug(f"ExtendedHistorianService.get_statistics(..)")
+
+        response = ExtendedHistorianService_pb2.GetStatisticsResponse()
+
+        try:
+            statistics = self.ehs.db.statistics()
+            statistics['sampling'] = self.ehs.sampling_statistics()
+            statistics['streams'] = {adapter_name: read_stream.statistics() for adapter_name, read_stream in self.ehs.read_streams.items()}
+            response.value = yaml.dump(statistics, default_flow_style=False)
+            response.status = Commons_pb2.SUCCESS
+
+        except Exception as e:
+            logging.error(e)
+            response.status = Commons_pb2.UNKNOWN
+
+        return response
+
     # deprecated:
     def get_adapter_list(self, request, context):
         response = ExtendedHistorianService_pb2.GetAdapterListResponse()
@@ -401,97 +892,44 @@ class EHSGRPCInterface(ExtendedHistorianService_pb2_grpc.ExtendedHistorianServic
         return response
 
 
-class Database:
-
-
-    def __init__(self, root_dir):
-        """root_dir should be ehs.logging_dir"""
-        self.data_dir = os.path.join(root_dir, 'data')
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
-        self.data_file = os.path.join(self.data_dir, 'data.db')
-        # TODO sqlite3 check_same_thread is possibly dangerous. use a pykka actor instead.
-        self.db_con = sqlite3.connect(self.data_file, check_same_thread=False)
-        self.db_cur = self.db_con.cursor()
-        self.channel_types = {'bool': 'INTEGER', 'int64': 'INTEGER', 'double': 'REAL', 'string': 'TEXT'}
-
-    def channel_table_name(self, channel_ref):
-        """Double underlines are forbidden for Adapter names!"""
-        return channel_ref['adapter'] + '__' + channel_ref['variable']
-
-    def contains_table(self, channel_table_name) -> bool:
-        # cur = self.db_con.cursor()
-        res = self.db_cur.execute("SELECT name FROM sqlite_schema WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-        table_names = []
-        for row in res:
-            table_names.append(row[0])
-        return  channel_table_name in table_names
-
-    def create_table(self, channel_table_name, channel_type):
-        # cur = self.db_con.cursor()
-        sqlcmd = "CREATE TABLE {tn} (time REAL, value {ct});".format(tn=channel_table_name, ct=self.channel_types[channel_type])
-        if not self.contains_table(channel_table_name):
-            self.db_cur.execute(sqlcmd)
-            self.db_con.commit()
-
-    def save(self, channel_ref, t, value):
-        # cur = self.db_con.cursor()
-        sqlcmd = "INSERT INTO {tn} VALUES ({t}, {v});"
-
-        # make an exception for strings and bools
-        if type(value) is str:
-            sqlcmd = "INSERT INTO {tn} VALUES ({t}, \"{v}\");"
-        if type(value) is bool:
-            value = int(value)
-
-        sqlcmd = sqlcmd.format(
-            tn=self.channel_table_name(channel_ref),
-            t=t,
-            v=value
-        )
-
-        # whether type(value) fits the table datatype is currently unchecked
-
-        try:
-            self.db_con.execute(sqlcmd)
-        except Exception as e:
-            print(e)
-        self.db_con.commit()
-
-    def get_time_series(self, adapter_name, channel_name, begin_inclusive, end_exclusive):
-        sqlcmd = "SELECT * FROM {tab} WHERE time>={beg} AND time<{end};"
-        table_name = self.channel_table_name({'adapter': adapter_name, 'variable': channel_name})
-        sqlcmd = sqlcmd.format(
-            tab=table_name,
-            beg=begin_inclusive,
-            end=end_exclusive
-        )
-        res = self.db_cur.execute(sqlcmd)
-        time_series = []
-        for row in res:
-            time_series.append((row[0], row[1]))
-        return time_series
-
-
 class EHS(ehs.Application):
 
     def __init__(self):
         ehs.Application.__init__(self)
-        self.configuration_schemas = [ehs.HEADER_CONF, ehs.SERVER_CONF, ADAPTER_CONF]
+        self.configuration_schemas = [ehs.HEADER_CONF, ehs.SERVER_CONF, ADAPTER_CONF, JOB_CONF, DATABASE_CONF]
         self.adapters: Dict[str, DataSourceAdapter_pb2_grpc.DataSourceAdapterStub] = None
         self.scheduler = None
+        self.server: ehs.GRPCServer = None
+        self.db: Storage = None
+        # the compiled channels of the configured variables by (adapter, variable)
+        self.channels: Dict[Tuple[str, str], Channel] = {}
+        # the threads, which read the channels of an adapter, at most concurrency at a time
+        self.read_pools: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        # the adapters of an older version without read_many, of which the channels are read one by one
+        self.single_read_adapters = set()
+        self.read_streams: Dict[str, ReadStream] = {}
+        # the durations in seconds of the last ticks and the number of reads, which missed the deadline, of each job
+        self.tick_durations: Dict[str, collections.deque] = {}
+        self.missed_reads: Dict[str, int] = {}
+        # the latest (time, ReadResponse) of each (adapter, variable), which is fed by the sampling and get_values
+        self.latest_values: Dict[Tuple[str, str], Tuple[int, DataSourceAdapter_pb2.ReadResponse]] = {}
 
     def start(self):
         self.adapters = {}
         for adapter_config in self.configuration['adapters']:
             proxy = get_adapter_proxy(self.logging_dir, adapter_config, self.configuration)
             self.adapters[adapter_config['client']['name']] = proxy
+            self.read_pools[adapter_config['client']['name']] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=adapter_config['client'].get('concurrency', ADAPTER_CONCURRENCY), thread_name_prefix=f"read-{adapter_config['client']['name']}")
+            if adapter_config['client'].get('stream', True):
+                self.read_streams[adapter_config['client']['name']] = ReadStream(adapter_config['client']['name'], proxy)
         ehs_grpc_interface = EHSGRPCInterface(self)
 
 
         # set the defaults for the scheduler
-        self.db = Database(self.logging_dir)
-        self.ensure_tables()
+        self.db = get_database(self.logging_dir, self.configuration.get('database', {}))
+        self.ensure_channels()
+        self.channels = self.compile_channels()
 
         #self.db_path = os.path.join(self.data_dir, 'jobs.sqlite')
         #db_url = ''.join(['sqlite:///', self.db_path])
@@ -514,63 +952,132 @@ class EHS(ehs.Application):
         # uncomment the following line for starting without scheduler
         self.init_scheduling_rules()
 
-        # channel_ref = {'adapter': 'XmlRpcAdapter', 'variable': 'CurrentTime'}
-        # t = time.time_ns()
-        # self.save_channel_value(channel_ref, t)
-
         self.server = GRPCServer(self, ehs_grpc_interface)
         self.server.start_up()
 
-    def dummy_action(self):
-        pass
+    def sample_channels(self, job_name, groups, deadline):
+        """The action of a job, which is executed in the pool of the scheduler: saves the current value of each channel with the same time stamp.
 
-    def save_data(self, event):
-        current_job_name = event.job_id
+        The channels of each adapter are read by one read_many request in the read pool of the adapter,
+        so the adapters are read concurrently and a slow one doesn't delay the others. Values, which
+        aren't read within deadline seconds, are not saved and counted as missed reads.
+        """
+        start = time.monotonic()
         t = time.time_ns()
-        for job_name in self.configuration['jobs']:
-            if job_name == current_job_name:
-                i = 0
-                for channel_ref in self.configuration['jobs'][job_name]['channels']:
-                    self.save_channel_value(channel_ref, t)
-
-    def save_channel_value(self, channel_ref, t):
-        channel_type = self.channel_type(channel_ref)
-        proxy = self.adapters[channel_ref['adapter']]
-        request = DataSourceAdapter_pb2.ReadRequest(address=channel_ref['variable'])
-        channel_value = None
-        v = proxy.read(request)
-
-        if channel_type == 'bool':
-            channel_value = v.value.bool_value
-        elif channel_type == 'int64':
-            channel_value = v.value.int64_value
-        elif channel_type == 'double':
-            channel_value = v.value.double_value
-        elif channel_type == 'string':
-            channel_value = v.value.string_value
-        else:
-            logging.error(f"Bad type '{channel_type}' requested. Search in EHS configuration for this type.")
-        self.db.save(channel_ref, t, channel_value)
-
-    def ensure_tables(self):
+        reads = {}
+        for group in groups:
+            read_pool = self.read_pools[group.adapter_name]
+            if group.adapter_name in self.single_read_adapters:
+                for channel in group.channels:
+                    reads[read_pool.submit(self.read_channel_values, (channel,), t, start + deadline)] = (channel,)
+            else:
+                reads[read_pool.submit(self.read_group_values, group, t, start + deadline)] = group.channels
+        done, not_done = concurrent.futures.wait(reads, timeout=deadline)
+        missed_reads = 0
+        for future in not_done:
+            future.cancel()
+            missed_reads += len(reads[future])
+            for channel in reads[future]:
+                logging.error(f"{channel.channel_ref['adapter']}.{channel.channel_ref['variable']}: not read within the deadline of {deadline} s of job '{job_name}'.")
+        for future in done:
+            try:
+                values = future.result()
+            except Exception as e:
+                logging.error(f"{reads[future][0].channel_ref['adapter']}: {e}")
+                if isinstance(e, TimeoutError) or (isinstance(e, grpc.RpcError) and e.code() == grpc.StatusCode.DEADLINE_EXCEEDED):
+                    missed_reads += len(reads[future])
+                continue
+            for channel, value in values:
+                try:
+                    self.db.save(channel.channel_ref, t, value)
+                except Exception as e:
+                    logging.error(f"{channel.channel_ref['adapter']}.{channel.channel_ref['variable']}: {e}")
+        self.tick_durations[job_name].append(time.monotonic() - start)
+        self.missed_reads[job_name] += missed_reads
+
+    def read_group_values(self, group: ChannelGroup, t, deadline):
+        """Executed by the read pool of the adapter: returns the (channel, value) tuples of the group, which were read successfully, by one read_many request."""
+        try:
+            read_stream = self.read_streams.get(group.adapter_name)
+            if read_stream is not None:
+                response = read_stream.read_many(group.read_many_request, remaining_time(deadline))
+            else:
+                response = group.proxy.read_many(group.read_many_request, timeout=remaining_time(deadline))
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                raise
+            logging.warning(f"The adapter '{group.adapter_name}' doesn't implement read_many, so its channels are read one by one.")
+            self.single_read_adapters.add(group.adapter_name)
+            return self.read_channel_values(group.channels, t, deadline)
+        return self.extract_values(group.channels, response.values, t)
+
+    def read_channel_values(self, channels, t, deadline):
+        """Executed by the read pool of the adapter: returns the (channel, value) tuples of the channels, which were read successfully, by a read request each."""
+        return self.extract_values(channels, [channel.proxy.read(channel.read_request, timeout=remaining_time(deadline)) for channel in channels], t)
+
+    def extract_values(self, channels, read_responses, t):
+        """Returns the (channel, value) tuples of the successful ReadResponses and keeps all of them as latest values."""
+        values = []
+        for channel, v in zip(channels, read_responses):
+            self.latest_values[(channel.channel_ref['adapter'], channel.channel_ref['variable'])] = (t, v)
+            if v.status != Commons_pb2.SUCCESS:
+                logging.error(f"{channel.channel_ref['adapter']}.{channel.channel_ref['variable']}: read failed with status {Commons_pb2.Status.Name(v.status)}.")
+                continue
+            if channel.extract is None:
+                logging.error(f"Bad type '{channel.channel_type}' requested. Search in EHS configuration for this type.")
+                values.append((channel, None))
+                continue
+            values.append((channel, channel.extract(v)))
+        return values
+
+    def sampling_statistics(self) -> dict:
+        """Returns the distribution of the tick durations in seconds and the number of missed reads of each job."""
+        statistics = {}
+        for job_name, durations in self.tick_durations.items():
+            durations = numpy.array(durations)
+            statistics[job_name] = {'ticks': len(durations), 'missed_reads': self.missed_reads[job_name]}
+            if len(durations):
+                for name, q in (('median', 50), ('p90', 90), ('p99', 99), ('max', 100)):
+                    statistics[job_name][name] = float(numpy.percentile(durations, q))
+        return statistics
+
+    def compile_channels(self) -> Dict[Tuple[str, str], Channel]:
+        """Returns the Channel of each configured variable by (adapter, variable)."""
+        channels = {}
+        for adapter in self.configuration['adapters']:
+            adapter_name = adapter['client']['name']
+            for variable in adapter['client']['variables']:
+                channels[(adapter_name, variable['name'])] = Channel(adapter_name, variable['name'], variable['type'], self.adapters[adapter_name])
+        return channels
+
+    def ensure_channels(self):
+        channels = []
         for adapter in self.configuration['adapters']:
             adapter_name = adapter['client']['name']
             for variable in adapter['client']['variables']:
                 variable_name = variable['name']
                 variable_type = variable['type']
-                table_name = self.db.channel_table_name({'adapter': adapter_name, 'variable': variable_name})
-                self.db.create_table(table_name, variable_type)
-
-    def channel_type(self, channel_ref):
-        """channel_ref is a combination of adapter and varible definition as specified in ehs/configuration.yaml"""
-        print(channel_ref)
+                channels.append(({'adapter': adapter_name, 'variable': variable_name}, variable_type))
+        self.db.create_channels(channels)
+        self.db.set_retentions(self.channel_retentions())
+
+    def channel_retentions(self):
+        """Returns (channel_ref, retention) tuples in seconds of the channels, which have one configured for their variable or jobs.
+
+        The retention of a variable takes precedence. A channel sampled by several jobs gets the longest
+        retention of them. Other channels get the default retention of the database section.
+        """
+        retentions = {}
+        for job in self.configuration.get('jobs', {}).values():
+            if 'retention' in job:
+                for channel_ref in job['channels']:
+                    key = (channel_ref['adapter'], channel_ref['variable'])
+                    retentions[key] = max(retentions.get(key, 0), job['retention'])
         for adapter in self.configuration['adapters']:
-            # print(f"x={}, y={}")
-            if adapter['client']['name'] == channel_ref['adapter']:
-                for variable in adapter['client']['variables']:
-                    if variable['name'] == channel_ref['variable']:
-                        return variable['type']
-        return None
+            for variable in adapter['client']['variables']:
+                if 'retention' in variable:
+                    retentions[(adapter['client']['name'], variable['name'])] = variable['retention']
+        return [({'adapter': adapter_name, 'variable': variable_name}, retention) for (adapter_name, variable_name), retention in retentions.items()]
 
     def init_scheduling_rules(self):
         logging.getLogger('apscheduler').setLevel(logging.CRITICAL)
@@ -579,14 +1086,39 @@ class EHS(ehs.Application):
                 job = self.configuration['jobs'][job_name]
                 if job['type'] == 'interval':
                     seconds = int(job['seconds'])
-                    self.scheduler.add_job(self.dummy_action, 'interval', seconds=seconds, id=job_name)
-        self.scheduler.add_listener(self.save_data, apscheduler.events.EVENT_JOB_EXECUTED)
+                    # the channels are bound to the job once, grouped by adapter, so a run doesn't look up its job in the configuration
+                    channels: Dict[str, List[Channel]] = {}
+                    for channel_ref in job['channels']:
+                        channel = self.channels.get((channel_ref['adapter'], channel_ref['variable']))
+                        if channel is None:
+                            logging.error(f"Job '{job_name}' samples {channel_ref['adapter']}.{channel_ref['variable']}, which isn't configured as variable of an adapter.")
+                            continue
+                        channels.setdefault(channel_ref['adapter'], []).append(channel)
+                    groups = tuple(ChannelGroup(adapter_name, adapter_channels) for adapter_name, adapter_channels in channels.items())
+                    self.tick_durations[job_name] = collections.deque(maxlen=TICK_DURATIONS)
+                    self.missed_reads[job_name] = 0
+                    # by default, a tick has to end before the next one starts
+                    deadline = job.get('deadline', seconds)
+                    self.scheduler.add_job(self.sample_channels, 'interval', args=(job_name, groups, deadline), seconds=seconds, id=job_name)
         self.scheduler.start()
 
     def stop(self):
+        # no further ticks, and the running ones end, before the samples they save are written
+        if self.scheduler is not None and self.scheduler.running:
+            self.scheduler.shutdown(wait=True)
         # stop the server
-        self.server.shut_down()
+        if self.server is not None:
+            self.server.stop_serving()
         # disconnect from all adapters
+        for read_stream in self.read_streams.values():
+            read_stream.close()
+        for read_pool in self.read_pools.values():
+            read_pool.shutdown(wait=False, cancel_futures=True)
+        # write the samples of the open flush window
+        if self.db is not None:
+            self.db.close()
+        if self.server is not None:
+            self.server.shut_down()
 
     def run(self):
         try:
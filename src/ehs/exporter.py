@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""Bulk export of time series from the EHS into Parquet or Arrow IPC files, which load into pandas or polars as they are.
+
+A file has the columns time (timestamp in nanoseconds, UTC), adapter, variable and value. If the
+channels are of different types, there is a column per type instead of value, e.g. double_value,
+which is null in the rows of the other types. The samples are read from the storage one time
+window of the chunk_interval after the other and written in record batches of at most
+BATCH_ROWS rows, so the memory doesn't grow with the exported time range.
+
+This module needs pyarrow, which is an optional dependency of the EHS. The files are either
+received from a running EHS by its export_histories RPC, or written from the database of a
+stopped EHS:
+
+    python -m ehs.exporter --client-dir demo/application/plotting --begin 2023-01-01 --end 2023-02-01 export.parquet
+    python -m ehs.exporter --ehs-dir demo/ehs --channel XmlRpcAdapter.CurrentTimeSec --format arrow export.arrow
+"""
+
+import argparse
+from ehs.ehsx import EHSClient, get_config
+from ehs.database import get_database
+from ehs.importer import parse_time
+import logging
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet
+import sys
+import time
+
+
+FORMATS = ('parquet', 'arrow')
+BATCH_ROWS = 262_144  # rows per record batch, which is a row group of a Parquet file
+ARROW_TYPES = {'bool': pyarrow.bool_(), 'int64': pyarrow.int64(), 'double': pyarrow.float64(), 'string': pyarrow.string()}
+
+
+class ChunkedSink:
+    """A write-only file, of which the written bytes are taken out with drain() while the file is being written."""
+
+    def __init__(self) -> None:
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def value_columns(channel_types):
+    """Returns the name of the value column of each channel type."""
+    distinct_types = [t for t in ARROW_TYPES if t in channel_types]
+    if len(distinct_types) == 1:
+        return {distinct_types[0]: 'value'}
+    return {t: f"{t}_value" for t in distinct_types}
+
+
+def export_schema(channel_types) -> pyarrow.Schema:
+    fields = [pyarrow.field('time', pyarrow.timestamp('ns', tz='UTC')), pyarrow.field('adapter', pyarrow.string()), pyarrow.field('variable', pyarrow.string())]
+    for channel_type, column in value_columns(channel_types).items():
+        fields.append(pyarrow.field(column, ARROW_TYPES[channel_type]))
+    return pyarrow.schema(fields)
+
+
+def iter_record_batches(db, channel_refs, begin_inclusive, end_exclusive, schema: pyarrow.Schema):
+    """Yields a record batch for the samples of each channel and time window of the chunk_interval of the database."""
+    window = db.chunk_interval_ns
+    for channel_ref in channel_refs:
+        channel_id = db.resolve_channel(channel_ref)
+        if channel_id is None:
+            logging.error(f"No channel {channel_ref} has been created in the database.")
+            continue
+        channel_type = db.channel_types[channel_id]
+        column = 'value' if 'value' in schema.names else f"{channel_type}_value"
+        begin = begin_inclusive
+        while begin < end_exclusive:
+            end = min(begin - begin % window + window, end_exclusive)
+            times, values = db.get_columns_list([channel_ref], begin, end)[0]
+            begin = end
+            if len(times) == 0:
+                # skips the windows without samples
+                begin = db.next_time(channel_ref, begin)
+                if begin is None:
+                    break
+                continue
+            arrays = [pyarrow.array(times, type=pyarrow.timestamp('ns', tz='UTC')),
+                      pyarrow.array([channel_ref['adapter']] * len(times), type=pyarrow.string()),
+                      pyarrow.array([channel_ref['variable']] * len(times), type=pyarrow.string())]
+            for field in schema:
+                if field.name in ('time', 'adapter', 'variable'):
+                    continue
+                if field.name == column:
+                    arrays.append(pyarrow.array(values, type=field.type))
+                else:
+                    arrays.append(pyarrow.nulls(len(times), type=field.type))
+            yield pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_export(db, channel_refs, begin_inclusive, end_exclusive, file_format='parquet'):
+    """Yields the consecutive parts of a Parquet or Arrow IPC file of the channels in the time range."""
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown export format '{file_format}'.")
+    channel_types = [db.channel_types[db.resolve_channel(r)] for r in channel_refs if db.resolve_channel(r) is not None]
+    schema = export_schema(channel_types)
+    sink = ChunkedSink()
+    if file_format == 'parquet':
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pyarrow.ipc.new_file(sink, schema)
+
+    def write(batches):
+        if file_format == 'parquet':
+            writer.write_table(pyarrow.Table.from_batches(batches, schema=schema), row_group_size=BATCH_ROWS)
+        else:
+            for batch in batches:
+                writer.write_batch(batch)
+
+    batches = []
+    rows = 0
+    for batch in iter_record_batches(db, channel_refs, begin_inclusive, end_exclusive, schema):
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= BATCH_ROWS:
+            write(batches)
+            batches = []
+            rows = 0
+            yield sink.drain()
+    if batches:
+        write(batches)
+    writer.close()
+    yield sink.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exports time series of the EHS into a Parquet or Arrow IPC file.")
+    parser.add_argument("file", type=str, help="The file to write.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--client-dir", type=str, help="Directory of a client config.yaml for receiving the file from a running EHS.")
+    group.add_argument("--ehs-dir", type=str, help="Directory of the config.yaml of a stopped EHS for reading its database directly.")
+    parser.add_argument("--channel", type=str, action="append", help="Channel as adapter.variable, all channels if not given.")
+    parser.add_argument("--begin", type=str, default="0", help="Begin (inclusive) in nanoseconds or as ISO 8601 date time.")
+    parser.add_argument("--end", type=str, default=str(2 ** 63 - 1), help="End (exclusive) in nanoseconds or as ISO 8601 date time.")
+    parser.add_argument("--format", type=str, choices=FORMATS, default="parquet", help="The file format.")
+    args = parser.parse_args()
+
+    begin_inclusive = parse_time(args.begin)
+    end_exclusive = parse_time(args.end)
+    channels = None if args.channel is None else [channel.split('.', 1) for channel in args.channel]
+
+    start = time.perf_counter()
+    if args.client_dir is not None:
+        client = EHSClient(args.client_dir)
+        channel_addresses = client.get_channels()
+        if channels is not None:
+            channel_addresses = [a for a in channel_addresses if [a.adapter_name, a.channel_name] in channels]
+        size = client.export_histories(channel_addresses, begin_inclusive, end_exclusive, args.file, args.format)
+    else:
+        db = get_database(args.ehs_dir, get_config(args.ehs_dir).get('database', {}))
+        try:
+            if channels is None:
+                channels = sorted(db.channel_ids)
+            channel_refs = [{'adapter': adapter_name, 'variable': variable_name} for adapter_name, variable_name in channels]
+            size = 0
+            with open(args.file, "wb") as file:
+                for data in iter_export(db, channel_refs, begin_inclusive, end_exclusive, args.format):
+                    size += file.write(data)
+        finally:
+            db.close()
+    logging.info(f"Exported {size:,} bytes to '{args.file}' in {time.perf_counter() - start:.1f} s.")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
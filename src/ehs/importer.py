@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""Bulk import of time series from CSV files into the EHS, e.g. of the exports of a former historian.
+
+A CSV file has a header line and the columns adapter, variable, type, time and value, in any order.
+The type is one of bool, int64, double and string. Time stamps are integer nanoseconds since the
+epoch or ISO 8601 date times, which are taken as UTC without a time zone. A row with an empty value
+is skipped. Channels, which don't exist yet, are created with the given type. The blocks of a channel,
+which exists with another type, are rejected.
+
+The samples are either sent to a running EHS by its import_samples RPC, or written directly into
+the database of a stopped EHS:
+
+    python -m ehs.importer --client-dir demo/application/plotting export.csv
+    python -m ehs.importer --ehs-dir demo/ehs export.csv
+"""
+
+import argparse
+import csv
+import datetime
+from ehs.ehsx import ChannelAddress, EHSClient, get_config
+from ehs.database import get_database
+import logging
+import sys
+import time
+
+
+BLOCK_SIZE = 10_000  # samples per block of a channel, which is sent as one request
+
+
+def parse_time(text: str) -> int:
+    if text.lstrip('-').isdigit():
+        return int(text)
+    t = datetime.datetime.fromisoformat(text)
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=datetime.timezone.utc)
+    delta = t - datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def parse_value(text: str, channel_type: str):
+    if text == '':
+        return None
+    if channel_type == 'bool':
+        return text.strip().lower() in ('1', 'true', 'yes', 'on')
+    elif channel_type == 'int64':
+        return int(text)
+    elif channel_type == 'double':
+        return float(text)
+    elif channel_type == 'string':
+        return text
+    raise ValueError(f"Bad channel data type: {channel_type}")
+
+
+def read_csv(file, block_size=BLOCK_SIZE):
+    """Yields (ChannelAddress, times, values) blocks of consecutive rows of the same channel, of at most block_size samples."""
+    address = None
+    times = []
+    values = []
+    for row in csv.DictReader(file):
+        key = (row['adapter'], row['variable'], row['type'])
+        if address is None or key != (address.adapter_name, address.channel_name, address.channel_type) or len(times) >= block_size:
+            if times:
+                yield address, times, values
+            address = ChannelAddress(*key)
+            times = []
+            values = []
+        times.append(parse_time(row['time']))
+        values.append(parse_value(row['value'], address.channel_type))
+    if times:
+        yield address, times, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Imports time series from CSV files with the columns adapter, variable, type, time and value into the EHS.")
+    parser.add_argument("files", type=str, nargs="+", help="CSV files to import.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--client-dir", type=str, help="Directory of a client config.yaml for sending the samples to a running EHS.")
+    group.add_argument("--ehs-dir", type=str, help="Directory of the config.yaml of a stopped EHS for writing its database directly.")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="Samples per block of a channel.")
+    args = parser.parse_args()
+
+    def blocks():
+        for file_name in args.files:
+            logging.info(f"Importing '{file_name}' ...")
+            with open(file_name, "r", newline="") as file:
+                yield from read_csv(file, args.block_size)
+
+    start = time.perf_counter()
+    if args.client_dir is not None:
+        count = EHSClient(args.client_dir).import_samples(blocks())
+    else:
+        db = get_database(args.ehs_dir, get_config(args.ehs_dir).get('database', {}))
+        try:
+            importer = db.importer()
+            for address, times, values in blocks():
+                try:
+                    importer.add({'adapter': address.adapter_name, 'variable': address.channel_name}, address.channel_type, times, values)
+                except ValueError as e:
+                    logging.error(e)
+            count = importer.close()
+        finally:
+            db.close()
+    elapsed = time.perf_counter() - start
+    logging.info(f"Imported {count} samples in {elapsed:.1f} s ({count / max(elapsed, 1e-9) * 60:,.0f} samples per minute).")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+"""The in-memory storage backend of the EHS, e.g. for tests and benchmarks without disk I/O.
+
+It is selected in the database section of the EHS configuration:
+
+    database:
+      backend: memory
+      capacity: 100000
+
+Nothing is persisted, so the samples are lost when the EHS stops.
+"""
+
+from ehs.database import AGGREGATES, CHUNK_INTERVAL, RETENTION, RETENTION_INTERVAL, VALUE_DTYPES, Expirer, aggregate_columns
+from ehs.storage import Storage, convert_value
+import logging
+import numpy
+import threading
+import time
+from typing import Dict
+
+
+CAPACITY = 100_000  # samples per channel
+
+
+class RingBuffer:
+    """The latest capacity samples of a channel in preallocated arrays, of which the oldest ones are overwritten.
+
+    The samples are kept in ascending order of time. A sample, which doesn't arrive in order, is
+    appended anyway and sorted in by the next read, where it replaces one with the same time stamp.
+    """
+
+    def __init__(self, capacity, channel_type) -> None:
+        self.times = numpy.empty(capacity, dtype=numpy.int64)
+        self.values = numpy.empty(capacity, dtype=VALUE_DTYPES[channel_type])
+        self.start = 0  # the index of the oldest sample
+        self.size = 0
+        self.ordered = True
+
+    def append(self, t, value) -> None:
+        capacity = len(self.times)
+        if self.size and t <= self.times[(self.start + self.size - 1) % capacity]:
+            self.ordered = False
+        i = (self.start + self.size) % capacity
+        self.times[i] = t
+        self.values[i] = value
+        if self.size < capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % capacity
+
+    def segments(self):
+        """Returns the (times, values) views of the one or two contiguous parts of the samples, oldest first."""
+        end = self.start + self.size
+        capacity = len(self.times)
+        if end <= capacity:
+            return [(self.times[self.start:end], self.values[self.start:end])]
+        return [(self.times[self.start:], self.values[self.start:]), (self.times[:end - capacity], self.values[:end - capacity])]
+
+    def sort(self) -> None:
+        """Sorts the samples in place by time, while the last appended sample of the same time stamp is kept."""
+        times = numpy.concatenate([times for times, values in self.segments()])
+        values = numpy.concatenate([values for times, values in self.segments()])
+        # a stable sort keeps later samples behind earlier ones of the same time stamp
+        order = numpy.argsort(times, kind='stable')
+        times = times[order]
+        last = numpy.append(times[1:] != times[:-1], True)
+        self.size = int(numpy.count_nonzero(last))
+        self.start = 0
+        self.times[:self.size] = times[last]
+        self.values[:self.size] = values[order][last]
+        self.ordered = True
+
+    def columns(self, begin_inclusive, end_exclusive):
+        """Returns the (times, values) arrays of the samples in the time range."""
+        if not self.ordered:
+            self.sort()
+        parts = []
+        for times, values in self.segments():
+            lo, hi = numpy.searchsorted(times, (begin_inclusive, end_exclusive))
+            parts.append((times[lo:hi], values[lo:hi]))
+        if len(parts) == 1:
+            return parts[0][0].copy(), parts[0][1].copy()
+        return numpy.concatenate([p[0] for p in parts]), numpy.concatenate([p[1] for p in parts])
+
+    def latest(self):
+        if not self.ordered:
+            self.sort()
+        if self.size == 0:
+            return None
+        i = (self.start + self.size - 1) % len(self.times)
+        value = self.values[i]
+        return int(self.times[i]), value if self.values.dtype == object else value.item()
+
+    def drop_before(self, horizon) -> int:
+        """Drops the samples before horizon and returns their number."""
+        if not self.ordered:
+            self.sort()
+        dropped = 0
+        for times, values in self.segments():
+            dropped += int(numpy.searchsorted(times, horizon))
+        self.start = (self.start + dropped) % len(self.times)
+        self.size -= dropped
+        return dropped
+
+
+class MemoryImporter:
+    """Appends the samples of an import to the ring buffers, see ehs.database.Importer."""
+
+    def __init__(self, storage: "MemoryStorage") -> None:
+        self.storage = storage
+        self.count = 0
+
+    def add(self, channel_ref, channel_type, times, values) -> None:
+        """Appends the samples with value of a channel, which is created with channel_type, if it doesn't exist yet."""
+        self.storage.check_samples(channel_ref, channel_type, values)
+        if None in values:
+            times = [t for t, value in zip(times, values) if value is not None]
+            values = [value for value in values if value is not None]
+        if not self.storage.contains_channel(channel_ref):
+            self.storage.create_channel(channel_ref, channel_type)
+        for t, value in zip(times, values):
+            self.storage.save(channel_ref, t, value)
+        self.count += len(times)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> int:
+        return self.count
+
+
+class MemoryStorage(Storage):
+    """Keeps the latest capacity samples of each channel in a RingBuffer.
+
+    Samples without value are not stored. Changing the type of a channel keeps the samples, which convert to it.
+    All buffers are guarded by one lock, so the samples are visible to reads as soon as save() returns.
+    """
+
+    def __init__(self, capacity=CAPACITY, retention=RETENTION, retention_interval=RETENTION_INTERVAL) -> None:
+        Storage.__init__(self)
+        self.capacity = capacity
+        self.chunk_interval_ns = int(CHUNK_INTERVAL * 1_000_000_000)
+        self.buffers: Dict[int, RingBuffer] = {}
+        self.lock = threading.Lock()
+        self.retention_ns = None if retention is None else int(retention * 1_000_000_000)
+        self.retentions_ns: Dict[int, int] = {}
+        self.expirer = Expirer(self, interval=retention_interval)
+        self.expirer.start()
+
+    def create_channels(self, channels) -> None:
+        with self.lock:
+            for channel_ref, channel_type in channels:
+                key = (channel_ref['adapter'], channel_ref['variable'])
+                channel_id = self.channel_ids.get(key)
+                if channel_id is not None and self.channel_types[channel_id] == channel_type:
+                    continue
+                buffer = RingBuffer(self.capacity, channel_type)
+                if channel_id is None:
+                    channel_id = len(self.channel_ids) + 1
+                else:
+                    # the samples, which convert to the new type, are kept, like the SQLite backend does
+                    times, values = self.buffers[channel_id].columns(-2 ** 63, 2 ** 63 - 1)
+                    for t, value in zip(times.tolist(), values.tolist()):
+                        value = convert_value(value, channel_type)
+                        if value is not None:
+                            buffer.append(t, value)
+                self.buffers[channel_id] = buffer
+                self.channel_types[channel_id] = channel_type
+                self.channel_ids[key] = channel_id
+
+    def save(self, channel_ref, t, value) -> None:
+        channel_id = self.resolve_channel(channel_ref)
+        if channel_id is None:
+            logging.error(f"No channel {channel_ref} has been created in the storage.")
+            return
+        if value is None:
+            return
+        with self.lock:
+            self.buffers[channel_id].append(t, value)
+
+    def flush(self) -> None:
+        pass
+
+    def importer(self) -> MemoryImporter:
+        return MemoryImporter(self)
+
+    def get_columns_list(self, channel_refs, begin_inclusive, end_exclusive):
+        columns_list = []
+        with self.lock:
+            for channel_ref in channel_refs:
+                channel_id = self.resolve_channel(channel_ref)
+                if channel_id is None:
+                    columns_list.append((numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=object)))
+                else:
+                    columns_list.append(self.buffers[channel_id].columns(begin_inclusive, end_exclusive))
+        return columns_list
+
+    def get_time_series_list(self, channel_refs, begin_inclusive, end_exclusive):
+        return [list(zip(times.tolist(), values.tolist())) for times, values in self.get_columns_list(channel_refs, begin_inclusive, end_exclusive)]
+
+    def next_time(self, channel_ref, t):
+        times, values = self.get_columns_list([channel_ref], t, 2 ** 63 - 1)[0]
+        return int(times[0]) if len(times) else None
+
+    def get_aggregated_list(self, channel_refs, begin_inclusive, end_exclusive, bucket_width, aggregates):
+        if bucket_width <= 0:
+            raise ValueError(f"The bucket width must be positive, not {bucket_width}.")
+        for aggregate in aggregates:
+            if aggregate not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate '{aggregate}'.")
+        numeric = [self.channel_types.get(self.resolve_channel(channel_ref)) in ('bool', 'int64', 'double') for channel_ref in channel_refs]
+        return [aggregate_columns(times, values, begin_inclusive, bucket_width, aggregates) if is_numeric else []
+                for is_numeric, (times, values) in zip(numeric, self.get_columns_list(channel_refs, begin_inclusive, end_exclusive))]
+
+    def get_latest_list(self, channel_refs):
+        with self.lock:
+            return [None if self.resolve_channel(r) is None else self.buffers[self.resolve_channel(r)].latest() for r in channel_refs]
+
+    def set_retentions(self, retentions) -> None:
+        for channel_ref, retention in retentions:
+            channel_id = self.resolve_channel(channel_ref)
+            if channel_id is None:
+                logging.error(f"No channel {channel_ref} has been created in the storage.")
+                continue
+            self.retentions_ns[channel_id] = None if retention is None else int(retention * 1_000_000_000)
+
+    def expire(self, now=None) -> int:
+        """Drops the samples, which are older than the retention of their channel, and returns their number."""
+        if now is None:
+            now = time.time_ns()
+        dropped = 0
+        with self.lock:
+            for channel_id, buffer in self.buffers.items():
+                retention = self.retentions_ns.get(channel_id, self.retention_ns)
+                if retention is not None:
+                    dropped += buffer.drop_before(now - retention)
+        return dropped
+
+    def statistics(self) -> dict:
+        with self.lock:
+            samples = sum(buffer.size for buffer in self.buffers.values())
+        return {
+            'backend': 'memory',
+            'channels': len(self.channel_types),
+            'capacity': self.capacity,
+            'samples': samples,
+        }
+
+    def close(self) -> None:
+        self.expirer.stop()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""The interface of the storage backends of the EHS, which is selected by the backend of the database section
+of the EHS configuration:
+
+- sqlite (default): the persistent ehs.database.Database
+- memory: the ehs.memory.MemoryStorage, which keeps the latest samples of each channel in ring buffers,
+  e.g. for tests and benchmarks
+
+A channel_ref is a dict with the keys adapter and variable, time stamps are integer nanoseconds.
+"""
+
+import abc
+import numbers
+import numpy
+from typing import Dict, Tuple
+
+
+def fits_type(value, channel_type) -> bool:
+    """Whether a value, which isn't None, can be stored in a channel of channel_type."""
+    is_bool = isinstance(value, (bool, numpy.bool_))
+    if channel_type == 'bool':
+        return is_bool
+    if channel_type == 'int64':
+        return isinstance(value, numbers.Integral) and not is_bool
+    if channel_type == 'double':
+        return isinstance(value, numbers.Real) and not is_bool
+    if channel_type == 'string':
+        return isinstance(value, str)
+    return False
+
+
+def convert_value(value, channel_type):
+    """Returns a stored value of another channel type as it is stored in a channel of channel_type, or None, if it doesn't convert without loss.
+
+    Numbers convert between double, int64 and bool (as 0 or 1), as long as they keep their value,
+    while strings and numbers don't convert into each other.
+    """
+    if isinstance(value, str) or channel_type == 'string':
+        return value if isinstance(value, str) and channel_type == 'string' else None
+    if not isinstance(value, numbers.Real):
+        return None
+    if channel_type == 'double':
+        return float(value)
+    if isinstance(value, float) and not value.is_integer():
+        return None
+    if channel_type == 'int64':
+        return int(value) if -2 ** 63 <= value < 2 ** 63 else None
+    if channel_type == 'bool':
+        return int(value) if value in (0, 1) else None
+    return None
+
+
+class Storage(abc.ABC):
+    """A storage backend, which holds the channels catalogue as channel_ids and channel_types.
+
+    chunk_interval_ns is the length of the time windows, in which range scans over long time
+    ranges are split, e.g. by ehs.exporter.
+    """
+
+    def __init__(self) -> None:
+        self.channel_ids: Dict[Tuple[str, str], int] = {}
+        self.channel_types: Dict[int, str] = {}
+        self.chunk_interval_ns: int = None
+
+    # channels
+
+    def contains_channel(self, channel_ref) -> bool:
+        return (channel_ref['adapter'], channel_ref['variable']) in self.channel_ids
+
+    def resolve_channel(self, channel_ref) -> int:
+        """Returns the id of the channel or None."""
+        return self.channel_ids.get((channel_ref['adapter'], channel_ref['variable']))
+
+    def create_channel(self, channel_ref, channel_type):
+        """Registers the channel, if it isn't known yet, or updates its type to the configured one."""
+        self.create_channels([(channel_ref, channel_type)])
+
+    def check_samples(self, channel_ref, channel_type, values) -> None:
+        """Raises a ValueError, if the channel exists with another type than channel_type, or a value doesn't fit channel_type."""
+        channel_id = self.resolve_channel(channel_ref)
+        if channel_id is not None and self.channel_types[channel_id] != channel_type:
+            raise ValueError(f"The channel {channel_ref} is of type '{self.channel_types[channel_id]}', not '{channel_type}'.")
+        for value in values:
+            if value is not None and not fits_type(value, channel_type):
+                raise ValueError(f"The value {value!r} doesn't fit the type '{channel_type}' of the channel {channel_ref}.")
+
+    @abc.abstractmethod
+    def create_channels(self, channels) -> None:
+        """Registers all (channel_ref, channel_type) tuples, which are not yet in the catalogue with that type.
+
+        A channel, which changes its type, keeps the samples, of which the values convert to it, see convert_value().
+        """
+
+    # appending
+
+    @abc.abstractmethod
+    def save(self, channel_ref, t, value) -> None:
+        """Appends a sample, which may only be visible to reads after flush()."""
+
+    @abc.abstractmethod
+    def flush(self) -> None:
+        """Blocks until all samples saved so far are visible to reads."""
+
+    @abc.abstractmethod
+    def importer(self):
+        """Returns an importer for appending batches of samples with add(channel_ref, channel_type, times, values), which close() completes.
+
+        add() skips the samples without value and raises a ValueError for samples, which don't fit the channel, see check_samples().
+        """
+
+    # range scans
+
+    def get_time_series(self, adapter_name, channel_name, begin_inclusive, end_exclusive):
+        return self.get_time_series_list([{'adapter': adapter_name, 'variable': channel_name}], begin_inclusive, end_exclusive)[0]
+
+    @abc.abstractmethod
+    def get_time_series_list(self, channel_refs, begin_inclusive, end_exclusive):
+        """Returns a list of (time, value) tuples in ascending order of time for each channel_ref."""
+
+    def get_columns(self, adapter_name, channel_name, begin_inclusive, end_exclusive):
+        return self.get_columns_list([{'adapter': adapter_name, 'variable': channel_name}], begin_inclusive, end_exclusive)[0]
+
+    @abc.abstractmethod
+    def get_columns_list(self, channel_refs, begin_inclusive, end_exclusive):
+        """Returns a (times, values) tuple of arrays for each channel_ref, without the samples without value."""
+
+    @abc.abstractmethod
+    def next_time(self, channel_ref, t):
+        """Returns a time stamp at or after t, before which the channel has no sample, or None, if there is none later."""
+
+    # aggregation
+
+    def select_rollup(self, resolution):
+        """Returns the coarsest precomputed resolution in nanoseconds, which is at most resolution, or None."""
+        return None
+
+    def get_rollup_time_series_list(self, channel_refs, begin_inclusive, end_exclusive, rollup):
+        """Returns a list of (bucket begin, mean) tuples of the buckets of rollup for each channel_ref, which are empty without rollups."""
+        return [[] for _ in channel_refs]
+
+    @abc.abstractmethod
+    def get_aggregated_list(self, channel_refs, begin_inclusive, end_exclusive, bucket_width, aggregates):
+        """Returns a list of (bucket begin, aggregate values) tuples of the non-empty buckets for each channel_ref, see ehs.database.AGGREGATES.
+
+        Channels, which aren't numeric, have no buckets.
+        """
+
+    # latest values
+
+    @abc.abstractmethod
+    def get_latest_list(self, channel_refs):
+        """Returns the (time, value) tuple of the latest sample of each channel_ref or None."""
+
+    # retention
+
+    @abc.abstractmethod
+    def set_retentions(self, retentions) -> None:
+        """Sets the retention in seconds of each (channel_ref, retention) tuple, while None keeps the samples forever."""
+
+    @abc.abstractmethod
+    def expire(self, now=None) -> int:
+        """Drops the samples, which are older than the retention of their channel, and returns the number of dropped units."""
+
+    # operation
+
+    @abc.abstractmethod
+    def statistics(self) -> dict:
+        """Returns figures of the backend for monitoring, e.g. its size."""
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        pass
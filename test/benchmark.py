@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for the storage layer and the adapter interface of the EHS.
+
+The storage benchmarks run against throw-away databases in a temporary directory, the read
+benchmark against a stand-in adapter on localhost, e.g.
+
+    python test/benchmark.py ingest --channels 300 --ticks 20
+    python test/benchmark.py reads --channels 200
+"""
+
+
+import argparse
+import concurrent.futures
+import ehs
+from ehs.api import DataSourceAdapter_pb2, DataSourceAdapter_pb2_grpc
+import grpc
+import math
+import os.path
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from ehs.database import Database, get_database
+
+
+def legacy_save(db_con, table_name, t, value):
+    """The former Database.save(): one INSERT string and one commit per sample into a table per channel."""
+    sqlcmd = "INSERT INTO {tn} VALUES ({t}, {v});".format(tn=table_name, t=t, v=value)
+    db_con.execute(sqlcmd)
+    db_con.commit()
+
+
+def channel_refs(channels):
+    return [{'adapter': 'BenchmarkAdapter', 'variable': f"Channel{i}"} for i in range(channels)]
+
+
+def bench_ingest(args):
+    refs = channel_refs(args.channels)
+    samples = args.channels * args.ticks
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        db = Database(root_dir)
+        db.close()
+
+        db_con = sqlite3.connect(os.path.join(root_dir, 'data', 'data.db'))
+        for ref in refs:
+            db_con.execute("CREATE TABLE {tn} (time REAL, value REAL);".format(tn=ref['adapter'] + '__' + ref['variable']))
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            t = time.time_ns()
+            for ref in refs:
+                legacy_save(db_con, ref['adapter'] + '__' + ref['variable'], t, float(tick))
+        legacy = samples / (time.perf_counter() - start)
+        db_con.close()
+
+        db = Database(root_dir, batch_size=args.batch_size, flush_interval=args.flush_interval)
+        for ref in refs:
+            db.create_channel(ref, 'double')
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            t = time.time_ns()
+            for ref in refs:
+                db.save(ref, t, float(tick))
+        db.flush()
+        batched = samples / (time.perf_counter() - start)
+        db.close()
+
+    print(f"ingest of {samples} samples ({args.channels} channels x {args.ticks} ticks)")
+    print(f"  per-row commit: {legacy:12.0f} samples/s")
+    print(f"  batched:        {batched:12.0f} samples/s (batch_size={args.batch_size}, flush_interval={args.flush_interval} s)")
+
+
+def insert_rates(db_con, channel_ids, rows, t0):
+    """Inserts rows samples per variant in one transaction each, executed by the DatabaseWriter.
+
+    Returns the rates in samples/s of SQL built with str.format (the former Database.save()),
+    a cached parameterized statement executed per row and executemany (the flush windows).
+    """
+    samples = [(channel_ids[i % len(channel_ids)], t0 + i, "it's a \"quoted\" string") for i in range(rows)]
+    rates = []
+    for variant in range(3):
+        db_con.execute("DELETE FROM samples;")
+        db_con.commit()
+        start = time.perf_counter()
+        if variant == 0:
+            for channel_id, t, value in samples:
+                db_con.execute("INSERT OR REPLACE INTO samples VALUES ({c}, {t}, '{v}');".format(c=channel_id, t=t, v=value.replace("'", "''")))
+        elif variant == 1:
+            for sample in samples:
+                db_con.execute("INSERT OR REPLACE INTO samples VALUES (?, ?, ?);", sample)
+        else:
+            db_con.executemany("INSERT OR REPLACE INTO samples VALUES (?, ?, ?);", samples)
+        db_con.commit()
+        rates.append(rows / (time.perf_counter() - start))
+    return rates
+
+
+def bench_insert(args):
+    refs = channel_refs(args.channels)
+    with tempfile.TemporaryDirectory() as root_dir:
+        db = Database(root_dir)
+        for ref in refs:
+            db.create_channel(ref, 'string')
+        channel_ids = [db.channel_ids[(ref['adapter'], ref['variable'])] for ref in refs]
+        formatted, parameterized, batched = db.writer.ask(insert_rates, channel_ids, args.rows, time.time_ns())
+
+        # the caller side of the hot path: resolving the channel and queuing the sample
+        start = time.perf_counter()
+        for i in range(args.rows):
+            db.save(refs[i % len(refs)], i, "it's a \"quoted\" string")
+        save_call = (time.perf_counter() - start) / args.rows * 1_000_000
+        db.close()
+
+    print(f"insert of {args.rows} string samples into {args.channels} channels, one transaction per variant")
+    print(f"  str.format per row:     {formatted:12.0f} samples/s")
+    print(f"  parameterized per row:  {parameterized:12.0f} samples/s")
+    print(f"  parameterized batch:    {batched:12.0f} samples/s")
+    print(f"  Database.save() call:   {save_call:12.2f} us")
+
+
+def fill_samples(db_con, channel_id, rows, t0):
+    """Writes rows samples with a period of 1 s into the samples table, executed by the DatabaseWriter."""
+    db_con.executemany("INSERT INTO samples VALUES (?, ?, ?);", ((channel_id, t0 + i * 1_000_000_000, float(i)) for i in range(rows)))
+    db_con.commit()
+
+
+def fill_heap_table(db_con, rows, t0):
+    """Writes rows samples into a table of the layout before the time index, which every query has to scan completely."""
+    db_con.execute("CREATE TABLE BenchmarkAdapter__Heap (time REAL, value REAL);")
+    db_con.executemany("INSERT INTO BenchmarkAdapter__Heap VALUES (?, ?);", ((t0 + i * 1_000_000_000, float(i)) for i in range(rows)))
+    db_con.commit()
+
+
+def query_latency(query, rows, t0, window, repeats):
+    """Returns the median latency in ms of query(begin, end) for random windows of the given length in seconds."""
+    latencies = []
+    for _ in range(repeats):
+        begin = t0 + random.randrange(max(1, rows - window)) * 1_000_000_000
+        start = time.perf_counter()
+        query(begin, begin + window * 1_000_000_000)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def bench_query(args):
+    t0 = time.time_ns()
+    print(f"median latency of get_time_series() for a {args.window} s window of 1 s samples")
+    print(f"  {'rows':>12} {'time-keyed':>12} {'heap table':>12}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as root_dir:
+            db = Database(root_dir)
+            ref = {'adapter': 'BenchmarkAdapter', 'variable': 'Keyed'}
+            db.create_channel(ref, 'double')
+            db.writer.ask(fill_samples, db.channel_ids[('BenchmarkAdapter', 'Keyed')], rows, t0)
+            keyed = query_latency(lambda begin, end: db.get_time_series('BenchmarkAdapter', 'Keyed', begin, end), rows, t0, args.window, args.repeats)
+            heap = float('nan')
+            if not args.skip_heap:
+                db.writer.ask(fill_heap_table, rows, t0)
+
+                def heap_query(begin, end):
+                    with db.readers.connection() as db_con:
+                        return db_con.execute("SELECT * FROM BenchmarkAdapter__Heap WHERE time>=? AND time<?;", (begin, end)).fetchall()
+
+                heap = query_latency(heap_query, rows, t0, args.window, args.repeats)
+            db.close()
+        print(f"  {rows:>12} {keyed:>9.3f} ms {heap:>9.3f} ms")
+
+
+def fill_simulated(db_con, double_id, int64_id, samples, t0, jitter):
+    """Writes 1 s samples of a noisy workload (double) and a seconds counter (int64), like the XML RPC test device."""
+    rng = random.Random(0)
+    times = [t0 + i * 1_000_000_000 + rng.randint(-jitter, jitter) for i in range(samples)]
+    db_con.executemany("INSERT INTO samples VALUES (?, ?, ?);", ((double_id, t, round(4 * math.sin(t / 1e10) + rng.uniform(-0.8, 0.8), 3)) for t in times))
+    db_con.executemany("INSERT INTO samples VALUES (?, ?, ?);", ((int64_id, t, t // 1_000_000_000) for t in times))
+    db_con.commit()
+
+
+def used_bytes(db_con):
+    """Size of the database file without free pages, executed by the DatabaseWriter."""
+    db_con.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    page_count = db_con.execute("PRAGMA page_count;").fetchone()[0]
+    freelist_count = db_con.execute("PRAGMA freelist_count;").fetchone()[0]
+    page_size = db_con.execute("PRAGMA page_size;").fetchone()[0]
+    return (page_count - freelist_count) * page_size
+
+
+def scan(db, samples):
+    """Returns the scan throughput in samples/s of both channels over the whole time range."""
+    refs = [{'adapter': 'BenchmarkAdapter', 'variable': 'Workload'}, {'adapter': 'BenchmarkAdapter', 'variable': 'Counter'}]
+    start = time.perf_counter()
+    time_series_list = db.get_time_series_list(refs, 0, 2**62)
+    duration = time.perf_counter() - start
+    assert all(len(time_series) == samples for time_series in time_series_list)
+    return 2 * samples / duration
+
+
+def bench_compression(args):
+    samples = int(args.days * 86400)
+    t0 = time.time_ns() // 86400_000_000_000 * 86400_000_000_000 - samples * 1_000_000_000
+    with tempfile.TemporaryDirectory() as root_dir:
+        # sealing is started explicitly below
+        db = Database(root_dir, chunk_interval=args.chunk_interval, seal_interval=86400 * 365)
+        db.create_channel({'adapter': 'BenchmarkAdapter', 'variable': 'Workload'}, 'double')
+        db.create_channel({'adapter': 'BenchmarkAdapter', 'variable': 'Counter'}, 'int64')
+        double_id = db.channel_ids[('BenchmarkAdapter', 'Workload')]
+        int64_id = db.channel_ids[('BenchmarkAdapter', 'Counter')]
+        db.writer.ask(fill_simulated, double_id, int64_id, samples, t0, args.jitter)
+
+        head_bytes = db.writer.ask(used_bytes)
+        head_scan = scan(db, samples)
+        start = time.perf_counter()
+        chunks = db.seal(horizon=2**62)
+        seal_rate = 2 * samples / (time.perf_counter() - start)
+        chunk_bytes = db.writer.ask(used_bytes)
+        chunk_scan = scan(db, samples)
+        with db.readers.connection() as db_con:
+            per_channel = dict((channel_id, size) for channel_id, size in db_con.execute("SELECT channel, sum(length(data)) FROM chunks GROUP BY channel;"))
+        db.close()
+
+    print(f"{args.days} days of 1 s samples (time stamp jitter +-{args.jitter} ns) of a double and an int64 channel, {chunks} chunks of {args.chunk_interval} s")
+    print(f"  samples table: {head_bytes / (2 * samples):8.2f} bytes/sample, scan {head_scan:12.0f} samples/s")
+    print(f"  chunks:        {chunk_bytes / (2 * samples):8.2f} bytes/sample, scan {chunk_scan:12.0f} samples/s, sealing {seal_rate:.0f} samples/s")
+    print(f"  compression ratio: {head_bytes / chunk_bytes:.1f} (double: {per_channel[double_id] / samples:.2f} bytes/sample, int64: {per_channel[int64_id] / samples:.2f} bytes/sample)")
+
+
+def bench_backends(args):
+    refs = channel_refs(args.channels)
+    samples = args.channels * args.ticks
+    t0 = time.time_ns() - args.ticks * 1_000_000_000
+    print(f"{samples} samples ({args.channels} channels x {args.ticks} ticks of 1 s) per storage backend")
+    print(f"  {'backend':>8} {'ingest':>16} {'range scan':>12} {'aggregate':>12} {'latest':>12}")
+    for backend in args.backends:
+        with tempfile.TemporaryDirectory() as root_dir:
+            db = get_database(root_dir, {'backend': backend, 'capacity': args.ticks})
+            db.create_channels([(ref, 'double') for ref in refs])
+            start = time.perf_counter()
+            for tick in range(args.ticks):
+                for ref in refs:
+                    db.save(ref, t0 + tick * 1_000_000_000, float(tick))
+            db.flush()
+            ingest = samples / (time.perf_counter() - start)
+            scan = query_latency(lambda begin, end: db.get_columns_list(refs[:10], begin, end), args.ticks, t0, args.window, args.repeats)
+            aggregate = query_latency(lambda begin, end: db.get_aggregated_list(refs[:10], begin, end, 60_000_000_000, ['min', 'max', 'avg']),
+                                      args.ticks, t0, args.window, args.repeats)
+            latest = query_latency(lambda begin, end: db.get_latest_list(refs), args.ticks, t0, args.window, args.repeats)
+            db.close()
+        print(f"  {backend:>8} {ingest:>10.0f} smp/s {scan:>9.3f} ms {aggregate:>9.3f} ms {latest:>9.3f} ms")
+
+
+class StandInClient(ehs.Client):
+    """A device, of which every address holds a double value, without I/O."""
+
+    def connect(self) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+    def read(self, address: str) -> float:
+        return 1.5
+
+    def write(self, address: str, value) -> None:
+        pass
+
+    def get_configuration(self) -> dict:
+        return {}
+
+
+def bench_reads(args):
+    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=10))
+    DataSourceAdapter_pb2_grpc.add_DataSourceAdapterServicer_to_server(ehs.AdapterGRPCInterface(StandInClient()), server)
+    # without TLS, which only adds to the cost of each round trip
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    proxy = DataSourceAdapter_pb2_grpc.DataSourceAdapterStub(grpc.insecure_channel(f"127.0.0.1:{port}"))
+    addresses = [f"Channel{i}" for i in range(args.channels)]
+    read_requests = [DataSourceAdapter_pb2.ReadRequest(address=address) for address in addresses]
+    read_many_request = DataSourceAdapter_pb2.ReadManyRequest(addresses=addresses)
+    proxy.read_many(read_many_request)
+
+    def tick_latency(tick):
+        latencies = []
+        for _ in range(args.ticks):
+            start = time.perf_counter()
+            tick()
+            latencies.append((time.perf_counter() - start) * 1000)
+        return statistics.median(latencies)
+
+    single = tick_latency(lambda: [proxy.read(request) for request in read_requests])
+    many = tick_latency(lambda: proxy.read_many(read_many_request))
+    server.stop(None)
+
+    print(f"median latency of a tick reading {args.channels} channels of a stand-in adapter on localhost")
+    print(f"  read per channel: {single:9.3f} ms")
+    print(f"  read_many:        {many:9.3f} ms ({single / many:.1f} times faster)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the storage layer of the EHS.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Write throughput of per-row commits versus batched flush windows.")
+    ingest.add_argument("--channels", type=int, default=300)
+    ingest.add_argument("--ticks", type=int, default=20)
+    ingest.add_argument("--batch-size", type=int, default=1000)
+    ingest.add_argument("--flush-interval", type=float, default=1.0)
+    ingest.set_defaults(func=bench_ingest)
+
+    insert = subparsers.add_parser("insert", help="Micro-benchmark of the insert hot path.")
+    insert.add_argument("--channels", type=int, default=300)
+    insert.add_argument("--rows", type=int, default=100_000)
+    insert.set_defaults(func=bench_insert)
+
+    query = subparsers.add_parser("query", help="Range query latency for growing channel tables.")
+    query.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000],
+                       help="Table sizes to measure, e.g. --rows 100000 1000000 10000000 100000000")
+    query.add_argument("--window", type=int, default=600, help="Length of the queried time range in seconds.")
+    query.add_argument("--repeats", type=int, default=50)
+    query.add_argument("--skip-heap", action="store_true", help="Don't measure the former table layout, which is slow for large tables.")
+    query.set_defaults(func=bench_query)
+
+    compression = subparsers.add_parser("compression", help="Compression ratio and scan throughput of sealed chunks.")
+    compression.add_argument("--days", type=float, default=7, help="Simulated time range, e.g. --days 365 for a year.")
+    compression.add_argument("--jitter", type=int, default=100_000, help="Maximum deviation of the time stamps from the 1 s period in ns.")
+    compression.add_argument("--chunk-interval", type=float, default=3600.0)
+    compression.set_defaults(func=bench_compression)
+
+    backends = subparsers.add_parser("backends", help="Ingest, range scan of 10 channels, aggregation and latest values of all channels per storage backend.")
+    backends.add_argument("--backends", nargs="+", default=["sqlite", "memory"])
+    backends.add_argument("--channels", type=int, default=100)
+    backends.add_argument("--ticks", type=int, default=3600)
+    backends.add_argument("--window", type=int, default=600, help="Length of the queried time range in seconds.")
+    backends.add_argument("--repeats", type=int, default=20)
+    backends.set_defaults(func=bench_backends)
+
+    reads = subparsers.add_parser("reads", help="Tick latency of a read request per channel versus one read_many request per adapter.")
+    reads.add_argument("--channels", type=int, default=200)
+    reads.add_argument("--ticks", type=int, default=50)
+    reads.set_defaults(func=bench_reads)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
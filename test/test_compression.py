@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""Round trips of the chunk codecs of ehs.compression, run with pytest."""
+
+
+import math
+import random
+import struct
+
+import pytest
+
+from ehs import compression
+
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+T0 = 1_700_000_000_000_000_000
+
+
+def jittered_times(count, period=1_000_000_000, jitter=1_000_000, seed=1):
+    rng = random.Random(seed)
+    return [T0 + i * period + rng.randint(-jitter, jitter) for i in range(count)]
+
+
+def double_bits(values):
+    """Compares doubles bit by bit, so NaN equals NaN and -0.0 differs from 0.0."""
+    return [struct.pack('<d', value) for value in values]
+
+
+def round_trip(channel_type, times, values):
+    decoded_times, decoded_values = compression.decode_chunk(channel_type, compression.encode_chunk(channel_type, times, values))
+    assert decoded_times == times
+    return decoded_values
+
+
+VALUES = {
+    'double': [0.0, -0.0, 1.5, -2.25, math.pi, 1e-308, 5e-324, 1.7976931348623157e308, -1.7976931348623157e308, math.inf, -math.inf, math.nan, 0.1, 0.1],
+    'int64': [0, 1, -1, INT64_MAX, INT64_MIN, INT64_MAX, 0, INT64_MIN, INT64_MIN + 1, INT64_MAX - 1, 42, 42, 42, -7],
+    'bool': [True, True, False, True, False, False, False, True, True, True, True, False, True, False],
+    'string': ["", "a", "", "", "ä€😀", "a", "x" * 1000, "", "line\nbreak", "\x00", "a", "a", "b", ""],
+}
+
+
+def test_every_compressible_type_has_cases():
+    assert set(VALUES) == set(compression.COMPRESSIBLE_TYPES)
+
+
+@pytest.mark.parametrize('channel_type', compression.COMPRESSIBLE_TYPES)
+def test_round_trip(channel_type):
+    values = VALUES[channel_type]
+    decoded = round_trip(channel_type, jittered_times(len(values)), values)
+    if channel_type == 'double':
+        assert double_bits(decoded) == double_bits(values)
+    else:
+        assert decoded == values
+
+
+@pytest.mark.parametrize('channel_type', compression.COMPRESSIBLE_TYPES)
+def test_single_sample(channel_type):
+    for value in VALUES[channel_type]:
+        decoded = round_trip(channel_type, [T0], [value])
+        if channel_type == 'double':
+            assert double_bits(decoded) == double_bits([value])
+        else:
+            assert decoded == [value]
+
+
+@pytest.mark.parametrize('channel_type', compression.COMPRESSIBLE_TYPES)
+def test_empty_chunk(channel_type):
+    assert round_trip(channel_type, [], []) == []
+
+
+@pytest.mark.parametrize('channel_type', compression.COMPRESSIBLE_TYPES)
+def test_long_random_chunk(channel_type):
+    rng = random.Random(channel_type)
+    count = 5000
+    if channel_type == 'double':
+        values = [rng.choice([rng.gauss(20.0, 5.0), round(rng.uniform(0, 100), 1), math.nan, math.inf, -math.inf]) for _ in range(count)]
+    elif channel_type == 'int64':
+        values = [rng.choice([rng.randint(INT64_MIN, INT64_MAX), rng.randint(-1000, 1000), INT64_MIN, INT64_MAX]) for _ in range(count)]
+    elif channel_type == 'bool':
+        values = [rng.random() < 0.1 for _ in range(count)]
+    else:
+        values = [rng.choice(["", "idle", "running", "error", "ä€"]) for _ in range(count)]
+    decoded = round_trip(channel_type, jittered_times(count, jitter=100_000_000, seed=count), values)
+    if channel_type == 'double':
+        assert double_bits(decoded) == double_bits(values)
+    else:
+        assert decoded == values
+
+
+@pytest.mark.parametrize('times', [
+    [0],
+    [INT64_MIN],
+    [INT64_MAX],
+    [INT64_MIN, INT64_MAX],
+    [INT64_MIN, 0, INT64_MAX],
+    [-5_000_000_000, -1, 0, 1, 5_000_000_000],
+    [T0, T0 + 1, T0 + 2, T0 + 3, T0 + 3_600_000_000_000, T0 + 3_600_000_000_001],
+])
+def test_time_stamps(times):
+    assert round_trip('int64', times, list(range(len(times)))) == list(range(len(times)))
+
+
+def test_unknown_type():
+    with pytest.raises(ValueError):
+        compression.encode_chunk('bytes', [T0], [b""])
+    with pytest.raises(ValueError):
+        compression.decode_chunk('bytes', compression.encode_chunk('int64', [T0], [0]))
@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+
+"""Behaviour of the SQLite storage backend ehs.database.Database, run with pytest."""
+
+
+import os
+import random
+import sqlite3
+import time
+
+import numpy
+import pytest
+
+from ehs.database import SCHEMA_VERSION, Database, aggregate_columns, next_sample_time, query_samples, reset_wal
+from ehs.memory import MemoryStorage
+from ehs.storage import convert_value
+
+
+MINUTE = 60_000_000_000
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+T0 = 1_699_999_200_000_000_000  # a midnight, so that hours and days are aligned
+CLOCK = 1_700_000_000_000_000_000  # int64 values, of which the squares overflow INTEGER
+AGGREGATES = ['min', 'max', 'avg', 'sum', 'count', 'first', 'last', 'stddev']
+
+DOUBLE = {'adapter': 'Adapter', 'variable': 'temperature'}
+INT64 = {'adapter': 'Adapter', 'variable': 'counter'}
+CLOCK_REF = {'adapter': 'Adapter', 'variable': 'clock'}
+BOOL = {'adapter': 'Adapter', 'variable': 'running'}
+STRING = {'adapter': 'Adapter', 'variable': 'state'}
+
+
+def open_database(root_dir, **kwargs):
+    """Opens a database with 1 minute and 1 hour rollups, of which the background threads only run on demand."""
+    kwargs.setdefault('rollups', (60.0, 3600.0))
+    kwargs.setdefault('chunk_interval', 3600.0)
+    return Database(str(root_dir), flush_interval=0.01, seal_interval=1e6,
+                    retention_interval=1e6, maintenance_interval=1e6, **kwargs)
+
+
+def assert_aggregates_equal(rolled_up, raw, exact_stddev=True):
+    assert [bucket[0] for bucket in rolled_up] == [bucket[0] for bucket in raw]
+    for (begin, rolled_up_values), (_, raw_values) in zip(rolled_up, raw):
+        for aggregate, rolled_up_value, raw_value in zip(AGGREGATES, rolled_up_values, raw_values):
+            if aggregate == 'stddev' and not exact_stddev:
+                continue
+            assert rolled_up_value == pytest.approx(raw_value, rel=1e-9, abs=1e-6), (begin, aggregate)
+
+
+def assert_rollups_match_samples(db, channel_refs, begin, end, bucket_width, exact_stddev=True):
+    """Compares the aggregates combined from the rollups with the ones of the raw samples."""
+    assert db.select_aligned_rollup(begin, end, bucket_width) is not None
+    rolled_up_list = db.get_aggregated_list(channel_refs, begin, end, bucket_width, AGGREGATES)
+    for channel_ref, rolled_up, (times, values) in zip(channel_refs, rolled_up_list, db.get_columns_list(channel_refs, begin, end)):
+        assert len(times) > 0, channel_ref
+        assert_aggregates_equal(rolled_up, aggregate_columns(times, values, begin, bucket_width, AGGREGATES), exact_stddev)
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = open_database(tmp_path)
+    database.backfiller.join()
+    database.create_channels([(DOUBLE, 'double'), (INT64, 'int64'), (CLOCK_REF, 'int64'), (BOOL, 'bool'), (STRING, 'string')])
+    yield database
+    database.close()
+
+
+def test_rollups_match_samples(db):
+    rng = random.Random(7)
+    for minute in range(3 * 60):
+        for second in range(0, 60, 7):
+            t = T0 + minute * MINUTE + second * 1_000_000_000
+            db.save(DOUBLE, t, rng.gauss(20.0, 5.0))
+            db.save(INT64, t, rng.randint(-1000, 1000))
+            db.save(CLOCK_REF, t, CLOCK + t - T0)
+            db.save(BOOL, t, rng.random() < 0.3)
+            db.save(STRING, t, "idle")
+        if minute % 20 == 0:
+            db.flush()
+    db.flush()
+
+    assert_rollups_match_samples(db, [DOUBLE, INT64, BOOL], T0, T0 + 3 * HOUR, MINUTE)
+    assert_rollups_match_samples(db, [DOUBLE, INT64, BOOL], T0, T0 + 3 * HOUR, HOUR)
+    assert_rollups_match_samples(db, [DOUBLE, INT64, BOOL], T0, T0 + 3 * HOUR, 3 * HOUR)
+    # the squares of the clock are summed as floats, so only its standard deviation is approximate
+    assert_rollups_match_samples(db, [CLOCK_REF], T0, T0 + 3 * HOUR, HOUR, exact_stddev=False)
+
+
+def test_rollups_of_replaced_samples(db):
+    for minute in range(2 * 60):
+        for second in range(0, 60, 10):
+            t = T0 + minute * MINUTE + second * 1_000_000_000
+            db.save(DOUBLE, t, float(minute))
+            db.save(INT64, t, minute)
+    db.flush()
+    assert db.seal(horizon=T0 + HOUR) == 2
+
+    # replace samples of the sealed hour, of the open one and within the same flush window
+    for t, value in [(T0 + 10 * MINUTE, -100.0), (T0 + 59 * MINUTE + 50_000_000_000, 1000.0), (T0 + 90 * MINUTE, 5.5)]:
+        db.save(DOUBLE, t, value)
+        db.save(INT64, t, int(value))
+    db.save(DOUBLE, T0 + 90 * MINUTE, 7.5)
+    db.save(INT64, T0 + 90 * MINUTE, 7)
+    db.flush()
+    # a sample later than the latest one, which doesn't replace any
+    db.save(DOUBLE, T0 + 2 * HOUR - 1, 0.25)
+    db.save(INT64, T0 + 2 * HOUR - 1, 3)
+    db.flush()
+
+    time_series = db.get_time_series_list([DOUBLE], T0 + 90 * MINUTE, T0 + 90 * MINUTE + 1)[0]
+    assert time_series == [(T0 + 90 * MINUTE, 7.5)]
+    assert_rollups_match_samples(db, [DOUBLE, INT64], T0, T0 + 2 * HOUR, MINUTE)
+    assert_rollups_match_samples(db, [DOUBLE, INT64], T0, T0 + 2 * HOUR, HOUR)
+
+
+def test_nan_is_not_rolled_up(db, caplog):
+    for minute in range(2 * 60):
+        t = T0 + minute * MINUTE
+        db.save(DOUBLE, t, float('nan') if minute % 3 == 0 else float(minute))
+        db.save(DOUBLE, t + 1, float('nan'))
+    db.flush()
+    assert not [record for record in caplog.records if record.levelname == 'ERROR']
+    assert_rollups_match_samples(db, [DOUBLE], T0, T0 + 2 * HOUR, MINUTE)
+    assert_rollups_match_samples(db, [DOUBLE], T0, T0 + 2 * HOUR, HOUR)
+
+
+def test_failed_window_keeps_the_latest_times(db):
+    channel_id = db.resolve_channel(DOUBLE)
+    for minute in range(10):
+        db.save(DOUBLE, T0 + minute * MINUTE, float(minute))
+    db.flush()
+    assert db.writer.latest_times[channel_id] == T0 + 9 * MINUTE
+
+    # a value, which isn't a number, fails the window of the channel, while other channels are written
+    db.save(DOUBLE, T0 + HOUR, "not a number")
+    db.save(INT64, T0 + HOUR, 1)
+    db.flush()
+    assert db.writer.latest_times[channel_id] == T0 + 9 * MINUTE
+    assert db.get_time_series_list([DOUBLE, INT64], T0 + HOUR, T0 + 2 * HOUR) == [[], [(T0 + HOUR, 1)]]
+
+    db.save(DOUBLE, T0 + 30 * MINUTE, 30.0)
+    db.flush()
+    assert db.writer.latest_times[channel_id] == T0 + 30 * MINUTE
+    assert_rollups_match_samples(db, [DOUBLE], T0, T0 + HOUR, MINUTE)
+
+
+def test_imported_samples_are_rolled_up(db):
+    times = [T0 + i * 30_000_000_000 for i in range(2 * 24 * 120)]
+    importer = db.importer(batch_size=1000)
+    importer.add(DOUBLE, 'double', times, [float(i % 17) for i in range(len(times))])
+    importer.add(INT64, 'int64', times, [None if i % 5 == 0 else i for i in range(len(times))])
+    assert importer.close() == len(times) + len(times) * 4 // 5
+    assert_rollups_match_samples(db, [DOUBLE, INT64], T0, T0 + 2 * DAY, HOUR)
+    assert_rollups_match_samples(db, [DOUBLE, INT64], T0, T0 + 2 * DAY, DAY)
+
+
+def test_channels_without_numbers_have_no_aggregates(db):
+    memory = MemoryStorage()
+    try:
+        memory.create_channels([(DOUBLE, 'double'), (STRING, 'string')])
+        for storage in db, memory:
+            for minute in range(10):
+                storage.save(DOUBLE, T0 + minute * MINUTE, float(minute))
+                storage.save(STRING, T0 + minute * MINUTE, "idle")
+            storage.flush()
+            unknown = {'adapter': 'Adapter', 'variable': 'unknown'}
+            # aligned to a rollup and not
+            for begin, count in (T0, 10.0), (T0 + 1, 9.0):
+                aggregated_list = storage.get_aggregated_list([STRING, DOUBLE, unknown], begin, begin + HOUR, HOUR, ['count', 'sum'])
+                assert aggregated_list == [[], [(begin, [count, 45.0])], []]
+    finally:
+        memory.close()
+
+
+def test_columns_equal_the_time_series(db):
+    refs = [DOUBLE, INT64, BOOL, STRING]
+    for minute in range(2 * 60):
+        t = T0 + minute * MINUTE
+        db.save(DOUBLE, t, None if minute % 7 == 0 else minute / 4)
+        db.save(INT64, t, CLOCK + minute)
+        db.save(BOOL, t, minute % 3 == 0)
+        db.save(STRING, t, None if minute % 5 == 0 else f"state {minute % 4}")
+    db.flush()
+    assert db.seal(horizon=T0 + HOUR) == 4
+    # a sealed sample is replaced by a later one of the same time stamp
+    db.save(DOUBLE, T0 + MINUTE, -1.0)
+    db.flush()
+
+    for begin, end in (T0, T0 + 2 * HOUR), (T0 + 30 * MINUTE + 1, T0 + 90 * MINUTE), (T0 - HOUR, T0):
+        for channel_ref, time_series, (times, values) in zip(refs, db.get_time_series_list(refs, begin, end), db.get_columns_list(refs, begin, end)):
+            time_series = [(t, value) for t, value in time_series if value is not None]
+            assert times.dtype == numpy.int64
+            assert times.tolist() == [t for t, value in time_series], channel_ref
+            assert [bool(value) if channel_ref is BOOL else value for value in values.tolist()] == \
+                [bool(value) if channel_ref is BOOL else value for t, value in time_series], channel_ref
+    assert db.get_columns_list([DOUBLE], T0 + MINUTE, T0 + MINUTE + 1)[0][1].tolist() == [-1.0]
+
+
+def create_legacy_database(root_dir, tables):
+    """Creates a database of the EHS before schema versions, with a (time REAL, value) table per channel and nanosecond time stamps."""
+    data_dir = os.path.join(root_dir, 'data')
+    os.makedirs(data_dir)
+    db_con = sqlite3.connect(os.path.join(data_dir, 'data.db'))
+    for table_name, (value_type, samples) in tables.items():
+        db_con.execute(f"CREATE TABLE {table_name} (time REAL, value {value_type});")
+        db_con.executemany(f"INSERT INTO {table_name} VALUES (?, ?);", [(float(t), value) for t, value in samples])
+    db_con.commit()
+    db_con.close()
+
+
+def test_migration_of_legacy_database(tmp_path):
+    times = [T0 + i * MINUTE for i in range(3 * 60)]
+    doubles = [(t, 20.0 + i % 13 / 4) for i, t in enumerate(times)]
+    integers = [(t, i * i) for i, t in enumerate(times)]
+    strings = [(t, ["idle", "running", ""][i % 3]) for i, t in enumerate(times)]
+    create_legacy_database(tmp_path, {'Adapter__temperature': ('REAL', doubles), 'Adapter__counter': ('INTEGER', integers),
+                                      'Adapter__state': ('TEXT', strings)})
+
+    db = open_database(tmp_path)
+    try:
+        db.backfiller.join()
+        with db.readers.connection() as db_con:
+            assert db_con.execute("PRAGMA user_version;").fetchone()[0] == SCHEMA_VERSION
+        assert db.complete_rollups_ns == [MINUTE, HOUR]
+        assert db.get_time_series_list([DOUBLE, INT64, STRING], T0, T0 + 3 * HOUR) == [doubles, integers, strings]
+        assert_rollups_match_samples(db, [DOUBLE, INT64], T0, T0 + 3 * HOUR, HOUR)
+
+        # the channels continue after the migrated samples
+        db.create_channels([(DOUBLE, 'double'), (INT64, 'int64'), (STRING, 'string')])
+        db.save(DOUBLE, T0 + 3 * HOUR, 1.0)
+        db.save(INT64, T0 + 3 * HOUR, 1)
+        db.flush()
+        assert_rollups_match_samples(db, [DOUBLE, INT64], T0, T0 + 4 * HOUR, HOUR)
+    finally:
+        db.close()
+
+    # a resolution added later is backfilled, a removed one dropped
+    db = open_database(tmp_path, rollups=(3600.0, 86400.0))
+    try:
+        db.backfiller.join()
+        assert db.complete_rollups_ns == [HOUR, DAY]
+        assert_rollups_match_samples(db, [DOUBLE, INT64], T0, T0 + DAY, DAY)
+        with db.readers.connection() as db_con:
+            assert db_con.execute("SELECT count(*) FROM rollups WHERE resolution=?;", (MINUTE,)).fetchone()[0] == 0
+    finally:
+        db.close()
+
+
+def count_steps(db_con, function, *args):
+    """Returns the virtual machine instructions of SQLite, which function(*args) executes with db_con."""
+    steps = [0]
+
+    def step():
+        steps[0] += 1
+
+    db_con.set_progress_handler(step, 1)
+    try:
+        function(*args)
+    finally:
+        db_con.set_progress_handler(None, 1)
+    return steps[0]
+
+
+def test_chunk_reads_dont_scan_the_history(db):
+    hours = 2000
+    times = [T0 + hour * HOUR + offset for hour in range(hours) for offset in (0, 30 * MINUTE)]
+    importer = db.importer()
+    importer.add(DOUBLE, 'double', times, [float(i) for i in range(len(times))])
+    importer.close()
+    assert db.seal(horizon=T0 + hours * HOUR) == hours
+
+    channel_id = db.resolve_channel(DOUBLE)
+    first = T0 + 20 * MINUTE
+    last = T0 + (hours - 1) * HOUR + 20 * MINUTE
+    with db.readers.connection() as db_con:
+        first_steps = count_steps(db_con, query_samples, db_con, db.channel_types, [channel_id], first, first + 10 * MINUTE, db.chunk_width_ns)
+        last_steps = count_steps(db_con, query_samples, db_con, db.channel_types, [channel_id], last, last + 10 * MINUTE, db.chunk_width_ns)
+        assert last_steps < 2 * first_steps
+        first_steps = count_steps(db_con, next_sample_time, db_con, channel_id, first, db.chunk_width_ns)
+        last_steps = count_steps(db_con, next_sample_time, db_con, channel_id, last, db.chunk_width_ns)
+        assert last_steps < 2 * first_steps
+        # within a chunk, the time stamp itself is the earliest possible one
+        assert next_sample_time(db_con, channel_id, last, db.chunk_width_ns) == last
+    assert db.get_time_series_list([DOUBLE], last, last + 20 * MINUTE) == [[(last + 10 * MINUTE, float(len(times) - 1))]]
+
+
+def test_chunks_of_a_longer_chunk_interval_are_read(tmp_path):
+    db = open_database(tmp_path, chunk_interval=4 * 3600.0)
+    try:
+        db.create_channels([(DOUBLE, 'double')])
+        for minute in range(0, 8 * 60, 10):
+            db.save(DOUBLE, T0 + minute * MINUTE, float(minute))
+        db.flush()
+        assert db.seal(horizon=T0 + 8 * HOUR) == 2
+    finally:
+        db.close()
+
+    db = open_database(tmp_path)
+    try:
+        assert db.chunk_width_ns == 4 * HOUR
+        assert db.get_time_series_list([DOUBLE], T0 + 3 * HOUR, T0 + 3 * HOUR + 1) == [[(T0 + 3 * HOUR, 180.0)]]
+        assert db.next_time(DOUBLE, T0 + 3 * HOUR + 1) is not None
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize('previous_type, channel_type, values, expected', [
+    ('double', 'int64', [1.0, 2.5, -3.0, float('inf'), 1e300], [1, -3]),
+    ('int64', 'double', [1, -2, 2 ** 53], [1.0, -2.0, 2.0 ** 53]),
+    ('int64', 'bool', [0, 1, 2, 1], [False, True, True]),
+    ('bool', 'int64', [True, False], [1, 0]),
+    ('double', 'string', [1.5, 2.0], []),
+    ('string', 'double', ["1.5", ""], []),
+])
+def test_type_change_converts_the_samples(tmp_path, previous_type, channel_type, values, expected):
+    # every sample is saved twice, into a sealed hour and into the open one
+    times = [T0 + i * MINUTE for i in range(len(values))] + [T0 + HOUR + i * MINUTE for i in range(len(values))]
+    db = open_database(tmp_path)
+    memory = MemoryStorage()
+    try:
+        for storage in db, memory:
+            storage.create_channels([(DOUBLE, previous_type)])
+            for t, value in zip(times, values + values):
+                storage.save(DOUBLE, t, value)
+            storage.flush()
+        assert db.seal(horizon=T0 + HOUR) == 1
+
+        for storage in db, memory:
+            storage.create_channels([(DOUBLE, channel_type)])
+        kept = [t for t, value in zip(times, values + values) if convert_value(value, channel_type) is not None]
+        assert [t for t, value in db.get_time_series_list([DOUBLE], T0, T0 + 2 * HOUR)[0]] == kept
+        assert [value for t, value in db.get_time_series_list([DOUBLE], T0, T0 + 2 * HOUR)[0]] == [int(v) if channel_type == 'bool' else v for v in expected * 2]
+        assert [(t, bool(value) if channel_type == 'bool' else value) for t, value in db.get_time_series_list([DOUBLE], T0, T0 + 2 * HOUR)[0]] == \
+            memory.get_time_series_list([DOUBLE], T0, T0 + 2 * HOUR)[0]
+        if channel_type in ('double', 'int64', 'bool') and expected:
+            assert_rollups_match_samples(db, [DOUBLE], T0, T0 + 2 * HOUR, HOUR)
+        with db.readers.connection() as db_con:
+            if channel_type == 'string':
+                assert db_con.execute("SELECT count(*) FROM rollups;").fetchone()[0] == 0
+
+        # the converted channel keeps being written and sealed
+        value = {'double': 4.0, 'int64': 4, 'bool': True, 'string': "four"}[channel_type]
+        db.save(DOUBLE, T0 + 2 * HOUR, value)
+        db.flush()
+        assert db.seal(horizon=T0 + 3 * HOUR) == (2 if expected else 1)
+        assert db.get_time_series_list([DOUBLE], T0 + 2 * HOUR, T0 + 3 * HOUR)[0] == [(T0 + 2 * HOUR, int(value) if channel_type == 'bool' else value)]
+    finally:
+        db.close()
+        memory.close()
+
+
+def test_wal_reset_waits_briefly_for_readers(tmp_path):
+    db = open_database(tmp_path, checkpoint_interval=1e6, wal_size_limit=1_000_000)
+    try:
+        assert db.writer.ask(lambda db_con: db_con.execute("PRAGMA journal_size_limit;").fetchone()[0]) == 1_000_000
+        db.create_channels([(DOUBLE, 'double')])
+        for i in range(1000):
+            db.save(DOUBLE, T0 + i, float(i))
+        db.flush()
+        with db.readers.connection() as db_con:
+            # a read transaction, which keeps its snapshot in the WAL
+            db_con.execute("BEGIN;")
+            db_con.execute("SELECT count(*) FROM samples;").fetchone()
+            start = time.perf_counter()
+            assert db.writer.ask(reset_wal, db.readers, 0.05)[0] == 1
+            assert time.perf_counter() - start < 0.5
+            # neither the writer nor further readers are blocked afterwards
+            db.save(DOUBLE, T0 + 1000, 1000.0)
+            db.flush()
+            assert len(db.get_time_series_list([DOUBLE], T0, T0 + 2000)[0]) == 1001
+            db_con.execute("COMMIT;")
+        assert db.writer.ask(reset_wal, db.readers, 0.05)[0] == 0
+        assert os.path.getsize(db.data_file + "-wal") == 0
+    finally:
+        db.close()
+
+
+def test_writer_rejects_samples_after_close(tmp_path):
+    db = open_database(tmp_path)
+    db.create_channels([(DOUBLE, 'double')])
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.save(DOUBLE, T0, 1.0)
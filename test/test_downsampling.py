@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""Behaviour of the plot reductions of ehs.downsampling, run with pytest."""
+
+
+import math
+import random
+
+import numpy
+import pytest
+
+from ehs.downsampling import lttb_indexes, m4_indexes, reduce_columns
+
+
+T0 = 1_700_000_000_000_000_000
+
+
+def random_series(n, seed=1):
+    rng = random.Random(seed)
+    times = numpy.array(sorted(rng.sample(range(T0, T0 + 1000 * n * 1_000_000), n)), dtype=numpy.int64)
+    values = numpy.cumsum(numpy.array([rng.gauss(0.0, 1.0) for _ in range(n)]))
+    return times, values
+
+
+def reference_lttb(times, values, threshold):
+    """The loop of Steinarsson (2013), one sample and one candidate at a time."""
+    n = len(times)
+    x = [float(t - times[0]) for t in times]
+    y = [float(v) for v in values]
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_begin = int(math.floor((i + 1) * every)) + 1
+        avg_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        avg_x = sum(x[avg_begin:avg_end]) / (avg_end - avg_begin)
+        avg_y = sum(y[avg_begin:avg_end]) / (avg_end - avg_begin)
+        begin = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        best, best_area = begin, -1.0
+        for j in range(begin, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+@pytest.mark.parametrize('n, max_points', [(10, 3), (100, 10), (1000, 37), (5000, 500), (101, 100)])
+def test_lttb_selects_like_the_reference(n, max_points):
+    times, values = random_series(n, seed=n)
+    assert lttb_indexes(times, values, max_points).tolist() == reference_lttb(times, values, max_points)
+
+
+def test_m4_keeps_first_last_minimum_and_maximum_of_each_column():
+    times, values = random_series(10_000)
+    max_points = 400
+    indexes = m4_indexes(times, values, max_points)
+    assert len(indexes) <= max_points
+    assert indexes.tolist() == sorted(set(indexes.tolist()))
+    columns = max_points // 4
+    span = int(times[-1] - times[0]) + 1
+    by_column = {}
+    for i, t in enumerate(times.tolist()):
+        by_column.setdefault((t - int(times[0])) * columns // span, []).append(i)
+    selected = set(indexes.tolist())
+    for column_indexes in by_column.values():
+        column_values = values[column_indexes]
+        assert column_indexes[0] in selected and column_indexes[-1] in selected
+        assert values[[i for i in column_indexes if i in selected]].min() == column_values.min()
+        assert values[[i for i in column_indexes if i in selected]].max() == column_values.max()
+
+
+@pytest.mark.parametrize('reduce', [lttb_indexes, m4_indexes])
+def test_short_series_and_tiny_budgets(reduce):
+    times, values = random_series(50)
+    assert reduce(times, values, 50).tolist() == list(range(50))
+    assert reduce(times, values, 1000).tolist() == list(range(50))
+    assert reduce(times, values, 2).tolist() == [0, 49]
+    assert reduce(times, values, 1).tolist() == [0]
+    assert reduce(times, values, 0).tolist() == []
+    assert reduce(times[:1], values[:1], 3).tolist() == [0]
+    assert reduce(times[:0], values[:0], 3).tolist() == []
+
+
+@pytest.mark.parametrize('reduction', ['lttb', 'm4'])
+@pytest.mark.parametrize('dtype', [numpy.float64, numpy.int64, numpy.bool_])
+def test_reduce_columns_passes_the_samples_through(reduction, dtype):
+    times, values = random_series(2000)
+    values = (values > 0) if dtype == numpy.bool_ else values.astype(dtype)
+    reduced_times, reduced_values = reduce_columns(times, values, 100, reduction)
+    assert len(reduced_times) <= 100
+    assert reduced_values.dtype == values.dtype
+    assert reduced_times[0] == times[0] and reduced_times[-1] == times[-1]
+    positions = numpy.searchsorted(times, reduced_times)
+    assert (times[positions] == reduced_times).all() and (values[positions] == reduced_values).all()
+
+
+def test_unknown_reduction():
+    times, values = random_series(20)
+    with pytest.raises(ValueError):
+        reduce_columns(times, values, 10, 'average')
+    # a series, which fits, isn't reduced at all
+    assert reduce_columns(times, values, 20, 'average')[0] is times
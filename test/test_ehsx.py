@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""Behaviour of the gRPC servicer of the EHS ehs.ehsx.EHSGRPCInterface against an in-memory storage, run with pytest."""
+
+
+import types
+
+import numpy
+import pytest
+
+from ehs.api import Commons_pb2, ExtendedHistorianService_pb2
+from ehs.ehsx import Channel, EHSGRPCInterface, pack_columns, unpack_columns
+from ehs.memory import MemoryStorage
+
+
+MINUTE = 60_000_000_000
+T0 = 1_699_999_200_000_000_000
+
+
+def add_address(request, adapter_name, channel_name, channel_type):
+    channel_address = request.channel_addresses.add()
+    channel_address.adapter_name = adapter_name
+    channel_address.channel_name = channel_name
+    channel_address.channel_type = channel_type
+
+
+@pytest.fixture
+def servicer():
+    """A servicer of an EHS with a configured double and string channel and a string channel, which is only in the storage."""
+    storage = MemoryStorage()
+    channels = {}
+    for variable_name, channel_type, value in [('temperature', 'double', 20.5), ('state', 'string', "idle"), ('former', 'string', "on")]:
+        channel_ref = {'adapter': 'Adapter', 'variable': variable_name}
+        storage.create_channel(channel_ref, channel_type)
+        for minute in range(10):
+            storage.save(channel_ref, T0 + minute * MINUTE, value)
+        if variable_name != 'former':
+            channels[('Adapter', variable_name)] = Channel('Adapter', variable_name, channel_type, None)
+    yield EHSGRPCInterface(types.SimpleNamespace(configuration={}, channels=channels, db=storage))
+    storage.close()
+
+
+def test_aggregated_histories_of_numeric_channels(servicer):
+    request = ExtendedHistorianService_pb2.GetAggregatedHistoriesRequest(begin_inclusive=T0, end_exclusive=T0 + 10 * MINUTE, bucket_width=5 * MINUTE,
+                                                                         aggregates=['count', 'avg'])
+    add_address(request, 'Adapter', 'temperature', 'double')
+    response = servicer.get_aggregated_histories(request, None)
+    assert response.status == Commons_pb2.SUCCESS
+    assert [[(b.begin, list(b.value)) for b in buckets.value] for buckets in response.value] == [[(T0, [5.0, 20.5]), (T0 + 5 * MINUTE, [5.0, 20.5])]]
+
+
+def test_aggregated_histories_check_the_channel_types(servicer):
+    request = ExtendedHistorianService_pb2.GetAggregatedHistoriesRequest(begin_inclusive=T0, end_exclusive=T0 + 10 * MINUTE, bucket_width=10 * MINUTE,
+                                                                         aggregates=['count'])
+    add_address(request, 'Adapter', 'state', 'double')  # a configured string channel
+    add_address(request, 'Adapter', 'temperature', 'double')
+    add_address(request, 'Adapter', 'former', 'double')  # a string channel, which is only in the storage
+    add_address(request, 'Adapter', 'temperature', 'int64')
+    add_address(request, 'Adapter', 'state', 'string')
+    response = servicer.get_aggregated_histories(request, None)
+    # the numeric channel is answered, while the others have no buckets
+    assert response.status == Commons_pb2.TYPE_MISMATCH
+    assert [[(b.begin, list(b.value)) for b in buckets.value] for buckets in response.value] == [[], [(T0, [10.0])], [], [], []]
+
+
+@pytest.mark.parametrize('reduction', ['lttb', 'm4'])
+def test_histories_are_reduced_to_max_points(servicer, reduction):
+    request = ExtendedHistorianService_pb2.GetHistoriesRequest(begin_inclusive=T0, end_exclusive=T0 + 10 * MINUTE, max_points=4, reduction=reduction)
+    add_address(request, 'Adapter', 'temperature', 'double')
+    add_address(request, 'Adapter', 'state', 'string')
+    response = servicer.get_histories(request, None)
+    assert response.status == Commons_pb2.SUCCESS
+    times = [v.time for v in response.value[0].value]
+    assert len(times) <= 4 and times[0] == T0 and times[-1] == T0 + 9 * MINUTE
+    # strings aren't reduced
+    assert len(response.value[1].value) == 10
+
+
+COLUMNS = {
+    'double': [0.0, -0.0, 1.5, float('inf'), -float('inf'), float('nan'), 5e-324, 1.7976931348623157e308],
+    'int64': [0, -1, 2 ** 63 - 1, -2 ** 63, 42],
+    'bool': [True, False, False, True],
+    'string': ["", "idle", "ä€😀", "line\nbreak"],
+}
+
+
+@pytest.mark.parametrize('channel_type', list(COLUMNS))
+def test_columns_round_trip(channel_type):
+    values = COLUMNS[channel_type]
+    times = [T0 + i for i in range(len(values) - 1)] + [2 ** 63 - 1]
+    message = ExtendedHistorianService_pb2.TimeSeriesColumns()
+    pack_columns(message, channel_type, numpy.array(times, dtype=numpy.int64), numpy.array(values))
+    received = ExtendedHistorianService_pb2.TimeSeriesColumns.FromString(message.SerializeToString())
+    unpacked_times, unpacked_values = unpack_columns(received, channel_type)
+    assert unpacked_times.tolist() == times
+    if channel_type == 'double':
+        # bit by bit, so NaN equals NaN and -0.0 differs from 0.0
+        assert unpacked_values.tobytes() == numpy.array(values, dtype='<f8').tobytes()
+    else:
+        assert unpacked_values.tolist() == values
+    if channel_type != 'string':
+        assert len(received.time) == 8 * len(times) and not unpacked_values.flags.writeable
+
+
+def test_empty_and_unknown_columns():
+    message = ExtendedHistorianService_pb2.TimeSeriesColumns()
+    pack_columns(message, 'double', [], [])
+    assert [column.tolist() for column in unpack_columns(message, 'double')] == [[], []]
+    with pytest.raises(ValueError):
+        pack_columns(message, 'bytes', [T0], [b""])
+    with pytest.raises(ValueError):
+        unpack_columns(message, 'bytes')
+
+
+def test_columnar_histories_equal_the_rows(servicer):
+    servicer.ehs.db.create_channel({'adapter': 'Adapter', 'variable': 'count'}, 'int64')
+    servicer.ehs.db.save({'adapter': 'Adapter', 'variable': 'count'}, T0, 2 ** 62)
+    addresses = [('temperature', 'double'), ('state', 'string'), ('count', 'int64'), ('temperature', 'int64')]
+    responses = []
+    for columnar in False, True:
+        request = ExtendedHistorianService_pb2.GetHistoriesRequest(begin_inclusive=T0, end_exclusive=T0 + 10 * MINUTE, columnar=columnar)
+        for channel_name, channel_type in addresses:
+            add_address(request, 'Adapter', channel_name, channel_type)
+        responses.append(servicer.get_histories(request, None))
+    rows, columns = responses
+    assert rows.status == columns.status == Commons_pb2.TYPE_MISMATCH
+    assert len(columns.value) == 0 and len(columns.columns) == len(addresses)
+    for (channel_name, channel_type), time_series, message in zip(addresses, rows.value, columns.columns):
+        times, values = unpack_columns(message, channel_type)
+        assert times.tolist() == [v.time for v in time_series.value]
+        assert values.tolist() == [getattr(v.value, f"{channel_type}_value") for v in time_series.value]
+    # the channel requested with another type than configured is empty
+    assert len(rows.value[3].value) == 0
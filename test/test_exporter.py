@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""Behaviour of the bulk export of ehs.exporter into Parquet and Arrow IPC files, run with pytest."""
+
+
+import io
+import types
+
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet
+import pytest
+
+from ehs import exporter
+from ehs.api import Commons_pb2, ExtendedHistorianService_pb2
+from ehs.database import Database
+from ehs.ehsx import EHSGRPCInterface
+from ehs.memory import MemoryStorage
+
+
+T0 = 1_700_000_000_000_000_000
+MINUTE = 60_000_000_000
+DAY = 24 * 60 * MINUTE
+
+TEMPERATURE = {'adapter': 'Adapter', 'variable': 'temperature'}
+STATE = {'adapter': 'Adapter', 'variable': 'state'}
+# two runs a day apart, so the export skips the empty windows between them
+TEMPERATURES = [(T0 + minute * MINUTE, 20.0 + minute) for minute in range(5)] + [(T0 + DAY + minute * MINUTE, 30.0 + minute) for minute in range(3)]
+STATES = [(T0, "idle"), (T0 + 2 * MINUTE, "running"), (T0 + DAY, "idle")]
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def storage(request, tmp_path):
+    if request.param == 'sqlite':
+        storage = Database(str(tmp_path), flush_interval=0.01, chunk_interval=60.0, seal_interval=1e6, retention_interval=1e6, maintenance_interval=1e6)
+    else:
+        storage = MemoryStorage()
+    importer = storage.importer()
+    importer.add(TEMPERATURE, 'double', [t for t, _ in TEMPERATURES], [value for _, value in TEMPERATURES])
+    importer.add(STATE, 'string', [t for t, _ in STATES], [value for _, value in STATES])
+    importer.close()
+    yield storage
+    storage.close()
+
+
+def read_table(data, file_format):
+    if file_format == 'parquet':
+        return pyarrow.parquet.read_table(io.BytesIO(data))
+    return pyarrow.ipc.open_file(pyarrow.BufferReader(data)).read_all()
+
+
+def rows(table, column):
+    times = [t.value for t in table.column('time')]
+    return list(zip(times, table.column('variable').to_pylist(), table.column(column).to_pylist()))
+
+
+@pytest.mark.parametrize('file_format', exporter.FORMATS)
+def test_export_of_a_single_type(storage, file_format):
+    data = b"".join(exporter.iter_export(storage, [TEMPERATURE], T0, T0 + 2 * DAY, file_format))
+    table = read_table(data, file_format)
+    assert table.schema.names == ['time', 'adapter', 'variable', 'value']
+    assert table.schema.field('time').type == pyarrow.timestamp('ns', tz='UTC')
+    assert rows(table, 'value') == [(t, 'temperature', value) for t, value in TEMPERATURES]
+    assert set(table.column('adapter').to_pylist()) == {'Adapter'}
+
+
+@pytest.mark.parametrize('file_format', exporter.FORMATS)
+def test_export_of_mixed_types_has_a_column_per_type(storage, file_format):
+    # the end is exclusive and the unknown channel is left out
+    channel_refs = [TEMPERATURE, {'adapter': 'Adapter', 'variable': 'unknown'}, STATE]
+    data = b"".join(exporter.iter_export(storage, channel_refs, T0 + MINUTE, T0 + DAY, file_format))
+    table = read_table(data, file_format)
+    assert table.schema.names == ['time', 'adapter', 'variable', 'double_value', 'string_value']
+    assert rows(table, 'double_value') == [(t, 'temperature', value) for t, value in TEMPERATURES[1:5]] + [(T0 + 2 * MINUTE, 'state', None)]
+    assert table.column('string_value').to_pylist() == [None] * 4 + ["running"]
+
+
+def test_export_is_written_in_parts(storage, monkeypatch):
+    monkeypatch.setattr(exporter, 'BATCH_ROWS', 2)
+    parts = list(exporter.iter_export(storage, [TEMPERATURE, STATE], T0, T0 + 2 * DAY, 'parquet'))
+    assert len(parts) > 1
+    table = read_table(b"".join(parts), 'parquet')
+    assert table.num_rows == len(TEMPERATURES) + len(STATES)
+    assert pyarrow.parquet.ParquetFile(io.BytesIO(b"".join(parts))).num_row_groups > 1
+
+
+def test_export_of_an_empty_range(storage):
+    table = read_table(b"".join(exporter.iter_export(storage, [TEMPERATURE], T0 + 10 * MINUTE, T0 + DAY, 'arrow')), 'arrow')
+    assert table.num_rows == 0 and table.schema.names == ['time', 'adapter', 'variable', 'value']
+
+
+def test_unknown_format(storage):
+    with pytest.raises(ValueError):
+        next(exporter.iter_export(storage, [TEMPERATURE], T0, T0 + DAY, 'csv'))
+
+
+def test_export_histories_rpc(storage):
+    servicer = EHSGRPCInterface(types.SimpleNamespace(configuration={}, channels={}, db=storage))
+    request = ExtendedHistorianService_pb2.ExportHistoriesRequest(begin_inclusive=T0, end_exclusive=T0 + 2 * DAY, format='arrow')
+    channel_address = request.channel_addresses.add()
+    channel_address.adapter_name = 'Adapter'
+    channel_address.channel_name = 'state'
+    channel_address.channel_type = 'string'
+    responses = list(servicer.export_histories(request, None))
+    assert all(response.status == Commons_pb2.SUCCESS for response in responses)
+    table = read_table(b"".join(response.data for response in responses), 'arrow')
+    assert rows(table, 'value') == [(t, 'state', value) for t, value in STATES]
+    # a failed export ends with an error status
+    request.format = 'csv'
+    assert [response.status for response in servicer.export_histories(request, None)] == [Commons_pb2.UNKNOWN]
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""Behaviour of the bulk import of ehs.importer and of the importers of the storage backends, run with pytest."""
+
+
+import io
+import types
+
+import pytest
+
+from ehs.api import Commons_pb2, ExtendedHistorianService_pb2
+from ehs.database import Database
+from ehs.ehsx import ChannelAddress, EHSGRPCInterface, pack_columns
+from ehs.importer import parse_time, parse_value, read_csv
+from ehs.memory import MemoryStorage
+
+
+T0 = 1_700_000_000_000_000_000
+MINUTE = 60_000_000_000
+
+CSV = """value,time,type,variable,adapter
+20.5,1700000000000000000,double,temperature,Adapter
+,1700000060000000000,double,temperature,Adapter
+21.0,2023-11-14T22:15:20,double,temperature,Adapter
+true,1700000000000000000,bool,running,Adapter
+0,1700000060000000000,bool,running,Adapter
+-7,1700000000000000000,int64,counter,Adapter
+idle,1700000000000000000,string,state,Adapter
+,1700000060000000000,string,state,Adapter
+22.0,1700000180000000000,double,temperature,Adapter
+"""
+
+
+def test_parse_time():
+    assert parse_time("1700000000000000000") == T0
+    assert parse_time("-5") == -5
+    assert parse_time("2023-11-14T22:13:20") == T0
+    assert parse_time("2023-11-14T22:13:20.000001") == T0 + 1000
+    assert parse_time("2023-11-15T00:13:20+02:00") == T0
+    assert parse_time("1970-01-01T00:00:00") == 0
+
+
+def test_parse_value():
+    assert [parse_value(text, 'bool') for text in ("1", "true", "Yes", "on", "0", "false", "off")] == [True] * 4 + [False] * 3
+    assert parse_value("-9223372036854775808", 'int64') == -2 ** 63
+    assert parse_value("1e-3", 'double') == 0.001
+    assert parse_value(" spaced ", 'string') == " spaced "
+    assert parse_value("", 'double') is None
+    with pytest.raises(ValueError):
+        parse_value("1.5", 'int64')
+    with pytest.raises(ValueError):
+        parse_value("1", 'bytes')
+
+
+def test_read_csv_blocks():
+    blocks = [((a.adapter_name, a.channel_name, a.channel_type), times, values) for a, times, values in read_csv(io.StringIO(CSV), block_size=2)]
+    assert blocks == [
+        (('Adapter', 'temperature', 'double'), [T0, T0 + MINUTE], [20.5, None]),
+        (('Adapter', 'temperature', 'double'), [T0 + 2 * MINUTE], [21.0]),
+        (('Adapter', 'running', 'bool'), [T0, T0 + MINUTE], [True, False]),
+        (('Adapter', 'counter', 'int64'), [T0], [-7]),
+        (('Adapter', 'state', 'string'), [T0, T0 + MINUTE], ["idle", None]),
+        (('Adapter', 'temperature', 'double'), [T0 + 3 * MINUTE], [22.0]),
+    ]
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def storage(request, tmp_path):
+    if request.param == 'sqlite':
+        storage = Database(str(tmp_path), flush_interval=0.01, seal_interval=1e6, retention_interval=1e6, maintenance_interval=1e6)
+    else:
+        storage = MemoryStorage()
+    yield storage
+    storage.close()
+
+
+def import_csv(storage, text):
+    importer = storage.importer()
+    for address, times, values in read_csv(io.StringIO(text)):
+        importer.add({'adapter': address.adapter_name, 'variable': address.channel_name}, address.channel_type, times, values)
+    return importer.close()
+
+
+def test_import_skips_samples_without_value(storage):
+    assert import_csv(storage, CSV) == 7
+    refs = [{'adapter': 'Adapter', 'variable': name} for name in ('temperature', 'running', 'counter', 'state')]
+    time_series_list = storage.get_time_series_list(refs, T0, T0 + 10 * MINUTE)
+    assert time_series_list[0] == [(T0, 20.5), (T0 + 2 * MINUTE, 21.0), (T0 + 3 * MINUTE, 22.0)]
+    assert [(t, bool(value)) for t, value in time_series_list[1]] == [(T0, True), (T0 + MINUTE, False)]
+    assert time_series_list[2:] == [[(T0, -7)], [(T0, "idle")]]
+    assert [storage.channel_types[storage.resolve_channel(ref)] for ref in refs] == ['double', 'bool', 'int64', 'string']
+
+
+def test_repeated_import_replaces_the_samples(storage):
+    import_csv(storage, CSV)
+    import_csv(storage, CSV.replace("20.5", "19.5"))
+    ref = {'adapter': 'Adapter', 'variable': 'temperature'}
+    assert storage.get_time_series_list([ref], T0, T0 + 10 * MINUTE)[0] == [(T0, 19.5), (T0 + 2 * MINUTE, 21.0), (T0 + 3 * MINUTE, 22.0)]
+    assert storage.get_aggregated_list([ref], T0, T0 + 10 * MINUTE, 10 * MINUTE, ['count', 'sum']) == [[(T0, [3.0, 62.5])]]
+
+
+def test_import_rejects_mismatching_blocks(storage):
+    ref = {'adapter': 'Adapter', 'variable': 'temperature'}
+    storage.create_channel(ref, 'double')
+    importer = storage.importer()
+    with pytest.raises(ValueError):
+        importer.add(ref, 'string', [T0], ["hot"])
+    with pytest.raises(ValueError):
+        importer.add(ref, 'double', [T0, T0 + 1], [1.0, "hot"])
+    with pytest.raises(ValueError):
+        importer.add({'adapter': 'Adapter', 'variable': 'running'}, 'bool', [T0], [2])
+    importer.add(ref, 'double', [T0, T0 + 1], [1, None])
+    assert importer.close() == 1
+    assert storage.get_time_series_list([ref], T0, T0 + MINUTE)[0] == [(T0, 1.0)]
+    assert storage.channel_types[storage.resolve_channel(ref)] == 'double'
+    assert storage.resolve_channel({'adapter': 'Adapter', 'variable': 'running'}) is None
+
+
+def test_import_samples_rpc():
+    storage = MemoryStorage()
+    storage.create_channel({'adapter': 'Adapter', 'variable': 'state'}, 'string')
+    servicer = EHSGRPCInterface(types.SimpleNamespace(configuration={}, channels={}, db=storage))
+
+    def request(address, times, values):
+        message = ExtendedHistorianService_pb2.ImportSamplesRequest()
+        message.channel_address.adapter_name = address.adapter_name
+        message.channel_address.channel_name = address.channel_name
+        message.channel_address.channel_type = address.channel_type
+        pack_columns(message.columns, address.channel_type, times, values)
+        return message
+
+    try:
+        response = servicer.import_samples(iter([
+            request(ChannelAddress('Adapter', 'temperature', 'double'), [T0, T0 + MINUTE], [20.5, 21.0]),
+            request(ChannelAddress('Adapter', 'state', 'double'), [T0], [1.0]),  # the channel is a string channel
+            request(ChannelAddress('Adapter', 'counter', 'int64'), [T0], [2 ** 62]),
+        ]), None)
+        assert response.status == Commons_pb2.TYPE_MISMATCH
+        assert response.count == 3
+        refs = [{'adapter': 'Adapter', 'variable': name} for name in ('temperature', 'state', 'counter')]
+        assert storage.get_time_series_list(refs, T0, T0 + MINUTE + 1) == [[(T0, 20.5), (T0 + MINUTE, 21.0)], [], [(T0, 2 ** 62)]]
+    finally:
+        storage.close()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""Behaviour of the in-memory storage backend ehs.memory, run with pytest."""
+
+
+import pytest
+
+from ehs.database import get_database
+from ehs.memory import MemoryStorage, RingBuffer
+
+
+T0 = 1_700_000_000_000_000_000
+SECOND = 1_000_000_000
+MINUTE = 60 * SECOND
+
+TEMPERATURE = {'adapter': 'Adapter', 'variable': 'temperature'}
+STATE = {'adapter': 'Adapter', 'variable': 'state'}
+
+
+def contents(buffer):
+    times, values = buffer.columns(-2 ** 63, 2 ** 63 - 1)
+    return list(zip(times.tolist(), values.tolist()))
+
+
+@pytest.fixture
+def storage():
+    storage = MemoryStorage(capacity=8, retention_interval=1e6)
+    storage.create_channel(TEMPERATURE, 'double')
+    storage.create_channel(STATE, 'string')
+    yield storage
+    storage.close()
+
+
+def test_ring_buffer_overwrites_the_oldest_samples():
+    buffer = RingBuffer(4, 'int64')
+    for i in range(6):
+        buffer.append(T0 + i, i)
+    assert buffer.size == 4
+    # the samples wrap around the end of the arrays
+    assert len(buffer.segments()) == 2
+    assert contents(buffer) == [(T0 + i, i) for i in range(2, 6)]
+    assert buffer.columns(T0 + 3, T0 + 5)[1].tolist() == [3, 4]
+    assert buffer.latest() == (T0 + 5, 5)
+
+
+def test_ring_buffer_sorts_late_samples_in():
+    buffer = RingBuffer(5, 'double')
+    for t, value in [(T0 + 2, 2.0), (T0 + 4, 4.0), (T0 + 1, 1.0), (T0 + 4, 4.5), (T0 + 3, 3.0)]:
+        buffer.append(t, value)
+    assert not buffer.ordered
+    assert buffer.latest() == (T0 + 4, 4.5)
+    # the later sample of the same time stamp replaces the earlier one
+    assert contents(buffer) == [(T0 + 1, 1.0), (T0 + 2, 2.0), (T0 + 3, 3.0), (T0 + 4, 4.5)]
+    assert buffer.ordered and buffer.size == 4
+
+
+def test_ring_buffer_sorts_wrapped_samples():
+    buffer = RingBuffer(4, 'string')
+    for i in (0, 1, 2, 3, 5):
+        buffer.append(T0 + i, str(i))
+    buffer.append(T0 + 4, "4")
+    # the oldest two samples are overwritten, before the late sample is sorted in
+    assert contents(buffer) == [(T0 + 2, "2"), (T0 + 3, "3"), (T0 + 4, "4"), (T0 + 5, "5")]
+    buffer.append(T0 + 6, "6")
+    assert contents(buffer) == [(T0 + 3, "3"), (T0 + 4, "4"), (T0 + 5, "5"), (T0 + 6, "6")]
+
+
+def test_ring_buffer_drops_the_samples_before_the_horizon():
+    buffer = RingBuffer(4, 'bool')
+    for i in range(6):
+        buffer.append(T0 + i, i % 2 == 0)
+    assert buffer.drop_before(T0 + 4) == 2
+    assert contents(buffer) == [(T0 + 4, True), (T0 + 5, False)]
+    assert buffer.drop_before(T0) == 0
+    assert buffer.drop_before(T0 + 10) == 2
+    assert buffer.latest() is None and contents(buffer) == []
+
+
+def test_save_and_read(storage):
+    for i in range(10):
+        storage.save(TEMPERATURE, T0 + i * MINUTE, 20.0 + i)
+    storage.save(TEMPERATURE, T0 + 10 * MINUTE, None)
+    storage.save({'adapter': 'Adapter', 'variable': 'unknown'}, T0, 1.0)
+    storage.save(STATE, T0 + MINUTE, "idle")
+    # a channel keeps its latest capacity samples, while samples without value aren't stored
+    assert storage.get_time_series_list([TEMPERATURE], T0, T0 + 20 * MINUTE)[0] == [(T0 + i * MINUTE, 20.0 + i) for i in range(2, 10)]
+    assert storage.get_time_series('Adapter', 'state', T0, T0 + MINUTE + 1) == [(T0 + MINUTE, "idle")]
+    assert storage.get_time_series_list([{'adapter': 'Adapter', 'variable': 'unknown'}], T0, T0 + MINUTE) == [[]]
+    assert storage.get_latest_list([TEMPERATURE, STATE, {'adapter': 'Adapter', 'variable': 'unknown'}]) == [(T0 + 9 * MINUTE, 29.0), (T0 + MINUTE, "idle"), None]
+    assert storage.next_time(TEMPERATURE, T0) == T0 + 2 * MINUTE
+    assert storage.next_time(TEMPERATURE, T0 + 9 * MINUTE + 1) is None
+    assert storage.statistics() == {'backend': 'memory', 'channels': 2, 'capacity': 8, 'samples': 9}
+
+
+def test_aggregates(storage):
+    for i in range(6):
+        storage.save(TEMPERATURE, T0 + i * MINUTE, float(i))
+        storage.save(STATE, T0 + i * MINUTE, "idle")
+    aggregated = storage.get_aggregated_list([TEMPERATURE, STATE], T0, T0 + 6 * MINUTE, 3 * MINUTE, ['count', 'min', 'max', 'avg', 'first', 'last'])
+    assert aggregated == [[(T0, [3.0, 0.0, 2.0, 1.0, 0.0, 2.0]), (T0 + 3 * MINUTE, [3.0, 3.0, 5.0, 4.0, 3.0, 5.0])], []]
+    # there are no precomputed rollups
+    assert storage.select_rollup(MINUTE) is None
+    assert storage.get_rollup_time_series_list([TEMPERATURE, STATE], T0, T0 + 6 * MINUTE, MINUTE) == [[], []]
+    with pytest.raises(ValueError):
+        storage.get_aggregated_list([TEMPERATURE], T0, T0 + MINUTE, 0, ['count'])
+    with pytest.raises(ValueError):
+        storage.get_aggregated_list([TEMPERATURE], T0, T0 + MINUTE, MINUTE, ['median'])
+
+
+def test_expire_by_retention(storage):
+    storage.retention_ns = 5 * MINUTE
+    storage.set_retentions([(STATE, None), ({'adapter': 'Adapter', 'variable': 'unknown'}, 1.0)])
+    for i in range(8):
+        storage.save(TEMPERATURE, T0 + i * MINUTE, float(i))
+        storage.save(STATE, T0 + i * MINUTE, str(i))
+    assert storage.expire(now=T0 + 10 * MINUTE) == 5
+    assert [t for t, _ in storage.get_time_series_list([TEMPERATURE], T0, T0 + 10 * MINUTE)[0]] == [T0 + i * MINUTE for i in range(5, 8)]
+    # the channel, which keeps its samples forever
+    assert len(storage.get_time_series_list([STATE], T0, T0 + 10 * MINUTE)[0]) == 8
+    storage.set_retentions([(STATE, 60.0)])
+    assert storage.expire(now=T0 + 10 * MINUTE) == 8
+
+
+def test_type_change_keeps_the_convertible_samples(storage):
+    for i, value in enumerate([1.0, 2.5, 0.0, -3.0]):
+        storage.save(TEMPERATURE, T0 + i, value)
+    storage.create_channel(TEMPERATURE, 'int64')
+    assert storage.channel_types[storage.resolve_channel(TEMPERATURE)] == 'int64'
+    assert storage.get_time_series_list([TEMPERATURE], T0, T0 + 10)[0] == [(T0, 1), (T0 + 2, 0), (T0 + 3, -3)]
+    storage.create_channel(TEMPERATURE, 'string')
+    assert storage.get_time_series_list([TEMPERATURE], T0, T0 + 10)[0] == []
+
+
+def test_memory_backend_is_configured(tmp_path):
+    storage = get_database(str(tmp_path), {'backend': 'memory', 'capacity': 3, 'retention': 60.0})
+    try:
+        assert isinstance(storage, MemoryStorage)
+        assert storage.capacity == 3 and storage.retention_ns == MINUTE
+    finally:
+        storage.close()
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+"""Behaviour of the sampling of the EHS against stand-in adapters on localhost, run with pytest."""
+
+
+import collections
+import concurrent.futures
+import threading
+import time
+import types
+
+import grpc
+import pytest
+
+import ehs
+from ehs.api import Commons_pb2, DataSourceAdapter_pb2, DataSourceAdapter_pb2_grpc
+from ehs import ehsx
+from ehs.ehsx import EHS, Channel, ChannelGroup, ReadStream
+from ehs.memory import MemoryStorage
+
+
+VALUES = {'running': True, 'counter': 2 ** 62, 'temperature': 20.5, 'state': "idle", 'raw': b"\x00", 'broken': IOError("no answer")}
+
+
+class StandInClient(ehs.Client):
+    """A device, of which the addresses hold the given values, which are read after delay seconds without I/O."""
+
+    def __init__(self, values, delay=0.0) -> None:
+        ehs.Client.__init__(self)
+        self.values = values
+        self.delay = delay
+
+    def connect(self) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+    def read(self, address: str):
+        time.sleep(self.delay)
+        value = self.values[address]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def write(self, address: str, value) -> None:
+        pass
+
+    def get_configuration(self) -> dict:
+        return {}
+
+
+class CountingInterface(ehs.AdapterGRPCInterface):
+    """An adapter, which counts the requests of each kind."""
+
+    def __init__(self, client) -> None:
+        ehs.AdapterGRPCInterface.__init__(self, client)
+        self.calls = collections.Counter()
+
+    def read(self, request, context):
+        self.calls['read'] += 1
+        return ehs.AdapterGRPCInterface.read(self, request, context)
+
+    def read_many(self, request, context):
+        self.calls['read_many'] += 1
+        return ehs.AdapterGRPCInterface.read_many(self, request, context)
+
+    def stream_read(self, request_iterator, context):
+        self.calls['stream_read'] += 1
+        return ehs.AdapterGRPCInterface.stream_read(self, request_iterator, context)
+
+
+class OlderInterface(CountingInterface):
+    """An adapter of a version before read_many."""
+
+    def read_many(self, request, context):
+        self.calls['read_many'] += 1
+        context.abort(grpc.StatusCode.UNIMPLEMENTED, "Method not implemented!")
+
+
+class UnaryInterface(CountingInterface):
+    """An adapter of a version before stream_read."""
+
+    def stream_read(self, request_iterator, context):
+        self.calls['stream_read'] += 1
+        context.abort(grpc.StatusCode.UNIMPLEMENTED, "Method not implemented!")
+
+
+def adapter_proxy(port) -> DataSourceAdapter_pb2_grpc.DataSourceAdapterStub:
+    # a restarted adapter is reconnected to without the default backoff of a second
+    options = [('grpc.initial_reconnect_backoff_ms', 100), ('grpc.min_reconnect_backoff_ms', 100), ('grpc.max_reconnect_backoff_ms', 100)]
+    return DataSourceAdapter_pb2_grpc.DataSourceAdapterStub(grpc.insecure_channel(f"127.0.0.1:{port}", options=options))
+
+
+def serve(interface, port=0):
+    """Starts a gRPC server of the adapter interface without TLS and returns it with its port."""
+    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=10))
+    DataSourceAdapter_pb2_grpc.add_DataSourceAdapterServicer_to_server(interface, server)
+    port = server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    return server, port
+
+
+@pytest.fixture
+def sampling():
+    """An EHS, which samples the stand-in adapters added by the test into an in-memory storage."""
+    instance = EHS()
+    instance.db = MemoryStorage()
+    servers = []
+
+    def add_adapter(adapter_name, interface, variable_types, stream=False):
+        server, port = serve(interface)
+        servers.append(server)
+        proxy = adapter_proxy(port)
+        instance.read_pools[adapter_name] = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        if stream:
+            instance.read_streams[adapter_name] = ReadStream(adapter_name, proxy)
+        channels = [Channel(adapter_name, variable_name, channel_type, proxy) for variable_name, channel_type in variable_types]
+        instance.db.create_channels([(channel.channel_ref, channel.channel_type) for channel in channels])
+        return ChannelGroup(adapter_name, channels)
+
+    def tick(job_name, groups, deadline=5.0):
+        instance.tick_durations.setdefault(job_name, collections.deque())
+        instance.missed_reads.setdefault(job_name, 0)
+        instance.sample_channels(job_name, groups, deadline)
+
+    yield add_adapter, tick, instance
+    instance.stop()
+    for server in servers:
+        server.stop(None)
+
+
+def latest(instance, adapter_name, variable_name):
+    return instance.db.get_latest_list([{'adapter': adapter_name, 'variable': variable_name}])[0]
+
+
+def test_read_many_answers_each_address():
+    interface = ehs.AdapterGRPCInterface(StandInClient(VALUES))
+    request = DataSourceAdapter_pb2.ReadManyRequest(addresses=['state', 'broken', 'running', 'raw', 'counter', 'temperature'])
+    response = interface.read_many(request, None)
+    assert [v.status for v in response.values] == [Commons_pb2.SUCCESS, Commons_pb2.DEVICE_NOT_RESPONDING, Commons_pb2.SUCCESS,
+                                                   Commons_pb2.TYPE_MISMATCH, Commons_pb2.SUCCESS, Commons_pb2.SUCCESS]
+    assert [v.value.WhichOneof('value') for v in response.values] == ['string_value', None, 'bool_value', None, 'int64_value', 'double_value']
+    assert (response.values[0].value.string_value, response.values[4].value.int64_value) == ("idle", 2 ** 62)
+
+
+def test_a_tick_sends_one_read_many_per_adapter(sampling):
+    add_adapter, tick, instance = sampling
+    first, second = CountingInterface(StandInClient(VALUES)), CountingInterface(StandInClient(VALUES))
+    groups = (add_adapter('First', first, [('running', 'bool'), ('counter', 'int64'), ('broken', 'double')]),
+              add_adapter('Second', second, [('temperature', 'double'), ('state', 'string')]))
+    for _ in range(2):
+        tick('job', groups)
+    assert first.calls == second.calls == {'read_many': 2}
+    # the channels of a tick are saved with the same time stamp
+    time_series_list = instance.db.get_time_series_list([channel.channel_ref for group in groups for channel in group.channels], 0, 2 ** 63 - 1)
+    assert [[value for _, value in time_series] for time_series in time_series_list] == [[True] * 2, [2 ** 62] * 2, [], [20.5] * 2, ["idle"] * 2]
+    assert len({tuple(t for t, _ in time_series) for time_series in time_series_list if time_series}) == 1
+    # the failed read isn't saved, but kept as latest value
+    assert latest(instance, 'First', 'broken') is None
+    assert instance.latest_values[('First', 'broken')][1].status == Commons_pb2.DEVICE_NOT_RESPONDING
+    assert len(instance.tick_durations['job']) == 2 and instance.missed_reads['job'] == 0
+
+
+def test_adapter_without_read_many_is_read_one_by_one(sampling):
+    add_adapter, tick, instance = sampling
+    older = OlderInterface(StandInClient(VALUES))
+    groups = (add_adapter('Older', older, [('temperature', 'double'), ('state', 'string')]),)
+    tick('job', groups)
+    # the channels are read one by one within the same tick
+    assert older.calls == {'read_many': 1, 'read': 2}
+    assert instance.single_read_adapters == {'Older'}
+    tick('job', groups)
+    assert older.calls == {'read_many': 1, 'read': 4}
+    assert latest(instance, 'Older', 'temperature')[1] == 20.5 and latest(instance, 'Older', 'state')[1] == "idle"
+
+
+def test_reads_past_the_deadline_are_missed(sampling):
+    add_adapter, tick, instance = sampling
+    groups = (add_adapter('Slow', CountingInterface(StandInClient(VALUES, delay=0.5)), [('temperature', 'double'), ('state', 'string')]),
+              add_adapter('Fast', CountingInterface(StandInClient(VALUES)), [('counter', 'int64')]))
+    tick('job', groups, deadline=0.1)
+    assert instance.missed_reads['job'] == 2
+    assert latest(instance, 'Slow', 'temperature') is None and latest(instance, 'Fast', 'counter')[1] == 2 ** 62
+    assert instance.tick_durations['job'][0] < 0.5
+
+
+def concurrent_reads(read_many, requests, timeout=5.0):
+    """Sends the requests at the same time and returns their responses and the seconds until the last one."""
+    start = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(len(requests)) as pool:
+        responses = list(pool.map(lambda request: read_many(request, timeout), requests))
+    return responses, time.monotonic() - start
+
+
+def values_of(response):
+    return [getattr(v.value, v.value.WhichOneof('value')) for v in response.values]
+
+
+STREAM_REQUESTS = [DataSourceAdapter_pb2.ReadManyRequest(addresses=addresses) for addresses in
+                   [['running'], ['counter', 'state'], ['temperature'], ['state', 'running'], ['counter'], ['temperature', 'state'], ['state'], ['running', 'counter']]]
+
+
+def test_stream_read_answers_concurrently_with_the_request_ids():
+    interface = ehs.AdapterGRPCInterface(StandInClient(VALUES, delay=0.05))
+    requests = []
+    for i, request in enumerate(STREAM_REQUESTS):
+        requests.append(DataSourceAdapter_pb2.ReadManyRequest(id=100 + i, addresses=request.addresses))
+    context = types.SimpleNamespace(send_initial_metadata=lambda metadata: None)
+    start = time.monotonic()
+    responses = {response.id: response for response in interface.stream_read(iter(requests), context)}
+    # STREAM_CONCURRENCY requests at a time instead of one after the other
+    assert time.monotonic() - start < len(requests) * 0.05 * 0.75
+    assert sorted(responses) == [request.id for request in requests]
+    for request in requests:
+        assert values_of(responses[request.id]) == [VALUES[address] for address in request.addresses]
+
+
+def test_read_stream_pipelines_the_requests():
+    interface = CountingInterface(StandInClient(VALUES, delay=0.05))
+    server, port = serve(interface)
+    read_stream = ReadStream('Adapter', adapter_proxy(port))
+    try:
+        responses, duration = concurrent_reads(read_stream.read_many, STREAM_REQUESTS)
+        assert [values_of(response) for response in responses] == [[VALUES[address] for address in request.addresses] for request in STREAM_REQUESTS]
+        assert duration < len(STREAM_REQUESTS) * 0.05 * 0.75
+        assert interface.calls == {'stream_read': 1, 'read_many': len(STREAM_REQUESTS)}
+        assert read_stream.statistics() == {'supported': True, 'connected': True, 'reconnects': 0, 'queued': 0, 'in_flight': 0}
+        # the shared requests of the groups aren't changed by the ids of the stream
+        assert all(request.id == 0 for request in STREAM_REQUESTS)
+    finally:
+        read_stream.close()
+        server.stop(None)
+
+
+def test_read_stream_limits_the_requests_to_its_window():
+    server, port = serve(CountingInterface(StandInClient(VALUES, delay=0.3)))
+    read_stream = ReadStream('Adapter', adapter_proxy(port), window=1)
+    try:
+        first = threading.Thread(target=read_stream.read_many, args=(STREAM_REQUESTS[0], 5.0))
+        first.start()
+        time.sleep(0.05)
+        with pytest.raises(TimeoutError):
+            read_stream.read_many(STREAM_REQUESTS[1], 0.05)
+        first.join()
+        assert values_of(read_stream.read_many(STREAM_REQUESTS[1], 5.0)) == [2 ** 62, "idle"]
+    finally:
+        read_stream.close()
+        server.stop(None)
+
+
+def test_adapter_without_stream_read_is_read_by_unary_requests():
+    interface = UnaryInterface(StandInClient(VALUES))
+    server, port = serve(interface)
+    read_stream = ReadStream('Adapter', adapter_proxy(port))
+    try:
+        responses, _ = concurrent_reads(read_stream.read_many, STREAM_REQUESTS[:3])
+        assert [values_of(response) for response in responses] == [[True], [2 ** 62, "idle"], [20.5]]
+        read_stream.thread.join(timeout=5.0)
+        assert not read_stream.supported and not read_stream.connected
+        assert values_of(read_stream.read_many(STREAM_REQUESTS[2], 5.0)) == [20.5]
+        assert interface.calls == {'stream_read': 1, 'read_many': 4}
+    finally:
+        read_stream.close()
+        server.stop(None)
+
+
+def test_read_stream_reconnects_to_a_restarted_adapter(monkeypatch):
+    monkeypatch.setattr(ehsx, 'RECONNECT_INTERVAL', 0.1)
+    server, port = serve(CountingInterface(StandInClient(VALUES)))
+    read_stream = ReadStream('Adapter', adapter_proxy(port))
+    try:
+        assert values_of(read_stream.read_many(STREAM_REQUESTS[0], 5.0)) == [True]
+        server.stop(None).wait()
+        with pytest.raises((TimeoutError, ConnectionError, grpc.RpcError)):
+            read_stream.read_many(STREAM_REQUESTS[0], 0.5)
+        assert not read_stream.connected
+        interface = CountingInterface(StandInClient(VALUES))
+        server, _ = serve(interface, port)
+        deadline = time.monotonic() + 10.0
+        while True:
+            try:
+                response = read_stream.read_many(STREAM_REQUESTS[2], 0.5)
+                break
+            except (TimeoutError, ConnectionError, grpc.RpcError):
+                assert time.monotonic() < deadline
+        assert values_of(response) == [20.5]
+        assert read_stream.connected and read_stream.reconnects >= 1 and interface.calls['stream_read'] == 1
+    finally:
+        read_stream.close()
+        server.stop(None)
+
+
+def test_ticks_are_pipelined_over_the_stream(sampling):
+    add_adapter, tick, instance = sampling
+    interface = CountingInterface(StandInClient(VALUES))
+    groups = (add_adapter('Streaming', interface, [('temperature', 'double'), ('state', 'string')], stream=True),)
+    for _ in range(3):
+        tick('job', groups)
+    assert interface.calls == {'stream_read': 1, 'read_many': 3}
+    assert len(instance.db.get_time_series_list([{'adapter': 'Streaming', 'variable': 'state'}], 0, 2 ** 63 - 1)[0]) == 3
+    assert instance.read_streams['Streaming'].statistics()['connected']